@@ -0,0 +1,225 @@
+import random
+import re
+from typing import List
+
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite
+from leaguepedia_parser.transmuters.field_names import picks_bans_fields
+
+# Riot IDs of the champions of the synthetic wiki, so that benchmarks never download lol_id_tools data
+champion_ids = {
+    "Ahri": 103,
+    "Lee Sin": 64,
+    "Jinx": 222,
+    "Thresh": 412,
+    "Gnar": 150,
+    "Zed": 238,
+    "Vi": 254,
+    "Ezreal": 81,
+    "Lulu": 117,
+    "Ornn": 516,
+    "Azir": 268,
+    "Graves": 104,
+    "Kai'Sa": 145,
+    "Nautilus": 111,
+    "Renekton": 58,
+    "Syndra": 134,
+    "Xin Zhao": 5,
+    "Varus": 110,
+    "Braum": 201,
+    "Jayce": 126,
+}
+
+champions = list(champion_ids)
+
+teams = ["T1", "Gen.G", "DRX", "DWG KIA", "KT Rolster", "Hanwha Life Esports"]
+
+overview_page = "Synthetic League/2021 Season/Spring Season"
+
+
+def get_games_rows(count: int) -> List[dict]:
+    """Returns ScoreboardGames rows like the ones returned by cargo, with spaces in default aliases."""
+    randomizer = random.Random(0)
+    rows = []
+
+    for idx in range(count):
+        team1, team2 = randomizer.sample(teams, 2)
+        picks = randomizer.sample(champions, 20)
+
+        rows.append(
+            {
+                "GameId": f"{overview_page}_Week {idx // 30 + 1}_{idx // 3 + 1}_{idx % 3 + 1}",
+                "MatchId": f"{overview_page}_Week {idx // 30 + 1}_{idx // 3 + 1}",
+                "Tournament": "Synthetic League 2021 Spring",
+                "Team1": team1,
+                "Team2": team2,
+                "Winner": str(randomizer.randint(1, 2)),
+                "Gamelength Number": str(round(randomizer.uniform(20, 45), 2)),
+                "DateTime UTC": f"2021-{idx % 12 + 1:02}-{idx % 28 + 1:02} 08:{idx % 60:02}:00",
+                "Team1Score": "0",
+                "Team2Score": "1",
+                "Team1Bans": ",".join(picks[10:15]),
+                "Team2Bans": ",".join(picks[15:]),
+                "Team1Picks": ",".join(picks[:5]),
+                "Team2Picks": ",".join(picks[5:10]),
+                "Team1Players": ",".join(f"{team1} Player {i}" for i in range(5)),
+                "Team2Players": ",".join(f"{team2} Player {i}" for i in range(5)),
+                **{
+                    f"Team{side}{field}": str(randomizer.randint(0, 11))
+                    for side in (1, 2)
+                    for field in [
+                        "Dragons",
+                        "Barons",
+                        "Towers",
+                        "RiftHeralds",
+                        "Inhibitors",
+                    ]
+                },
+                "Patch": "11.5",
+                "MatchHistory": f"https://matchhistory.euw.leagueoflegends.com/en/#match-details/ESPORTSTMNT01/{1700000 + idx}?gameHash={idx:016x}",
+                "RiotPlatformGameId": None,
+                "VOD": None,
+                "Gamename": f"Game {idx % 3 + 1}",
+                "N GameInMatch": str(idx % 3 + 1),
+                "OverviewPage": overview_page,
+            }
+        )
+
+    return rows
+
+
+def get_picks_bans_rows(games: List[dict]) -> List[dict]:
+    """Returns PicksAndBansS7 rows matching the games, with their GameId."""
+    rows = []
+
+    for game in games:
+        names = iter(
+            game["Team1Bans"].split(",")
+            + game["Team2Bans"].split(",")
+            + game["Team1Picks"].split(",")
+            + game["Team2Picks"].split(",")
+        )
+        rows.append(
+            {
+                **{field: next(names) for field in picks_bans_fields},
+                "GameId": game["GameId"],
+            }
+        )
+
+    return rows
+
+
+def get_players_rows(games: List[dict]) -> List[dict]:
+    """Returns ScoreboardPlayers rows matching the games, with their GameId."""
+    rows = []
+
+    for game in games:
+        for side in (1, 2):
+            for idx, (player, champion) in enumerate(
+                zip(
+                    game[f"Team{side}Players"].split(","),
+                    game[f"Team{side}Picks"].split(","),
+                )
+            ):
+                rows.append(
+                    {
+                        "gameName": player,
+                        "gameRoleNumber": str(idx + 1),
+                        "Champion": champion,
+                        "Side": str(side),
+                        "Link": player,
+                        "GameId": game["GameId"],
+                    }
+                )
+
+    return rows
+
+
+def get_players_information_rows(links: List[str]) -> List[dict]:
+    """Returns Players rows for the given links."""
+    return [
+        {
+            "Link": link,
+            "irlName": f"IRL {link}",
+            "Country": "South Korea",
+            "Birthdate": "1996-05-07",
+            "currentGameName": link,
+            "pageId": str(idx),
+        }
+        for idx, link in enumerate(links)
+    ]
+
+
+def get_tournaments_rows(count: int) -> List[dict]:
+    """Returns Tournaments rows joined with their league."""
+    return [
+        {
+            "Name": f"Synthetic League {2010 + idx // 4} Split {idx % 4 + 1}",
+            "DateStart": f"{2010 + idx // 4}-01-01",
+            "Date": f"{2010 + idx // 4}-04-01",
+            "Region": "Korea",
+            "League": "Synthetic League",
+            "League Short": "SL",
+            "Rulebook": None,
+            "TournamentLevel": "Primary",
+            "IsQualifier": "0",
+            "IsPlayoffs": str(idx % 2),
+            "IsOfficial": "1",
+            "OverviewPage": f"Synthetic League/{2010 + idx // 4} Season/Split {idx % 4 + 1}",
+        }
+        for idx in range(count)
+    ]
+
+
+class SyntheticCargoClient:
+    """Answers the cargo queries of the parsers from synthetic tables, filtering on the quoted values of the where."""
+
+    def __init__(self, games_count: int):
+        self.games = get_games_rows(games_count)
+        self.picks_bans = get_picks_bans_rows(self.games)
+        self.players = get_players_rows(self.games)
+        self.tournaments = get_tournaments_rows(games_count)
+
+    def query(self, tables, fields, limit, offset=0, where=None, **kwargs):
+        table = tables.split(",")[0].strip()
+        values = {
+            single or double
+            for single, double in re.findall(r"'([^']*)'|\"([^\"]*)\"", where or "")
+        }
+
+        if table == "PlayerRedirects":
+            rows = get_players_information_rows(sorted(values))
+        else:
+            rows = {
+                "ScoreboardGames": self.games,
+                "PicksAndBansS7": self.picks_bans,
+                "ScoreboardPlayers": self.players,
+                "Tournaments": self.tournaments,
+            }[table]
+
+            if "GameId" in (where or ""):
+                rows = [row for row in rows if row["GameId"] in values]
+
+        if fields == "COUNT(*)=count":
+            return [{"count": str(len(rows))}]
+
+        # Games are projected on the queried fields, which are never aliased
+        if table == "ScoreboardGames":
+            keys = [field.replace("_", " ") for field in fields.split(", ")]
+            rows = [{key: row[key] for key in keys} for row in rows]
+
+        return rows[offset : offset + limit]
+
+
+def record_fixtures(site: LeaguepediaSite, path: str, games_count: int, record):
+    """Records the responses of the synthetic wiki to the calls made by record(), then replays them on the site."""
+    site._site = type(
+        "SyntheticSite", (), {"cargo_client": SyntheticCargoClient(games_count)}
+    )
+    site.enable_recording(path, mode="record")
+
+    try:
+        record()
+    finally:
+        site._site = None
+
+    site.enable_recording(path, mode="replay")
@@ -0,0 +1,528 @@
+"""Benchmarks of the query, transmute and detail paths, replaying recorded fixtures without network access.
+
+Typical usage example:
+    python -m benchmarks --output results.json
+    python -m benchmarks --output new.json --compare results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+import lol_id_tools as lit
+
+from benchmarks import fixtures
+from leaguepedia_parser.parsers import export_parser, game_parser
+from leaguepedia_parser.site.leaguepedia import leaguepedia
+from leaguepedia_parser.transmuters.champions import (
+    clear_champion_cache,
+    warm_champion_cache,
+)
+from leaguepedia_parser.transmuters.compact import to_compact
+from leaguepedia_parser.transmuters.game import (
+    transmute_game,
+    LeaguepediaGameIdentifier,
+    LeaguepediaTeamIdentifier,
+)
+from leaguepedia_parser.transmuters.game_players import (
+    add_players,
+    LeaguepediaPlayerIdentifier,
+)
+from leaguepedia_parser.transmuters.picks_bans import transmute_picks_bans
+from leaguepedia_parser.transmuters.tournament import transmute_tournament
+
+# Benchmark functions by name, each returning a dict of metrics
+benchmarks: Dict[str, Callable[[argparse.Namespace], dict]] = {}
+
+# Statements timed by the cold import benchmark, each in a new interpreter
+import_statements = {
+    "package": "import leaguepedia_parser",
+    "get_regions": "from leaguepedia_parser import get_regions",
+    "all_public_names": "from leaguepedia_parser import *",
+    # Transmuting the first game imports lol_dto and lol_id_tools
+    "first_game": "from leaguepedia_parser import get_games; import lol_dto.classes.game",
+}
+
+# Packages whose version is saved with the results, as they are the usual suspects of slowdowns
+tracked_packages = [
+    "leaguepedia_parser",
+    "lol-dto",
+    "lol-id-tools",
+    "mwrogue",
+    "mwclient",
+]
+
+
+def benchmark(name: str):
+    def decorator(function):
+        benchmarks[name] = function
+        return function
+
+    return decorator
+
+
+def get_fixture_champion_id(champion_name: str, **kwargs) -> int:
+    """Replaces lol_id_tools lookups, which download champion data, with the IDs of the synthetic wiki champions."""
+    return fixtures.champion_ids[champion_name]
+
+
+def measure_throughput(function: Callable[[], int], repeat: int) -> dict:
+    """Returns the best rows per second out of repeat runs, and the memory allocated per row by a single run.
+
+    Args:
+        function: runs the benchmark once, returning the number of processed rows.
+        repeat: the number of timed runs.
+    """
+    # A first run warms caches like the champion IDs one
+    rows = function()
+
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "seconds": min(timings),
+        "rows_per_second": rows / min(timings),
+        "allocated_bytes_per_row": peak / rows,
+    }
+
+
+@benchmark("transmute_game")
+def benchmark_transmute_game(arguments: argparse.Namespace) -> dict:
+    rows = fixtures.get_games_rows(arguments.rows)
+
+    return measure_throughput(
+        lambda: len([transmute_game(row) for row in rows]), arguments.repeat
+    )
+
+
+@benchmark("write_games_parquet")
+def benchmark_write_games_parquet(arguments: argparse.Namespace) -> dict:
+    """Measures the speedup of exporting games to Parquet on a process pool, per number of workers.
+
+    Recorded pages are replayed without latency, so only downloading, transmuting and sending back tables is timed.
+    Workers are started before timing, as backfills reuse a single pool across calls.
+    """
+    if export_parser.pyarrow is None:
+        return {}
+
+    query = game_parser._get_games_query(fixtures.overview_page)
+    warm_champion_cache(fixtures.champions)
+
+    with tempfile.TemporaryDirectory() as path:
+        parquet_path = os.path.join(path, "games.parquet")
+
+        def write_games_parquet(executor: Optional[ProcessPoolExecutor]) -> int:
+            return export_parser.write_games_parquet(
+                parquet_path, fixtures.overview_page, executor=executor
+            )
+
+        # Workers replay the pages recorded by the current process, along with the games count
+        fixtures.record_fixtures(
+            leaguepedia,
+            os.path.join(path, "recording"),
+            arguments.rows,
+            lambda: [write_games_parquet(None), leaguepedia._count(**query)],
+        )
+
+        result = {
+            "in_process": measure_throughput(
+                lambda: write_games_parquet(None), arguments.repeat
+            )
+        }
+
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            with ProcessPoolExecutor(workers) as executor:
+                write_games_parquet(executor)
+
+                throughput = measure_throughput(
+                    lambda: write_games_parquet(executor), arguments.repeat
+                )
+
+            throughput["speedup"] = (
+                throughput["rows_per_second"] / result["in_process"]["rows_per_second"]
+            )
+            result[f"{workers}_workers"] = throughput
+
+        leaguepedia.disable_recording()
+
+    return result
+
+
+@benchmark("transmute_picks_bans")
+def benchmark_transmute_picks_bans(arguments: argparse.Namespace) -> dict:
+    rows = fixtures.get_picks_bans_rows(fixtures.get_games_rows(arguments.rows))
+
+    return measure_throughput(
+        lambda: len([transmute_picks_bans(row) for row in rows]), arguments.repeat
+    )
+
+
+@benchmark("add_players")
+def benchmark_add_players(arguments: argparse.Namespace) -> dict:
+    games_rows = fixtures.get_games_rows(arguments.rows)
+    players = game_parser._group_by_game_id(fixtures.get_players_rows(games_rows))
+
+    def run() -> int:
+        # Games are transmuted beforehand so only add_players is timed
+        for game in games:
+            add_players(game, players[game.sources.leaguepedia.gameId])
+
+        return len(games)
+
+    games = [transmute_game(row) for row in games_rows]
+
+    return measure_throughput(run, arguments.repeat)
+
+
+@benchmark("transmute_tournament")
+def benchmark_transmute_tournament(arguments: argparse.Namespace) -> dict:
+    rows = fixtures.get_tournaments_rows(arguments.rows)
+
+    return measure_throughput(
+        lambda: len([transmute_tournament(row) for row in rows]), arguments.repeat
+    )
+
+
+@benchmark("query_pagination")
+def benchmark_query_pagination(arguments: argparse.Namespace) -> dict:
+    """Measures the overhead of LeaguepediaSite.query() per page, with recorded pages served without latency."""
+    query = game_parser._get_games_query(fixtures.overview_page)
+
+    with tempfile.TemporaryDirectory() as path:
+        fixtures.record_fixtures(
+            leaguepedia,
+            path,
+            arguments.rows,
+            lambda: [
+                leaguepedia.query(**query, parallel=parallel)
+                for parallel in (False, True)
+            ],
+        )
+
+        result = {}
+
+        for parallel in (False, True):
+            throughput = measure_throughput(
+                lambda: len(leaguepedia.query(**query, parallel=parallel)),
+                arguments.repeat,
+            )
+            throughput["seconds_per_page"] = throughput["seconds"] / -(
+                -throughput["rows"] // leaguepedia.limit
+            )
+
+            result["parallel" if parallel else "sequential"] = throughput
+
+        leaguepedia.disable_recording()
+
+    return result
+
+
+@benchmark("get_games_projection")
+def benchmark_get_games_projection(arguments: argparse.Namespace) -> dict:
+    """Compares get_games() with all fields to projections, with recorded responses served without latency."""
+    projections = {
+        "all_fields": dict(),
+        "summary_fields": dict(fields=["DateTime_UTC", "Team1", "Team2", "Winner"]),
+        "summary_tuples": dict(
+            fields=["DateTime_UTC", "Team1", "Team2", "Winner"], as_tuples=True
+        ),
+    }
+
+    def get_games(kwargs: dict) -> int:
+        return len(game_parser.get_games(fixtures.overview_page, **kwargs))
+
+    result = {}
+
+    with tempfile.TemporaryDirectory() as path:
+        fixtures.record_fixtures(
+            leaguepedia,
+            path,
+            arguments.rows,
+            lambda: [get_games(kwargs) for kwargs in projections.values()],
+        )
+
+        for name, kwargs in projections.items():
+            query = game_parser._get_games_query(
+                fixtures.overview_page,
+                game_parser._get_projection(
+                    kwargs.get("fields"), game_parser.game_fields, "GameId", False
+                ),
+            )
+
+            result[name] = {
+                **measure_throughput(lambda: get_games(kwargs), arguments.repeat),
+                "payload_bytes": len(json.dumps(leaguepedia.query(**query))),
+            }
+
+        leaguepedia.disable_recording()
+
+    return result
+
+
+@benchmark("get_game_details")
+def benchmark_get_game_details(arguments: argparse.Namespace) -> dict:
+    """Measures the end to end time of game details, with recorded responses served with a simulated latency."""
+    games_rows = fixtures.get_games_rows(arguments.details_games)
+
+    def get_game_details():
+        for game in [transmute_game(row) for row in games_rows]:
+            game_parser.get_game_details(game)
+
+    def get_games_details():
+        game_parser.get_games_details([transmute_game(row) for row in games_rows])
+
+    runs = {
+        "get_game_details": get_game_details,
+        "get_games_details": get_games_details,
+    }
+
+    def run(function: Callable[[], None]) -> float:
+        # Players information cached by a previous run would change the queries
+        game_parser.players_cache.invalidate()
+
+        start = time.perf_counter()
+        function()
+
+        return time.perf_counter() - start
+
+    result = {"latency": arguments.latency, "games": len(games_rows)}
+
+    with tempfile.TemporaryDirectory() as path:
+        fixtures.record_fixtures(
+            leaguepedia,
+            path,
+            len(games_rows),
+            lambda: [run(function) for function in runs.values()],
+        )
+        leaguepedia.recording.latency = arguments.latency
+
+        for name, function in runs.items():
+            seconds = min(run(function) for _ in range(arguments.repeat))
+
+            result[name] = {
+                "seconds": seconds,
+                "seconds_per_game": seconds / len(games_rows),
+            }
+
+        leaguepedia.disable_recording()
+
+    return result
+
+
+@benchmark("cold_import")
+def benchmark_cold_import(arguments: argparse.Namespace) -> dict:
+    """Measures the time to import the package and its public functions in a new interpreter, the best of repeat runs.
+
+    The interpreter startup itself is not included.
+    """
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+
+    return {
+        name: min(
+            float(
+                subprocess.check_output(
+                    [sys.executable, "-c", script.format(statement=statement)],
+                    text=True,
+                )
+            )
+            for _ in range(arguments.repeat)
+        )
+        for name, statement in import_statements.items()
+    }
+
+
+@benchmark("memory")
+def benchmark_memory(arguments: argparse.Namespace) -> dict:
+    """Measures the memory held per tournament and identifier object, for the original and compact variants.
+
+    Rows are parsed from JSON for each measure, so that every object starts with its own copy of repeated strings like
+    with cargo results.
+    """
+    games_rows = fixtures.get_games_rows(arguments.rows)
+
+    objects_rows = {
+        "LeaguepediaTournament": (
+            fixtures.get_tournaments_rows(arguments.rows),
+            transmute_tournament,
+        ),
+        "LeaguepediaGameIdentifier": (
+            games_rows,
+            lambda row: LeaguepediaGameIdentifier(
+                gameId=row["GameId"],
+                matchId=row["MatchId"],
+                matchHistoryUrl=row["MatchHistory"],
+                overviewPage=row["OverviewPage"],
+                tournamentName=row["Tournament"],
+            ),
+        ),
+        "LeaguepediaTeamIdentifier": (
+            games_rows,
+            lambda row: LeaguepediaTeamIdentifier(name=row["Team1"]),
+        ),
+        "LeaguepediaPlayerIdentifier": (
+            fixtures.get_players_information_rows(
+                [row["Link"] for row in fixtures.get_players_rows(games_rows)]
+            ),
+            lambda row: LeaguepediaPlayerIdentifier(
+                name=row["currentGameName"],
+                irlName=row["irlName"],
+                country=row["Country"],
+                birthday=row["Birthdate"],
+            ),
+        ),
+    }
+
+    def measure(payload: str, transmute: Callable[[dict], object]) -> float:
+        gc.collect()
+        tracemalloc.start()
+
+        rows = json.loads(payload)
+        objects = [transmute(row) for row in rows]
+        del rows
+
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return held / len(objects)
+
+    result = {}
+
+    for name, (rows, transmute) in objects_rows.items():
+        payload = json.dumps(rows)
+        variants = {
+            "original": transmute,
+            "compact": lambda row: to_compact(transmute(row)),
+            "frozen": lambda row: to_compact(transmute(row), frozen=True),
+        }
+
+        result[name] = {}
+
+        for variant, function in variants.items():
+            # The first run grows the interned strings table, which is not held per object
+            measure(payload, function)
+            result[name][f"{variant}_bytes_per_object"] = measure(payload, function)
+
+        result[name]["saving"] = 1 - (
+            result[name]["compact_bytes_per_object"]
+            / result[name]["original_bytes_per_object"]
+        )
+
+    return result
+
+
+def get_environment() -> dict:
+    environment = {"python": platform.python_version()}
+
+    for package in tracked_packages:
+        try:
+            environment[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            environment[package] = None
+
+    return environment
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    """Flattens nested metrics to dotted names, keeping only numbers."""
+    flat = {}
+
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+
+    return flat
+
+
+def compare(results: dict, baseline: dict):
+    """Prints the ratio of each metric to the baseline."""
+    new, old = flatten(results["results"]), flatten(baseline["results"])
+
+    for name in sorted(new.keys() & old.keys()):
+        ratio = new[name] / old[name] if old[name] else float("nan")
+        print(f"{name:<70} {old[name]:>14.6g} {new[name]:>14.6g} {ratio:>8.2f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "benchmarks", nargs="*", help="benchmarks to run, all by default"
+    )
+    parser.add_argument("--output", help="JSON file where results are written")
+    parser.add_argument(
+        "--compare", help="JSON results of a previous run to compare to"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=5000, help="rows per throughput benchmark"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed runs, the best one is kept"
+    )
+    parser.add_argument(
+        "--details-games", type=int, default=20, help="games of the detail benchmarks"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="simulated latency in seconds"
+    )
+    arguments = parser.parse_args(argv)
+
+    results = {
+        "environment": get_environment(),
+        "parameters": {
+            "rows": arguments.rows,
+            "repeat": arguments.repeat,
+            "details_games": arguments.details_games,
+            "latency": arguments.latency,
+        },
+        "results": {},
+    }
+
+    # Champion IDs resolved with the real lol_id_tools must not be reused with the fixture ones, and conversely
+    clear_champion_cache()
+
+    with mock.patch.object(lit, "get_id", get_fixture_champion_id):
+        for name in arguments.benchmarks or benchmarks:
+            print(f"Running {name}")
+            results["results"][name] = benchmarks[name](arguments)
+
+    clear_champion_cache()
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file))
+    else:
+        print(json.dumps(results["results"], indent=2))
+
+    return results
@@ -1,12 +1,78 @@
-from leaguepedia_parser.parsers.game_parser import (
-    get_regions,
-    get_tournaments,
-    get_games,
-    get_game_details,
-)
-from leaguepedia_parser.parsers.team_parser import (
-    get_team_logo,
-    get_long_team_name_from_trigram,
-    get_team_thumbnail,
-    get_all_team_assets
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public functions and classes by module, imported on first access as lol_dto, lol_id_tools and mwrogue are slow to
+# import and many scripts only need a few functions
+lazy_imports = {
+    "leaguepedia_parser.parsers.game_parser": [
+        "get_regions",
+        "get_champions_names",
+        "get_tournaments",
+        "iter_tournaments",
+        "get_games",
+        "iter_games",
+        "get_game_details",
+        "get_games_details",
+        "get_tournament_full",
+    ],
+    "leaguepedia_parser.parsers.team_parser": [
+        "get_team_logo",
+        "get_long_team_name_from_trigram",
+        "get_team_thumbnail",
+        "get_all_team_assets",
+        "get_team_assets_bulk",
+        "invalidate_team_cache",
+    ],
+    "leaguepedia_parser.parsers.export_parser": [
+        "write_games_parquet",
+        "iter_games_tables",
+    ],
+    "leaguepedia_parser.transmuters.champions": ["warm_champion_cache"],
+    "leaguepedia_parser.parsers.sync_parser": ["GamesSynchronizer", "GamesChangeset"],
+}
+
+__all__ = [name for names in lazy_imports.values() for name in names]
+
+if TYPE_CHECKING:
+    from leaguepedia_parser.parsers.game_parser import (
+        get_regions,
+        get_champions_names,
+        get_tournaments,
+        iter_tournaments,
+        get_games,
+        iter_games,
+        get_game_details,
+        get_games_details,
+        get_tournament_full,
+    )
+    from leaguepedia_parser.parsers.team_parser import (
+        get_team_logo,
+        get_long_team_name_from_trigram,
+        get_team_thumbnail,
+        get_all_team_assets,
+        get_team_assets_bulk,
+        invalidate_team_cache,
+    )
+    from leaguepedia_parser.parsers.export_parser import (
+        write_games_parquet,
+        iter_games_tables,
+    )
+    from leaguepedia_parser.transmuters.champions import warm_champion_cache
+    from leaguepedia_parser.parsers.sync_parser import GamesSynchronizer, GamesChangeset
+
+
+def __getattr__(name: str):
+    for module_name, names in lazy_imports.items():
+        if name in names:
+            value = getattr(import_module(module_name), name)
+
+            # Later accesses do not go through __getattr__
+            globals()[name] = value
+
+            return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
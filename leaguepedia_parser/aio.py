@@ -0,0 +1,21 @@
+"""asyncio versions of the leaguepedia_parser functions, requiring the optional aiohttp dependency.
+
+Typical usage example:
+    from leaguepedia_parser import aio
+
+    games = await aio.get_games("LCK/2020 Season/Spring Season")
+"""
+
+from leaguepedia_parser.parsers.async_game_parser import (
+    get_regions,
+    get_tournaments,
+    get_games,
+    get_game_details,
+)
+from leaguepedia_parser.parsers.async_team_parser import (
+    get_team_logo,
+    get_long_team_name_from_trigram,
+    get_team_thumbnail,
+    get_all_team_assets,
+)
+from leaguepedia_parser.site.async_leaguepedia import async_leaguepedia
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Dict, Iterable, List, Union, TYPE_CHECKING
+
+
+from leaguepedia_parser.parsers.game_parser import (
+    _get_tournaments_query,
+    _get_games_query,
+    _get_game_id,
+    _get_picks_bans_query,
+    _get_projection,
+    _get_row_transmuter,
+    _plan_query,
+    _chunk_values,
+    _get_players_links,
+    _add_players_information,
+    _get_cached_players_information,
+    _get_players_information_query,
+    _cache_players_information,
+    scoreboard_players_fields,
+    tournaments_projection_fields,
+)
+from leaguepedia_parser.site.async_leaguepedia import async_leaguepedia
+from leaguepedia_parser.site.leaguepedia import leaguepedia
+from leaguepedia_parser.transmuters.field_names import game_fields
+from leaguepedia_parser.transmuters.game import transmute_game
+from leaguepedia_parser.transmuters.game_players import add_players
+from leaguepedia_parser.transmuters.picks_bans import transmute_picks_bans
+from leaguepedia_parser.transmuters.tournament import (
+    transmute_tournament,
+    LeaguepediaTournament,
+)
+
+if TYPE_CHECKING:
+    from lol_dto.classes.game import LolGame
+
+
+async def get_regions() -> List[str]:
+    """Returns a list of all regions that appear in the Tournaments table."""
+    regions_dicts_list = await async_leaguepedia.query(
+        tables="Tournaments", fields="Region", group_by="Region"
+    )
+
+    return [row["Region"] for row in regions_dicts_list]
+
+
+async def get_tournaments(
+    region: str = None,
+    year: int = None,
+    tournament_level: str = "Primary",
+    is_playoffs: bool = None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
+    **kwargs,
+) -> List[Union[LeaguepediaTournament, tuple]]:
+    """Returns a list of tournaments, see game_parser.get_tournaments()."""
+    fields = _get_projection(
+        fields, tournaments_projection_fields, "OverviewPage", as_tuples
+    )
+    transmute = _get_row_transmuter(
+        transmute_tournament, "TournamentRow", fields, as_tuples
+    )
+
+    result = await async_leaguepedia.query(
+        **_get_tournaments_query(region, year, tournament_level, is_playoffs, fields),
+        **kwargs,
+    )
+
+    return [transmute(tournament) for tournament in result]
+
+
+async def get_games(
+    tournament_overview_page=None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
+    **kwargs,
+) -> List[Union["LolGame", tuple]]:
+    """Returns the list of games played in a tournament, see game_parser.get_games()."""
+    fields = _get_projection(fields, game_fields, "GameId", as_tuples)
+    transmute = _get_row_transmuter(transmute_game, "GameRow", fields, as_tuples)
+
+    games = await async_leaguepedia.query(
+        **_get_games_query(tournament_overview_page, fields), **kwargs
+    )
+
+    return [transmute(game) for game in games]
+
+
+async def get_game_details(game: "LolGame", add_page_id=False) -> "LolGame":
+    """Gets most game information available on Leaguepedia, see game_parser.get_game_details()."""
+    game_id = _get_game_id(game)
+
+    picks_bans, players = await asyncio.gather(
+        async_leaguepedia.query(
+            **_get_picks_bans_query(f"PicksAndBansS7.GameId = '{game_id}'")
+        ),
+        _query_players(f"ScoreboardPlayers.GameId = '{game_id}'"),
+    )
+
+    game = add_players(
+        game,
+        players,
+        add_page_id=add_page_id,
+        players_snapshot=leaguepedia.players_snapshot,
+    )
+    game.picksBans = transmute_picks_bans(picks_bans[0]) if picks_bans else None
+
+    return game
+
+
+async def _query_players(where: str) -> List[dict]:
+    """Returns ScoreboardPlayers rows with their Players information, see game_parser._query_players()."""
+    players = await async_leaguepedia.query(
+        **_plan_query(scoreboard_players_fields, where=where)
+    )
+
+    if leaguepedia.players_snapshot:
+        # The snapshot is refreshed with blocking requests, which must not stop the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, leaguepedia.players_snapshot.refresh_if_stale
+        )
+        return players
+
+    return _add_players_information(
+        players, await _get_players_information(_get_players_links(players))
+    )
+
+
+async def _get_players_information(links: List[str]) -> Dict[str, dict]:
+    """Returns Players rows keyed by link, only querying the players absent from the cache."""
+    players_information, missing_links = _get_cached_players_information(links)
+    chunks = list(_chunk_values(missing_links))
+
+    results = await asyncio.gather(
+        *(
+            async_leaguepedia.query(**_get_players_information_query(chunk))
+            for chunk in chunks
+        )
+    )
+
+    for chunk, rows in zip(chunks, results):
+        players_information.update(_cache_players_information(chunk, rows))
+
+    return players_information
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Optional, Dict
+
+from leaguepedia_parser.parsers.team_parser import (
+    TeamAssets,
+    team_lookup_masks,
+    _check_team_assets,
+    _get_team_lookup_request,
+    _merge_team_lookup,
+    _get_lookup_value,
+    _get_page_title,
+    _get_event_rosters_query,
+    _get_tricodes,
+)
+from leaguepedia_parser.site.async_leaguepedia import async_leaguepedia
+
+
+async def get_all_team_assets(team_link: str) -> TeamAssets:
+    """Returns a TeamAssets object, see team_parser.get_all_team_assets()."""
+    logo_title = f"File:{team_link}logo square.png"
+    thumbnail_title = f"File:{team_link}logo std.png"
+
+    urls, long_name = await asyncio.gather(
+        _get_images_urls(f"{logo_title}|{thumbnail_title}"),
+        _get_team_lookup_value(team_link, "link"),
+    )
+
+    assets = TeamAssets(
+        thumbnail_url=urls.get(thumbnail_title),
+        logo_url=urls.get(logo_title),
+        long_name=long_name,
+    )
+
+    _check_team_assets(team_link, assets)
+
+    return assets
+
+
+async def get_team_logo(team_name: str, _retry=True) -> str:
+    """Returns the team logo URL, see team_parser.get_team_logo()."""
+    return await _get_team_asset(f"File:{team_name}logo square.png", team_name, _retry)
+
+
+async def get_team_thumbnail(team_name: str, _retry=True) -> str:
+    """Returns the team thumbnail URL, see team_parser.get_team_thumbnail()."""
+    return await _get_team_asset(f"File:{team_name}logo std.png", team_name, _retry)
+
+
+async def _get_team_asset(asset_name: str, team_name: str, _retry=True) -> str:
+    url = (await _get_images_urls(asset_name)).get(asset_name)
+
+    if url:
+        return url
+
+    # This happens when the team name was not properly understood.
+    if _retry:
+        return await get_team_logo(
+            await get_long_team_name_from_trigram(team_name), False
+        )
+    else:
+        raise Exception("Logo not found for the given team name")
+
+
+async def _get_images_urls(titles: str) -> Dict[str, str]:
+    """Returns the URL of each existing file in titles, keyed by the requested title."""
+    result = await async_leaguepedia.api(
+        "query", prop="imageinfo", titles=titles, iiprop="url"
+    )
+
+    # MediaWiki normalizes titles, for example replacing underscores
+    normalized = {
+        item["to"]: item["from"] for item in result["query"].get("normalized", [])
+    }
+
+    return {
+        normalized.get(page["title"], page["title"]): page["imageinfo"][0]["url"]
+        for page in result["query"]["pages"].values()
+        if page.get("imageinfo")
+    }
+
+
+async def get_long_team_name_from_trigram(
+    team_abbreviation: str,
+    event_overview_page: str = None,
+) -> Optional[str]:
+    """Returns the long team name for the given team abbreviation, see team_parser.get_long_team_name_from_trigram()."""
+    # We use only lowercase team abbreviations for simplicity
+    team_abbreviation = team_abbreviation.lower()
+
+    if event_overview_page:
+        event_tricodes = await _get_event_tricodes(event_overview_page)
+        return event_tricodes.get(team_abbreviation)
+
+    else:
+        return await _get_team_lookup_value(team_abbreviation, "link")
+
+
+async def _get_team_lookup_value(key: str, length: str) -> Optional[str]:
+    """Returns a value from Leaguepedia’s team names lookup module, see team_parser._get_team_lookup_value()."""
+    return _get_lookup_value(await _get_team_lookup(), key, length)
+
+
+async def _get_team_lookup() -> dict:
+    if "Team" not in async_leaguepedia.lookup_cache:
+        halves = await asyncio.gather(
+            *(
+                async_leaguepedia.api(
+                    "expandtemplates", **_get_team_lookup_request(mask)
+                )
+                for mask in team_lookup_masks
+            )
+        )
+
+        async_leaguepedia.lookup_cache["Team"] = _merge_team_lookup(halves)
+
+    return async_leaguepedia.lookup_cache["Team"]
+
+
+async def _get_event_tricodes(event_overview_page: str) -> Dict[str, str]:
+    """Returns the teams of an event keyed by their lowercase short name."""
+    cache_key = ("Event", event_overview_page)
+
+    if cache_key not in async_leaguepedia.lookup_cache:
+        # We follow redirects to get the actual event page
+        event = _get_page_title(
+            await async_leaguepedia.api(
+                "query", titles=event_overview_page, redirects=1
+            )
+        )
+
+        rows = await async_leaguepedia.query(**_get_event_rosters_query(event))
+
+        async_leaguepedia.lookup_cache[cache_key] = _get_tricodes(
+            rows, await _get_team_lookup()
+        )
+
+    return async_leaguepedia.lookup_cache[cache_key]
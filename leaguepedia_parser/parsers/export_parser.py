@@ -0,0 +1,139 @@
+import itertools
+from concurrent.futures import Executor
+from typing import Iterator, List, Optional, Union
+
+from leaguepedia_parser.parsers.game_parser import _get_games_query
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite, leaguepedia
+from leaguepedia_parser.site.recording import Recording
+from leaguepedia_parser.transmuters.columnar import (
+    get_games_schema,
+    transmute_games_table,
+)
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Site of worker processes, created by their first task
+_worker_site: Optional[LeaguepediaSite] = None
+
+
+def write_games_parquet(
+    path: str,
+    tournament_overview_pages: Union[str, List[str]],
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> int:
+    """Writes the games of one or many tournaments to a Parquet file.
+
+    Each page of results is written as soon as it is downloaded, without building LolGame objects, which makes it
+    suited to large analytics dumps.
+
+    Typical usage example:
+        write_games_parquet("lck.parquet", ["LCK/2020 Season/Spring Season", "LCK/2020 Season/Summer Season"])
+
+    Args:
+        path: path of the Parquet file.
+        tournament_overview_pages: tournament overview pages, acquired from get_tournaments().
+        executor: an optional process pool downloading and transmuting pages, see iter_games_tables().
+        **kwargs: query_pages() arguments like cache_ttl, only used without executor.
+
+    Returns:
+        The number of games written.
+    """
+    # Raises an ImportError with install instructions if pyarrow is missing
+    schema = get_games_schema()
+    rows_count = 0
+
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for table in iter_games_tables(tournament_overview_pages, executor, **kwargs):
+            writer.write_table(table)
+            rows_count += table.num_rows
+
+    return rows_count
+
+
+def iter_games_tables(
+    tournament_overview_pages: Union[str, List[str]],
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> Iterator["pyarrow.Table"]:
+    """Yields Arrow tables of the games of one or many tournaments, one per page of results, in order.
+
+    With a process pool, each worker downloads and transmutes its own pages, and only sends back Arrow tables, which
+    are cheap to pickle. Games are counted first, so that all pages can be requested at the same time. Workers
+    replay the recording of leaguepedia, but do not use its cache, mirror or rate limit.
+
+    Champion IDs resolved before creating the pool, for example with warm_champion_cache(), are inherited by workers
+    on platforms where processes are forked.
+
+    Typical usage example:
+        with ProcessPoolExecutor(16) as executor:
+            for table in iter_games_tables(tournament_overview_pages, executor):
+                ...
+
+    Args:
+        tournament_overview_pages: tournament overview pages, acquired from get_tournaments().
+        executor: an optional process pool, pages being downloaded and transmuted in the current process without it.
+        **kwargs: query_pages() arguments like cache_ttl, only used without executor.
+    """
+    if isinstance(tournament_overview_pages, str):
+        tournament_overview_pages = [tournament_overview_pages]
+
+    if executor is None:
+        for tournament_overview_page in tournament_overview_pages:
+            for page in leaguepedia.query_pages(
+                **_get_games_query(tournament_overview_page), **kwargs
+            ):
+                if page:
+                    yield transmute_games_table(page)
+
+        return
+
+    # Executor tasks must not wait on tasks submitted to their own executor
+    map_function = map if leaguepedia.in_executor_thread() else leaguepedia.executor.map
+
+    counts = map_function(
+        lambda page: leaguepedia._count(**_get_games_query(page)) or 0,
+        tournament_overview_pages,
+    )
+    pages = [
+        (tournament_overview_page, offset)
+        for tournament_overview_page, count in zip(tournament_overview_pages, counts)
+        for offset in range(0, count, leaguepedia.limit)
+    ]
+
+    for table in executor.map(
+        _get_games_table,
+        itertools.repeat(leaguepedia.limit),
+        itertools.repeat(leaguepedia.max_retries),
+        itertools.repeat(leaguepedia.recording),
+        [tournament_overview_page for tournament_overview_page, _ in pages],
+        [offset for _, offset in pages],
+    ):
+        if table.num_rows:
+            yield table
+
+
+def _get_games_table(
+    limit: int,
+    max_retries: int,
+    recording: Optional[Recording],
+    tournament_overview_page: str,
+    offset: int,
+) -> "pyarrow.Table":
+    """Runs in worker processes, downloading and transmuting a single page of games."""
+    global _worker_site
+
+    if _worker_site is None or (_worker_site.limit, _worker_site.max_retries) != (
+        limit,
+        max_retries,
+    ):
+        _worker_site = LeaguepediaSite(limit=limit, max_retries=max_retries)
+
+    _worker_site.recording = recording
+
+    return transmute_games_table(
+        _worker_site._query_page(offset, **_get_games_query(tournament_overview_page))
+    )
@@ -1,9 +1,22 @@
-from concurrent.futures.thread import ThreadPoolExecutor
-from typing import List, Optional
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    List,
+    Optional,
+    Dict,
+    Iterable,
+    Iterator,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
-from lol_dto.classes.game import LolGame
-from lol_dto.classes.game.lol_game import LolPickBan
 
+from leaguepedia_parser.site.cache import TTLCache
 from leaguepedia_parser.site.leaguepedia import leaguepedia
 from leaguepedia_parser.transmuters.field_names import (
     game_fields,
@@ -21,6 +34,47 @@ from leaguepedia_parser.transmuters.tournament import (
     LeaguepediaTournament,
 )
 
+if TYPE_CHECKING:
+    from lol_dto.classes.game import LolGame
+    from lol_dto.classes.game.lol_game import LolPickBan
+
+# Maximum number of values sent in a single "IN (...)" cargo condition
+# 50 games are 500 ScoreboardPlayers rows, which is exactly one page of results
+in_condition_size = 50
+
+# Maximum length of the "IN (...)" condition, to stay well under URL length limits
+in_condition_length = 4000
+
+# Join conditions between cargo tables, from which _plan_query() builds the cheapest join graph
+cargo_joins = {
+    frozenset(
+        ["ScoreboardGames", "ScoreboardPlayers"]
+    ): "ScoreboardGames.GameId = ScoreboardPlayers.GameId",
+    frozenset(
+        ["ScoreboardGames", "PicksAndBansS7"]
+    ): "PicksAndBansS7.GameId = ScoreboardGames.GameId",
+    frozenset(
+        ["ScoreboardPlayers", "PlayerRedirects"]
+    ): "ScoreboardPlayers.Link = PlayerRedirects.AllName",
+    frozenset(
+        ["PlayerRedirects", "Players"]
+    ): "PlayerRedirects.OverviewPage = Players.OverviewPage",
+}
+
+# game_players_fields split between the per-game table and the players information table
+scoreboard_players_fields = sorted(
+    field for field in game_players_fields if field.startswith("ScoreboardPlayers.")
+) + ["ScoreboardPlayers.Link", "ScoreboardPlayers.GameId=GameId"]
+players_fields = sorted(
+    field for field in game_players_fields if field.startswith("Players.")
+) + ["Players._pageID=pageId"]
+
+# Fields that can be projected in get_tournaments(), League_Short coming from the Leagues table
+tournaments_projection_fields = tournaments_fields | {"League_Short"}
+
+# Caches Players information per ScoreboardPlayers.Link, as the same players appear in every game of a league
+players_cache = TTLCache(ttl=24 * 3600, max_entries=16384)
+
 
 def get_regions() -> List[str]:
     """Returns a list of all regions that appear in the Tournaments table.
@@ -35,27 +89,97 @@ def get_regions() -> List[str]:
     return [row["Region"] for row in regions_dicts_list]
 
 
+def get_champions_names() -> List[str]:
+    """Returns a list of all champion names that appear in the Champions table.
+
+    Typical usage example, to resolve all champion IDs at startup:
+        warm_champion_cache(get_champions_names())
+
+    Returns:
+        The list of all champion names, simply strings.
+    """
+    champions_dicts_list = leaguepedia.query(tables="Champions", fields="Name")
+
+    return [row["Name"] for row in champions_dicts_list]
+
+
 def get_tournaments(
     region: str = None,
     year: int = None,
     tournament_level: str = "Primary",
     is_playoffs: bool = None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
     **kwargs,
-) -> List[LeaguepediaTournament]:
+) -> List[Union[LeaguepediaTournament, tuple]]:
     """Returns a list of tournaments.
 
     Typical usage example:
         get_tournaments('China', 2020)
+        get_tournaments('China', 2020, fields=['Name', 'DateStart'], as_tuples=True)
 
     Args:
         region: Recommended to get it from get_tournament_regions().
         year: Year to filter on. Defaults to None.
         tournament_level: Primary, Secondary, Major, Secondary, Showmatch. Defaults to Primary.
         is_playoffs: Can be used to filter between playoffs and regular season tournaments.
+        fields: Tournaments fields and League_Short to query, OverviewPage is always added. Defaults to all fields.
+        as_tuples: whether to return named tuples of the raw values of fields instead of LeaguepediaTournament.
 
     Returns:
-        A list of tournaments dictionaries.
+        A list of tournaments, partially populated when fields are given.
     """
+    fields = _get_projection(
+        fields, tournaments_projection_fields, "OverviewPage", as_tuples
+    )
+    transmute = _get_row_transmuter(
+        transmute_tournament, "TournamentRow", fields, as_tuples
+    )
+
+    result = leaguepedia.query(
+        **_get_tournaments_query(region, year, tournament_level, is_playoffs, fields),
+        **kwargs,
+    )
+
+    return [transmute(tournament) for tournament in result]
+
+
+def iter_tournaments(
+    region: str = None,
+    year: int = None,
+    tournament_level: str = "Primary",
+    is_playoffs: bool = None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
+    **kwargs,
+) -> Iterator[Union[LeaguepediaTournament, tuple]]:
+    """Yields tournaments as soon as each page of results is downloaded.
+
+    Takes the same arguments as get_tournaments(), and is better suited to large dumps as the whole list of
+    tournaments is never held in memory.
+    """
+    fields = _get_projection(
+        fields, tournaments_projection_fields, "OverviewPage", as_tuples
+    )
+    transmute = _get_row_transmuter(
+        transmute_tournament, "TournamentRow", fields, as_tuples
+    )
+
+    for page in leaguepedia.query_pages(
+        **_get_tournaments_query(region, year, tournament_level, is_playoffs, fields),
+        **kwargs,
+    ):
+        yield from (transmute(tournament) for tournament in page)
+
+
+def _get_tournaments_query(
+    region: Optional[str],
+    year: Optional[int],
+    tournament_level: Optional[str],
+    is_playoffs: Optional[bool],
+    fields: List[str] = None,
+) -> dict:
+    """Returns the cargo query kwargs used to get tournaments."""
     # We need to cast is_playoffs as an integer for the cargoquery
     if is_playoffs is not None:
         is_playoffs = 1 if is_playoffs else 0
@@ -76,41 +200,161 @@ def get_tournaments(
         ]
     )
 
-    result = leaguepedia.query(
+    if fields is None:
+        return dict(
+            tables="Tournaments, Leagues",
+            join_on="Tournaments.League = Leagues.League",
+            fields=f"Leagues.League_Short, {', '.join(f'Tournaments.{field}' for field in sorted(tournaments_fields))}",
+            where=where,
+        )
+
+    # Leagues are only joined when their short name is projected
+    if "League_Short" not in fields:
+        return dict(
+            tables="Tournaments",
+            fields=", ".join(f"Tournaments.{field}" for field in fields),
+            where=where,
+        )
+
+    return dict(
         tables="Tournaments, Leagues",
         join_on="Tournaments.League = Leagues.League",
-        fields=f"Leagues.League_Short, {', '.join(f'Tournaments.{field}' for field in tournaments_fields)}",
+        fields=", ".join(
+            (
+                "Leagues.League_Short"
+                if field == "League_Short"
+                else f"Tournaments.{field}"
+            )
+            for field in fields
+        ),
         where=where,
-        **kwargs,
     )
 
-    return [transmute_tournament(tournament) for tournament in result]
-
 
-def get_games(tournament_overview_page=None, **kwargs) -> List[LolGame]:
+def get_games(
+    tournament_overview_page=None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
+    **kwargs,
+) -> List[Union["LolGame", tuple]]:
     """Returns the list of games played in a tournament.
 
     Returns basic information about all games played in a tournament.
 
+    Only querying the fields needed shrinks the responses, and the time spent parsing and transmuting them. Games
+    keep their GameId, so get_game_details() can still be used on them.
+
+    Typical usage example:
+        get_games('LCK/2020 Season/Spring Season', fields=['DateTime_UTC', 'Team1', 'Team2', 'Winner'])
+
     Args:
         tournament_overview_page: tournament overview page, acquired from get_tournaments().
+        fields: ScoreboardGames fields to query, GameId is always added. Defaults to all fields.
+        as_tuples: whether to return named tuples of the raw values of fields instead of LolGame.
 
     Returns:
-        A list of LolGame with basic game information.
+        A list of LolGame with basic game information, partially populated when fields are given.
     """
+    fields = _get_projection(fields, game_fields, "GameId", as_tuples)
+    transmute = _get_row_transmuter(transmute_game, "GameRow", fields, as_tuples)
 
     games = leaguepedia.query(
+        **_get_games_query(tournament_overview_page, fields), **kwargs
+    )
+
+    return [transmute(game) for game in games]
+
+
+def iter_games(
+    tournament_overview_page=None,
+    fields: Iterable[str] = None,
+    as_tuples: bool = False,
+    **kwargs,
+) -> Iterator[Union["LolGame", tuple]]:
+    """Yields the games played in a tournament as soon as each page of results is downloaded.
+
+    Takes the same arguments as get_games(), and is better suited to large dumps as the whole list of games is never
+    held in memory.
+    """
+    fields = _get_projection(fields, game_fields, "GameId", as_tuples)
+    transmute = _get_row_transmuter(transmute_game, "GameRow", fields, as_tuples)
+
+    for page in leaguepedia.query_pages(
+        **_get_games_query(tournament_overview_page, fields), **kwargs
+    ):
+        yield from (transmute(game) for game in page)
+
+
+def _get_games_query(
+    tournament_overview_page: Optional[str], fields: List[str] = None
+) -> dict:
+    """Returns the cargo query kwargs used to get the games of a tournament."""
+    return dict(
         tables="ScoreboardGames",
-        fields=", ".join(game_fields),
+        fields=", ".join(sorted(game_fields) if fields is None else fields),
         where=f"ScoreboardGames.OverviewPage ='{tournament_overview_page}'",
         order_by="ScoreboardGames.DateTime_UTC",
-        **kwargs,
     )
 
-    return [transmute_game(game) for game in games]
+
+def _get_projection(
+    fields: Optional[Iterable[str]],
+    available_fields: Collection[str],
+    identifier_field: str,
+    as_tuples: bool,
+) -> Optional[List[str]]:
+    """Returns the fields to query, or None to query the default fields.
+
+    Args:
+        fields: the requested fields.
+        available_fields: the fields that can be projected.
+        identifier_field: added first to the fields when it is not requested, as it identifies rows.
+        as_tuples: tuples need explicit fields, so all available fields are returned when none are requested.
+
+    Raises:
+        ValueError: when some of the fields are unknown.
+    """
+    if fields is None:
+        return sorted(available_fields) if as_tuples else None
+
+    # Removes duplicates while keeping the order of the fields, which is also the order of tuples
+    fields = list(dict.fromkeys(fields))
+
+    unknown_fields = [field for field in fields if field not in available_fields]
+
+    if unknown_fields:
+        raise ValueError(
+            f"Unknown fields {', '.join(unknown_fields)}, available fields are {', '.join(sorted(available_fields))}"
+        )
+
+    return fields if identifier_field in fields else [identifier_field, *fields]
+
+
+def _get_row_transmuter(
+    transmute: Callable[[dict], Any],
+    name: str,
+    fields: Optional[List[str]],
+    as_tuples: bool,
+) -> Callable[[dict], Any]:
+    """Returns transmute, or a function making named tuples of the raw values of fields from cargo rows."""
+    if not as_tuples:
+        return transmute
+
+    row_class = _get_row_class(name, tuple(fields))
+
+    # Cargo returns fields with spaces instead of underscores when they are not aliased
+    keys = [field.replace("_", " ") for field in fields]
+
+    return lambda row: row_class._make([row[key] for key in keys])
 
 
-def get_game_details(game: LolGame, add_page_id=False) -> LolGame:
+@lru_cache(maxsize=None)
+def _get_row_class(name: str, fields: Tuple[str, ...]) -> type:
+    """Returns a named tuple class per set of fields, as creating one is much slower than creating a tuple."""
+    return namedtuple(name, fields)
+
+
+def get_game_details(game: "LolGame", add_page_id=False) -> "LolGame":
     # TODO Add more scoreboard information in this step
     """Gets most game information available on Leaguepedia.
 
@@ -121,31 +365,188 @@ def get_game_details(game: LolGame, add_page_id=False) -> LolGame:
     Returns:
         The LolGame with all information available on Leaguepedia.
     """
+    _get_game_id(game)
+
+    # Waiting on the shared executor from one of its own threads could deadlock
+    if leaguepedia.in_executor_thread():
+        game = _add_game_players(game, add_page_id)
+        game.picksBans = _get_picks_bans(game)
+
+        return game
+
+    picks_bans_future = leaguepedia.executor.submit(_get_picks_bans, game)
+    game_future = leaguepedia.executor.submit(_add_game_players, game, add_page_id)
+
+    game = game_future.result()
+    game.picksBans = picks_bans_future.result()
+
+    return game
+
+
+def get_games_details(games: List["LolGame"], add_page_id=False) -> List["LolGame"]:
+    """Gets most game information available on Leaguepedia for many games at once.
+
+    Picks and bans and players are queried for whole chunks of games with "GameId IN (...)" conditions, which makes
+    a handful of cargo queries instead of two per game.
+
+    Args:
+        games: A list of LolGame with Leaguepedia IDs in their 'sources' dict.
+        add_page_id: whether or not to link the player page ID to their object. Mostly for debugging.
+
+    Returns:
+        The list of LolGame with all information available on Leaguepedia, in the input order. Games sharing the same
+        GameId all get details, while being queried once.
+    """
+    games_by_id = {}
+
+    for game in games:
+        games_by_id.setdefault(_get_game_id(game), []).append(game)
+
+    for game_ids in _chunk_values(list(games_by_id)):
+        picks_bans = leaguepedia.query(
+            **_get_picks_bans_query(_in_condition("PicksAndBansS7.GameId", game_ids))
+        )
+        players = _query_players(_in_condition("ScoreboardPlayers.GameId", game_ids))
+
+        _add_games_details(
+            [game for game_id in game_ids for game in games_by_id[game_id]],
+            picks_bans,
+            players,
+            add_page_id,
+        )
+
+    return games
+
+
+def get_tournament_full(
+    tournament_overview_page: str, add_page_id=False
+) -> List["LolGame"]:
+    """Returns the games played in a tournament with all information available on Leaguepedia.
+
+    Games, picks and bans, and players are each fetched with a single query for the whole tournament, the three
+    queries running at the same time. A whole split loads in a handful of requests.
+
+    Args:
+        tournament_overview_page: tournament overview page, acquired from get_tournaments().
+        add_page_id: whether or not to link the player page ID to their object. Mostly for debugging.
+
+    Returns:
+        A list of LolGame with all information available on Leaguepedia.
+    """
+    queries = [
+        lambda: leaguepedia.query(**_get_games_query(tournament_overview_page)),
+        lambda: leaguepedia.query(
+            **_get_picks_bans_query(
+                f"ScoreboardGames.OverviewPage = '{tournament_overview_page}'"
+            )
+        ),
+        lambda: _query_players(
+            f"ScoreboardPlayers.OverviewPage = '{tournament_overview_page}'"
+        ),
+    ]
+
+    if leaguepedia.in_executor_thread():
+        games, picks_bans, players = [query() for query in queries]
+    else:
+        games, picks_bans, players = leaguepedia.executor.map(
+            lambda query: query(), queries
+        )
+
+    games = [transmute_game(game) for game in games]
+
+    _add_games_details(
+        games,
+        picks_bans,
+        players,
+        add_page_id,
+    )
+
+    return games
+
+
+def _add_games_details(
+    games: List["LolGame"],
+    picks_bans: List[dict],
+    players: List[dict],
+    add_page_id: bool,
+):
+    """Splits picks and bans and players rows of many games back per game, and adds them to the games."""
+    picks_bans = _group_by_game_id(picks_bans)
+    players = _group_by_game_id(players)
+
+    for game in games:
+        game_id = _get_game_id(game)
+
+        add_players(
+            game,
+            players.get(game_id, []),
+            add_page_id=add_page_id,
+            players_snapshot=leaguepedia.players_snapshot,
+        )
+
+        if game_id in picks_bans:
+            game.picksBans = transmute_picks_bans(picks_bans[game_id][0])
+
+
+def _get_game_id(game: "LolGame") -> str:
+    """Returns the Leaguepedia GameId of the game, raising a ValueError if it is missing."""
     try:
         assert game.sources.leaguepedia.gameId
-    except AssertionError:
+    except (AssertionError, AttributeError):
         raise ValueError(
             f"Leaguepedia GameId not present in the input object, joins cannot be performed to get details"
         )
 
-    with ThreadPoolExecutor() as executor:
-        picks_bans_future = executor.submit(_get_picks_bans, game)
-        game_future = executor.submit(_add_game_players, game, add_page_id)
+    return game.sources.leaguepedia.gameId
 
-    game = game_future.result()
-    game.picksBans = picks_bans_future.result()
 
-    return game
+def _chunk_values(values: List[str]) -> Iterator[List[str]]:
+    """Splits values in chunks small enough for a single "IN (...)" condition."""
+    chunk, chunk_length = [], 0
+
+    for value in values:
+        # Quotes and separator
+        value_length = len(value) + 4
+
+        if chunk and (
+            len(chunk) >= in_condition_size
+            or chunk_length + value_length > in_condition_length
+        ):
+            yield chunk
+            chunk, chunk_length = [], 0
+
+        chunk.append(value)
+        chunk_length += value_length
+
+    if chunk:
+        yield chunk
 
 
-def _get_picks_bans(game: LolGame) -> Optional[List[LolPickBan]]:
+def _in_condition(field_name: str, values: List[str]) -> str:
+    """Returns the WHERE condition matching all the given values."""
+    # Double quotes as player names can contain single quotes, and backslashes and double quotes are escaped by
+    # doubling them, like MySQL behind cargo does
+    values = ", ".join(
+        '"' + value.replace("\\", "\\\\").replace('"', '""') + '"' for value in values
+    )
+
+    return f"{field_name} IN ({values})"
+
+
+def _group_by_game_id(rows: List[dict]) -> Dict[str, List[dict]]:
+    """Splits rows coming from a multi-games query by their GameId."""
+    rows_by_game_id = {}
+
+    for row in rows:
+        rows_by_game_id.setdefault(row["GameId"], []).append(row)
+
+    return rows_by_game_id
+
+
+def _get_picks_bans(game: "LolGame") -> Optional[List["LolPickBan"]]:
     """Returns the picks and bans for the game."""
-    # Double join as required by Leaguepedia
     picks_bans = leaguepedia.query(
-        tables="PicksAndBansS7, ScoreboardGames",
-        join_on="PicksAndBansS7.GameId = ScoreboardGames.GameId",
-        fields=", ".join(picks_bans_fields),
-        where=f"ScoreboardGames.GameId = '{game.sources.leaguepedia.gameId}'",
+        **_get_picks_bans_query(f"PicksAndBansS7.GameId = '{_get_game_id(game)}'")
     )
 
     if not picks_bans:
@@ -154,16 +555,160 @@ def _get_picks_bans(game: LolGame) -> Optional[List[LolPickBan]]:
     return transmute_picks_bans(picks_bans[0])
 
 
-def _add_game_players(game: LolGame, add_page_id: bool) -> LolGame:
+def _get_picks_bans_query(where: str) -> dict:
+    """Returns the cargo query kwargs used to get picks and bans, with their GameId."""
+    return _plan_query(
+        [f"PicksAndBansS7.{field}={field}" for field in picks_bans_fields]
+        + ["PicksAndBansS7.GameId=GameId"],
+        where=where,
+    )
+
+
+def _add_game_players(game: "LolGame", add_page_id: bool) -> "LolGame":
     """Joins on PlayersRedirect to get all players information."""
+    players = _query_players(f"ScoreboardPlayers.GameId = '{_get_game_id(game)}'")
+
+    return add_players(
+        game,
+        players,
+        add_page_id=add_page_id,
+        players_snapshot=leaguepedia.players_snapshot,
+    )
+
+
+def _query_players(where: str) -> List[dict]:
+    """Returns ScoreboardPlayers rows with their Players information.
+
+    Players information is queried separately and cached, as the same players appear in every game of a league. When
+    a players snapshot is enabled, only ScoreboardPlayers is queried and add_players() reads the snapshot instead.
+    """
+    players = leaguepedia.query(**_plan_query(scoreboard_players_fields, where=where))
+
+    if leaguepedia.players_snapshot:
+        leaguepedia.players_snapshot.refresh_if_stale()
+        return players
+
+    return _add_players_information(
+        players, _get_players_information(_get_players_links(players))
+    )
+
+
+def _get_players_links(players: List[dict]) -> List[str]:
+    return list(dict.fromkeys(player["Link"] for player in players if player["Link"]))
+
+
+def _add_players_information(
+    players: List[dict], players_information: Dict[str, dict]
+) -> List[dict]:
+    for player in players:
+        player.update(players_information.get(player["Link"], {}))
+
+    return players
+
+
+def _get_players_information(links: List[str]) -> Dict[str, dict]:
+    """Returns Players rows keyed by ScoreboardPlayers.Link, only querying the players absent from the cache."""
+    players_information, missing_links = _get_cached_players_information(links)
+
+    for chunk in _chunk_values(missing_links):
+        rows = leaguepedia.query(**_get_players_information_query(chunk))
+        players_information.update(_cache_players_information(chunk, rows))
+
+    return players_information
+
+
+def _get_cached_players_information(
+    links: List[str],
+) -> Tuple[Dict[str, dict], List[str]]:
+    """Returns the cached Players rows keyed by link, and the links absent from the cache."""
+    players_information = {}
+    missing_links = []
+
+    for link in links:
+        player_information = players_cache.get(link.lower())
 
-    players = leaguepedia.query(
-        tables=f"ScoreboardGames, ScoreboardPlayers, PlayerRedirects, Players",
-        join_on="ScoreboardGames.GameId = ScoreboardPlayers.GameId, "
-        "ScoreboardPlayers.Link = PlayerRedirects.AllName, "
-        "PlayerRedirects.OverviewPage = Players.OverviewPage",
-        fields=", ".join(game_players_fields) + ", Players._pageID=pageId",
-        where=f"ScoreboardGames.GameId = '{game.sources.leaguepedia.gameId}'",
+        if player_information is None:
+            missing_links.append(link)
+        else:
+            players_information[link] = player_information
+
+    return players_information, missing_links
+
+
+def _get_players_information_query(links: List[str]) -> dict:
+    return _plan_query(
+        ["PlayerRedirects.AllName=Link"] + players_fields,
+        where=_in_condition("PlayerRedirects.AllName", links),
+    )
+
+
+def _cache_players_information(links: List[str], rows: List[dict]) -> Dict[str, dict]:
+    """Caches the Players rows queried for links, returning them keyed by link."""
+    # Redirects are case insensitive
+    rows = {row.pop("Link").lower(): row for row in rows}
+    players_information = {}
+
+    for link in links:
+        # Players without a page are cached too, to not query them again
+        players_information[link] = rows.get(link.lower(), {})
+        players_cache.set(link.lower(), players_information[link])
+
+    return players_information
+
+
+def _plan_query(fields: List[str], where: str, **kwargs) -> dict:
+    """Returns cargo query kwargs joining only the tables needed by the fields and the where condition.
+
+    The first table of the fields is the root of the join graph, and other tables are joined with the shortest path
+    in cargo_joins. Tables only used to filter on a field already present in another table are therefore never added.
+    """
+    # Quoted values can contain dots
+    referenced_tables = []
+
+    for expression in fields + [re.sub(r"'[^']*'|\"[^\"]*\"", "", where)]:
+        for table in re.findall(r"\b(\w+)\.\w", expression):
+            if table not in referenced_tables:
+                referenced_tables.append(table)
+
+    root = referenced_tables[0]
+    tables, join_on = [root], []
+
+    for table in referenced_tables[1:]:
+        for previous_table, next_table in _get_join_path(root, table):
+            if next_table not in tables:
+                tables.append(next_table)
+                join_on.append(cargo_joins[frozenset([previous_table, next_table])])
+
+    query = dict(
+        tables=", ".join(tables),
+        fields=", ".join(fields),
+        where=where,
+        **kwargs,
     )
 
-    return add_players(game, players, add_page_id=add_page_id)
+    if join_on:
+        query["join_on"] = ", ".join(join_on)
+
+    return query
+
+
+def _get_join_path(start: str, end: str) -> List[tuple]:
+    """Returns the edges of the shortest path between two tables in cargo_joins."""
+    paths = {start: []}
+    queue = [start]
+
+    while queue:
+        table = queue.pop(0)
+
+        if table == end:
+            return paths[table]
+
+        for edge in cargo_joins:
+            if table in edge:
+                (next_table,) = edge - {table}
+
+                if next_table not in paths:
+                    paths[next_table] = paths[table] + [(table, next_table)]
+                    queue.append(next_table)
+
+    raise ValueError(f"No known join between {start} and {end}")
@@ -0,0 +1,151 @@
+import dataclasses
+import json
+import os
+import threading
+from typing import List, Dict, Optional, Set, TYPE_CHECKING
+
+
+from leaguepedia_parser.site.leaguepedia import leaguepedia
+from leaguepedia_parser.site.page_data import get_changed_rows_query
+from leaguepedia_parser.transmuters.field_names import game_fields
+from leaguepedia_parser.transmuters.game import transmute_game
+
+if TYPE_CHECKING:
+    from lol_dto.classes.game import LolGame
+
+
+@dataclasses.dataclass
+class GamesChangeset:
+    inserted: List["LolGame"] = dataclasses.field(default_factory=list)
+    updated: List["LolGame"] = dataclasses.field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated)
+
+
+class GamesSynchronizer:
+    """Incrementally syncs the games of tournaments, only querying rows changed since the last sync.
+
+    A watermark is kept per tournament overview page, either the last modification date of the wiki pages holding the
+    games, which catches both new and edited games, or the last game start, which only catches new games.
+
+    Typical usage example:
+        synchronizer = GamesSynchronizer("sync_state.json")
+        changeset = synchronizer.sync_games("LCK/2021 Season/Spring Season")
+    """
+
+    def __init__(self, state_path: str = None, use_modification_date: bool = True):
+        """
+        Args:
+            state_path: optional JSON file where watermarks are persisted after each sync.
+            use_modification_date: whether to use the pages’ _modificationDate instead of the games’ DateTime_UTC.
+        """
+        self.state_path = state_path
+        self.use_modification_date = use_modification_date
+
+        self.watermarks: Dict[str, str] = {}
+        self.game_ids: Dict[str, Set[str]] = {}
+
+        self._lock = threading.Lock()
+
+        if state_path and os.path.exists(state_path):
+            with open(state_path) as file:
+                state = json.load(file)
+
+            self.watermarks = state["watermarks"]
+            self.game_ids = {
+                overview_page: set(game_ids)
+                for overview_page, game_ids in state["game_ids"].items()
+            }
+
+    def sync_games(self, tournament_overview_page: str, **kwargs) -> GamesChangeset:
+        """Returns the games of the tournament inserted or updated since the last sync.
+
+        The first sync of a tournament returns all its games as inserted.
+
+        Args:
+            tournament_overview_page: tournament overview page, acquired from get_tournaments().
+
+        Returns:
+            A GamesChangeset with new and updated LolGame objects.
+        """
+        watermark = self.watermarks.get(tournament_overview_page)
+        rows = leaguepedia.query(
+            **self._get_changed_games_query(tournament_overview_page, watermark),
+            # Changes would be hidden by cached results
+            cache_ttl=0,
+            **kwargs,
+        )
+
+        changeset = GamesChangeset()
+
+        with self._lock:
+            game_ids = self.game_ids.setdefault(tournament_overview_page, set())
+
+            for row in rows:
+                # Rows modified at the watermark were already returned by the last sync
+                if row["watermark"] == watermark and row["GameId"] in game_ids:
+                    continue
+
+                if row["GameId"] in game_ids:
+                    changeset.updated.append(transmute_game(row))
+                else:
+                    changeset.inserted.append(transmute_game(row))
+                    game_ids.add(row["GameId"])
+
+            if rows:
+                self.watermarks[tournament_overview_page] = max(
+                    row["watermark"] or "" for row in rows
+                )
+
+            self.save()
+
+        return changeset
+
+    def reset(self, tournament_overview_page: Optional[str] = None):
+        """Forgets the watermark of a tournament, or of all tournaments, the next sync returning all games."""
+        with self._lock:
+            if tournament_overview_page:
+                self.watermarks.pop(tournament_overview_page, None)
+                self.game_ids.pop(tournament_overview_page, None)
+            else:
+                self.watermarks, self.game_ids = {}, {}
+
+            self.save()
+
+    def save(self):
+        if not self.state_path:
+            return
+
+        with open(self.state_path, "w") as file:
+            json.dump(
+                {
+                    "watermarks": self.watermarks,
+                    "game_ids": {
+                        overview_page: sorted(game_ids)
+                        for overview_page, game_ids in self.game_ids.items()
+                    },
+                },
+                file,
+            )
+
+    def _get_changed_games_query(
+        self, tournament_overview_page: str, watermark: Optional[str]
+    ) -> dict:
+        """Returns the cargo query kwargs used to get games changed since the watermark."""
+        fields = [f"ScoreboardGames.{field}" for field in sorted(game_fields)]
+        where = f"ScoreboardGames.OverviewPage ='{tournament_overview_page}'"
+
+        if self.use_modification_date:
+            return get_changed_rows_query("ScoreboardGames", fields, watermark, where)
+
+        # We include the watermark itself as other games can start at the same second
+        if watermark:
+            where += f" AND ScoreboardGames.DateTime_UTC >= '{watermark}'"
+
+        return dict(
+            tables="ScoreboardGames",
+            fields=", ".join(fields + ["ScoreboardGames.DateTime_UTC=watermark"]),
+            where=where,
+            order_by="ScoreboardGames.DateTime_UTC",
+        )
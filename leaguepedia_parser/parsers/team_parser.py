@@ -1,5 +1,7 @@
 import dataclasses
-from typing import Optional
+import json
+from typing import Optional, List, Dict
+from leaguepedia_parser.site.cache import TTLCache
 from leaguepedia_parser.site.leaguepedia import leaguepedia
 
 
@@ -10,6 +12,29 @@ class TeamAssets:
     long_name: str  # Aka display name
 
 
+# Maximum number of titles in a single MediaWiki query for anonymous users
+titles_per_query = 50
+
+# Leaguepedia’s team names lookup module is split in two halves because of its size
+team_lookup_masks = ["include_match=^[a-s].*", "exclude_match=^[a-s].*"]
+
+# Caches all team assets and names lookups, replace it to change its TTL or persist it to disk:
+#   team_parser.team_cache = TTLCache(ttl=3600, path="team_cache.pickle")
+team_cache = TTLCache()
+
+
+def invalidate_team_cache(team_name: str = None):
+    """
+    Removes a team’s assets and names from the cache, or all teams if team_name is None
+    """
+    if team_name is None:
+        team_cache.invalidate()
+    else:
+        team_cache.invalidate_where(
+            lambda key: key[1] in (team_name, team_name.lower())
+        )
+
+
 def get_all_team_assets(team_link: str) -> TeamAssets:
     """
 
@@ -19,28 +44,119 @@ def get_all_team_assets(team_link: str) -> TeamAssets:
     Returns:
         A TeamAssets object
 
+    Raises:
+        KeyError: the logo or thumbnail file of the team does not exist.
     """
-    result = leaguepedia.site.client.api(
-        action="query",
-        format="json",
-        prop="imageinfo",
-        titles=f"File:{team_link}logo square.png|File:{team_link}logo std.png",
-        iiprop="url",
-    )
+    assets = get_team_assets_bulk([team_link])[team_link]
 
-    pages = result["query"]["pages"]
+    _check_team_assets(team_link, assets)
 
-    urls = []
-    for v in pages.values():
-        urls.append(v["imageinfo"][0]["url"])
+    return assets
 
-    long_name = leaguepedia.site.cache.get("Team", team_link, "link")
 
-    return TeamAssets(
-        thumbnail_url=urls[1],
-        logo_url=urls[0],
-        long_name=long_name,
-    )
+def _check_team_assets(team_link: str, assets: TeamAssets):
+    """Raises a KeyError for missing files, as single team lookups always did."""
+    if assets.logo_url is None or assets.thumbnail_url is None:
+        raise KeyError(f"Logo or thumbnail not found for team {team_link}")
+
+
+def get_team_assets_bulk(team_links: List[str]) -> Dict[str, TeamAssets]:
+    """
+    Returns the assets of many teams, packing up to 50 files in each MediaWiki query
+
+    Typical usage example:
+        get_team_assets_bulk(["T1", "G2 Esports"])["T1"].logo_url
+
+    Args:
+        team_links: fields coming from Team1/Team2 in ScoreboardGames
+
+    Returns:
+        A dictionary of TeamAssets objects keyed by team link, URLs being None for missing files, unlike
+        get_all_team_assets() which raises a KeyError
+    """
+    assets = {
+        team_link: team_cache.get(("assets", team_link)) for team_link in team_links
+    }
+
+    # Only teams absent from the cache are queried
+    titles = {
+        team_link: (
+            f"File:{team_link}logo square.png",
+            f"File:{team_link}logo std.png",
+        )
+        for team_link, team_assets in assets.items()
+        if team_assets is None
+    }
+
+    if titles:
+        urls = _get_images_urls(
+            [title for team_titles in titles.values() for title in team_titles]
+        )
+
+        for team_link, (logo_title, thumbnail_title) in titles.items():
+            assets[team_link] = TeamAssets(
+                thumbnail_url=urls.get(thumbnail_title),
+                logo_url=urls.get(logo_title),
+                long_name=_get_team_lookup_value(team_link, "link"),
+            )
+            team_cache.set(("assets", team_link), assets[team_link])
+
+    # Callers get their own copies, so modifying them does not change the cached assets
+    return {
+        team_link: dataclasses.replace(team_assets)
+        for team_link, team_assets in assets.items()
+    }
+
+
+def _get_images_urls(titles: List[str]) -> Dict[str, str]:
+    """
+    Returns the URL of each existing file, keyed by the requested title
+
+    MediaWiki normalizes and follows redirects of the titles, so we map its answers back to the requested titles.
+    """
+    titles = list(dict.fromkeys(titles))
+    urls = {}
+
+    for idx in range(0, len(titles), titles_per_query):
+        result = leaguepedia.api(
+            "query",
+            format="json",
+            prop="imageinfo",
+            titles="|".join(titles[idx : idx + titles_per_query]),
+            iiprop="url",
+            redirects=1,
+        )
+
+        query = result.get("query", {})
+
+        # The actual title of the page of each requested title
+        targets = {title: title for title in titles[idx : idx + titles_per_query]}
+
+        for key in ["normalized", "redirects"]:
+            mapping = {item["from"]: item["to"] for item in query.get(key, [])}
+
+            # Redirects can be chained
+            for _ in range(len(mapping)):
+                targets = {
+                    title: mapping.get(target, target)
+                    for title, target in targets.items()
+                }
+
+        pages_urls = {
+            page["title"]: page["imageinfo"][0]["url"]
+            for page in query.get("pages", {}).values()
+            if page.get("imageinfo")
+        }
+
+        urls.update(
+            {
+                title: pages_urls[target]
+                for title, target in targets.items()
+                if target in pages_urls
+            }
+        )
+
+    return urls
 
 
 def get_team_logo(team_name: str, _retry=True) -> str:
@@ -54,7 +170,10 @@ def get_team_logo(team_name: str, _retry=True) -> str:
     Returns:
         URL pointing to the team’s logo
     """
-    return _get_team_asset(f"File:{team_name}logo square.png", team_name, _retry)
+    return team_cache.get_or_set(
+        ("logo", team_name),
+        lambda: _get_team_asset(f"File:{team_name}logo square.png", team_name, _retry),
+    )
 
 
 def get_team_thumbnail(team_name: str, _retry=True) -> str:
@@ -68,7 +187,10 @@ def get_team_thumbnail(team_name: str, _retry=True) -> str:
     Returns:
         URL pointing to the team’s thumbnail
     """
-    return _get_team_asset(f"File:{team_name}logo std.png", team_name, _retry)
+    return team_cache.get_or_set(
+        ("thumbnail", team_name),
+        lambda: _get_team_asset(f"File:{team_name}logo std.png", team_name, _retry),
+    )
 
 
 def _get_team_asset(asset_name: str, team_name: str, _retry=True) -> str:
@@ -82,8 +204,8 @@ def _get_team_asset(asset_name: str, team_name: str, _retry=True) -> str:
     Returns:
         URL pointing to the team’s logo
     """
-    result = leaguepedia.site.client.api(
-        action="query",
+    result = leaguepedia.api(
+        "query",
         format="json",
         prop="imageinfo",
         titles=asset_name,
@@ -113,8 +235,7 @@ def get_long_team_name_from_trigram(
     """
     Returns the long team name for the given team abbreviation using Leaguepedia’s search pages
 
-    Only issues a query the first time it is called, then stores the data in a cache
-    There is no cache timeout at the moment
+    Only issues a query the first time it is called, then stores the data in team_cache until its TTL expires
 
     Args:
         team_abbreviation: A team name abbreviation, like IG or RNG
@@ -127,10 +248,106 @@ def get_long_team_name_from_trigram(
     # We use only lowercase team abbreviations for simplicity
     team_abbreviation = team_abbreviation.lower()
 
+    return team_cache.get_or_set(
+        ("long_name", team_abbreviation, event_overview_page),
+        lambda: _get_long_team_name(team_abbreviation, event_overview_page),
+    )
+
+
+def _get_long_team_name(
+    team_abbreviation: str, event_overview_page: Optional[str]
+) -> Optional[str]:
     if event_overview_page:
-        return leaguepedia.site.cache.get_team_from_event_tricode(
-            event_overview_page, team_abbreviation
-        )
+        return _get_event_tricodes(event_overview_page).get(team_abbreviation)
 
     else:
-        return leaguepedia.site.cache.get("Team", team_abbreviation, "link")
+        return _get_team_lookup_value(team_abbreviation, "link")
+
+
+def _get_team_lookup_value(key: str, length: str) -> Optional[str]:
+    """Returns a value from Leaguepedia’s team names lookup module, like mwrogue’s EsportsLookupCache."""
+    return _get_lookup_value(_get_team_lookup(), key, length)
+
+
+def _get_team_lookup() -> dict:
+    return team_cache.get_or_set(
+        ("lookup", "Team"),
+        lambda: _merge_team_lookup(
+            [
+                leaguepedia.api(
+                    "expandtemplates", format="json", **_get_team_lookup_request(mask)
+                )
+                for mask in team_lookup_masks
+            ]
+        ),
+    )
+
+
+def _get_event_tricodes(event_overview_page: str) -> Dict[str, str]:
+    """Returns the teams of an event keyed by their lowercase short name."""
+    return team_cache.get_or_set(
+        ("tricodes", event_overview_page),
+        lambda: _query_event_tricodes(event_overview_page),
+    )
+
+
+def _query_event_tricodes(event_overview_page: str) -> Dict[str, str]:
+    # We follow redirects to get the actual event page
+    event = _get_page_title(
+        leaguepedia.api("query", format="json", titles=event_overview_page, redirects=1)
+    )
+
+    rows = leaguepedia.query(**_get_event_rosters_query(event))
+
+    return _get_tricodes(rows, _get_team_lookup())
+
+
+def _get_team_lookup_request(mask: str) -> dict:
+    """Returns the expandtemplates arguments returning one half of the team names lookup module as JSON."""
+    return dict(prop="wikitext", text=f"{{{{JsonEncode|Team|{mask}}}}}")
+
+
+def _merge_team_lookup(halves: List[dict]) -> dict:
+    return {
+        key: value
+        for half in halves
+        for key, value in json.loads(half["expandtemplates"]["wikitext"]).items()
+    }
+
+
+def _get_lookup_value(lookup: dict, key: str, length: str) -> Optional[str]:
+    value = lookup.get(key.lower())
+
+    # Some keys are aliases pointing to another key
+    if isinstance(value, str):
+        value = lookup.get(value)
+
+    return value.get(length) if value else None
+
+
+def _get_page_title(result: dict) -> str:
+    """Returns the title of the single page of a query, once redirects are followed."""
+    return next(iter(result["query"]["pages"].values()))["title"]
+
+
+def _get_tricodes(rows: List[dict], lookup: dict) -> Dict[str, str]:
+    """Returns the links of the teams of an event roster keyed by their lowercase short name."""
+    tricodes = {}
+
+    for row in rows:
+        link = _get_lookup_value(lookup, row["Team"], "link") or row["Team"]
+        short = row["Short"] or _get_lookup_value(lookup, row["Team"], "short")
+
+        if short:
+            tricodes[short.replace("&amp;", "&").lower()] = link.replace("&amp;", "&")
+
+    return tricodes
+
+
+def _get_event_rosters_query(event: str) -> dict:
+    return dict(
+        tables="TournamentRosters=Ros, TeamRedirects=TRed, Teams",
+        join_on="Ros.Team=TRed.AllName, TRed._pageName=Teams.OverviewPage",
+        where=f'Ros.OverviewPage="{event}"',
+        fields="Ros.Team=Team, COALESCE(Ros.Short,Teams.Short)=Short",
+    )
@@ -0,0 +1,160 @@
+import asyncio
+import copy
+from typing import Optional, List
+
+from leaguepedia_parser.site.cache import normalize_query
+from leaguepedia_parser.site.singleflight import AsyncSingleflight
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncLeaguepediaSite:
+    """An asyncio counterpart to LeaguepediaSite, using a single pooled aiohttp session.
+
+    Requires the optional aiohttp dependency, installed with `pip install leaguepedia_parser[async]`.
+
+    Full documentation: https://lol.fandom.com/Help:API_Documentation
+    """
+
+    def __init__(
+        self,
+        limit=500,
+        max_concurrency=8,
+        url="https://lol.fandom.com/api.php",
+        user_agent="leaguepedia_parser",
+    ):
+        """
+        Args:
+            limit: number of rows per cargo query page.
+            max_concurrency: maximum number of requests running at the same time.
+            url: URL of the MediaWiki API endpoint, useful to test against a local fake endpoint.
+            user_agent: User-Agent header sent with every request.
+        """
+        self.limit = limit
+        self._max_concurrency = max_concurrency
+        self.url = url
+        self.user_agent = user_agent
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Caches the JSON lookup modules used for team names
+        self.lookup_cache = {}
+
+        # Identical requests awaited at the same time by several coroutines share a single response
+        self.singleflight = AsyncSingleflight()
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """Ghost loaded session, as it needs to be created inside a running event loop."""
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for asyncio queries, install it with `pip install leaguepedia_parser[async]`"
+            )
+
+        # Sessions are bound to an event loop, so we create a new one if the loop changed
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            # Concurrency is only capped by the semaphore, which can be resized without creating a new session
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": self.user_agent},
+                connector=aiohttp.TCPConnector(limit=0),
+            )
+            self._semaphore = None
+
+        return self._session
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, max_concurrency: int):
+        """Resizes the number of concurrent requests, running requests are not interrupted."""
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+        self._session = None
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def api(self, action: str, **kwargs) -> dict:
+        """Issues a MediaWiki API request.
+
+        Identical requests awaited at the same time by several coroutines, like pages of the same cargo query or team
+        lookups, are sent once.
+
+        Returns:
+            The JSON response.
+        """
+        data = {"action": action, "format": "json"}
+        data.update({key: value for key, value in kwargs.items() if value is not None})
+
+        result, shared = await self.singleflight.do(
+            normalize_query(data), lambda: self._post(data)
+        )
+
+        return copy.deepcopy(result) if shared else result
+
+    async def _post(self, data: dict) -> dict:
+        session = self.session
+
+        # Created inside the running loop, as semaphores are bound to it
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            async with session.post(self.url, data=data) as response:
+                response.raise_for_status()
+                result = await response.json(content_type=None)
+
+        if "error" in result:
+            raise ValueError(f"Leaguepedia API error: {result['error']}")
+
+        return result
+
+    async def query(self, **kwargs) -> List[dict]:
+        """Issues a cargo query to leaguepedia.
+
+        Params are usually:
+            tables, join_on, fields, order_by, where
+
+        Returns:
+            List of rows from the query.
+        """
+        result = []
+
+        while True:
+            page = await self._query_page(len(result), **kwargs)
+            result.extend(page)
+
+            # A page shorter than the limit is the last one
+            if len(page) < self.limit:
+                return result
+
+    async def _query_page(self, offset: int, **kwargs) -> List[dict]:
+        """Returns a single page of results."""
+        response = await self.api(
+            "cargoquery", limit=self.limit, offset=offset, **kwargs
+        )
+
+        return [row["title"] for row in response["cargoquery"]]
+
+
+# Ghost loaded instance shared by all asyncio parsers
+async_leaguepedia = AsyncLeaguepediaSite()
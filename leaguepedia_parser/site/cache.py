@@ -0,0 +1,339 @@
+import atexit
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Hashable, Tuple, Any, Callable
+
+from leaguepedia_parser.site.singleflight import Singleflight
+
+# Sentinel for absent values, as None can be a cached value
+_missing = object()
+
+
+def normalize_query(kwargs: dict) -> str:
+    """Returns a string uniquely identifying a cargo query.
+
+    Whitespace is collapsed and keys are sorted so that equivalent queries share the same key.
+    """
+    return json.dumps(
+        {
+            key: " ".join(value.split()) if isinstance(value, str) else value
+            for key, value in kwargs.items()
+            if value is not None
+        },
+        sort_keys=True,
+    )
+
+
+def get_query_tables(kwargs: dict) -> list:
+    """Returns the list of tables used by a cargo query."""
+    tables = kwargs.get("tables") or []
+
+    if isinstance(tables, str):
+        tables = tables.split(",")
+
+    return [table.strip() for table in tables]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """A persistent cache for cargo query results, backed by SQLite.
+
+    Entries expire after a TTL that depends on the queried tables, and the least recently used entries are evicted
+    once the cache grows over max_size bytes.
+
+    Typical usage example:
+        leaguepedia.cache = QueryCache("leaguepedia.sqlite", table_ttls={"ScoreboardGames": 3600})
+    """
+
+    def __init__(
+        self,
+        path: str = "leaguepedia_cache.sqlite",
+        default_ttl: Optional[float] = 24 * 3600,
+        table_ttls: Dict[str, Optional[float]] = None,
+        max_size: int = 256 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path: path of the SQLite database, ":memory:" for a non-persistent cache.
+            default_ttl: TTL in seconds of queries on tables absent from table_ttls. None never expires.
+            table_ttls: TTL in seconds per cargo table. A query uses the shortest TTL of its tables.
+            max_size: maximum size of the cached payloads in bytes.
+        """
+        self.default_ttl = default_ttl
+        self.table_ttls = table_ttls or {}
+        self.max_size = max_size
+
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+            """)
+
+    def get_ttl(self, kwargs: dict) -> Optional[float]:
+        """Returns the TTL of a query, the shortest TTL of the tables it uses."""
+        ttls = [
+            self.table_ttls.get(table, self.default_ttl)
+            for table in get_query_tables(kwargs)
+        ]
+        ttls = [ttl for ttl in ttls if ttl is not None]
+
+        return min(ttls) if ttls else None
+
+    def get(self, kwargs: dict) -> Optional[list]:
+        """Returns the cached rows of the query, or None if they are absent or expired."""
+        key = normalize_query(kwargs)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] < now):
+                self.stats.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.stats.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, kwargs: dict, rows: list, ttl: Optional[float] = ...):
+        """Caches the rows of the query.
+
+        Args:
+            kwargs: the query kwargs.
+            rows: the query result.
+            ttl: TTL in seconds overriding the tables TTL. None never expires.
+        """
+        if ttl is ...:
+            ttl = self.get_ttl(kwargs)
+
+        value = zlib.compress(json.dumps(rows).encode())
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (
+                    normalize_query(kwargs),
+                    value,
+                    len(value),
+                    now + ttl if ttl is not None else None,
+                    now,
+                ),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def _evict(self):
+        """Removes expired entries, then least recently used ones until the cache fits in max_size."""
+        self._connection.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?",
+            (time.time(),),
+        )
+
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+        if total_size <= self.max_size:
+            return
+
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ).fetchall():
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.stats.evictions += 1
+            total_size -= size
+
+            if total_size <= self.max_size:
+                break
+
+
+class TTLCache:
+    """A thread-safe in-memory cache with a TTL and LRU eviction, optionally persisted to disk.
+
+    Writes are persisted in batches, at most every save_interval seconds, on flush(), and when the interpreter exits.
+
+    Typical usage example:
+        cache = TTLCache(ttl=3600, path="team_cache.pickle")
+        logo_url = cache.get_or_set(("logo", "T1"), lambda: get_logo("T1"))
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 24 * 3600,
+        max_entries: int = 4096,
+        path: Optional[str] = None,
+        save_interval: float = 60,
+    ):
+        """
+        Args:
+            ttl: TTL of entries in seconds. None never expires.
+            max_entries: maximum number of entries, the least recently used ones being evicted first.
+            path: optional pickle file where entries are persisted.
+            save_interval: minimum number of seconds between two writes of the pickle file, 0 writing it every time.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.save_interval = save_interval
+
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        # Serializes writes of the pickle file, which happen outside of self._lock
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._singleflight = Singleflight()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+
+        if path and os.path.exists(path):
+            with open(path, "rb") as file:
+                self._entries = pickle.load(file)
+
+        if path:
+            atexit.register(self.flush)
+
+    def get(self, key: Hashable, default=None):
+        """Returns the cached value, or default if it is absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or (entry[1] is not None and entry[1] < time.time()):
+                self.stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+
+            return entry[0]
+
+    def set(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = (
+                value,
+                time.time() + self.ttl if self.ttl is not None else None,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+            self._dirty = True
+
+        self._save_if_due()
+
+    def get_or_set(self, key: Hashable, function: Callable[[], Any]):
+        """Returns the cached value, computing and caching it with function if it is absent or expired.
+
+        Threads missing the same key at the same time wait for a single call to function.
+        """
+        value = self.get(key, _missing)
+
+        if value is _missing:
+            value, _ = self._singleflight.do(key, lambda: self._compute(key, function))
+
+        return value
+
+    def _compute(self, key: Hashable, function: Callable[[], Any]):
+        value = function()
+        self.set(key, value)
+
+        return value
+
+    def invalidate(self, key: Hashable = None):
+        """Removes an entry, or all entries if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+            self._dirty = True
+
+        self._save_if_due()
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Removes all entries whose key matches the predicate."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+            self._dirty = True
+
+        self._save_if_due()
+
+    def flush(self):
+        """Writes pending changes to the pickle file."""
+        if not self.path:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+
+                # Pickling a copy lets other threads use the cache during the write
+                entries = OrderedDict(self._entries)
+                self._dirty = False
+                self._saved_at = time.monotonic()
+
+            # Writing to a temporary file first avoids corrupting the cache if the process is killed
+            temporary_path = f"{self.path}.tmp"
+
+            with open(temporary_path, "wb") as file:
+                pickle.dump(entries, file)
+
+            os.replace(temporary_path, self.path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _save_if_due(self):
+        if self.path and time.monotonic() - self._saved_at >= self.save_interval:
+            self.flush()
@@ -0,0 +1,270 @@
+import json
+import math
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Callable
+
+from leaguepedia_parser.logger import leaguepedia_parser_logger
+
+try:
+    from opentelemetry import trace as opentelemetry_trace
+except ImportError:
+    opentelemetry_trace = None
+
+# Histograms buckets grow by 2^(1/4), which estimates percentiles within 10%, from 1ms up to about 18 minutes
+histogram_minimum = 0.001
+histogram_buckets_per_doubling = 4
+histogram_buckets_count = 80
+
+# Modules skipped when looking for the caller of a request
+internal_modules = ("leaguepedia_parser.site", "concurrent.futures", "threading")
+
+
+@dataclass
+class RequestEvent:
+    """A request to Leaguepedia, passed to pre-request hooks, then to post-request hooks once it is done.
+
+    rows, bytes, latency and error are only set for post-request hooks.
+    """
+
+    kind: str  # "cargo" for cargo queries, "api" for other MediaWiki API requests
+    tables: List[str]  # Cargo tables, or the API action
+    offset: int = 0  # Offset of the page of results, page number is offset // limit
+    caller: Optional[str] = None  # First function outside of the site package
+
+    rows: Optional[int] = None
+    bytes: Optional[int] = None  # Approximate size of the JSON response
+    latency: Optional[float] = None  # Seconds, including rate limiting and retries
+    error: Optional[Exception] = None
+    replayed: bool = False
+
+    # Hooks can store their own data here, like a span
+    context: dict = field(default_factory=dict)
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class LatencyHistogram:
+    """A fixed-size histogram of latencies with exponential buckets, from which percentiles are estimated."""
+
+    def __init__(self):
+        self.counts = [0] * histogram_buckets_count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency: float):
+        if latency <= histogram_minimum:
+            bucket = 0
+        else:
+            bucket = min(
+                histogram_buckets_count - 1,
+                math.ceil(
+                    math.log2(latency / histogram_minimum)
+                    * histogram_buckets_per_doubling
+                ),
+            )
+
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percentile: float) -> float:
+        """Returns the upper bound of the bucket holding the percentile, in seconds."""
+        if not self.count:
+            return 0.0
+
+        rank = math.ceil(self.count * percentile / 100)
+        cumulated = 0
+
+        for bucket, count in enumerate(self.counts):
+            cumulated += count
+
+            if cumulated >= rank:
+                return min(
+                    self.max,
+                    histogram_minimum * 2 ** (bucket / histogram_buckets_per_doubling),
+                )
+
+        return self.max
+
+
+@dataclass
+class RequestMetrics:
+    requests: int = 0
+    errors: int = 0
+    rows: int = 0
+    bytes: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class StatsAggregator:
+    """A post-request hook aggregating requests, rows, bytes and latency percentiles per kind and tables.
+
+    Typical usage example:
+        stats = StatsAggregator()
+        leaguepedia.add_request_hook(post=stats)
+        ...
+        print(stats.summary())
+    """
+
+    def __init__(self):
+        self.metrics: Dict[Tuple[str, str], RequestMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        key = (event.kind, ", ".join(event.tables))
+
+        with self._lock:
+            metrics = self.metrics.setdefault(key, RequestMetrics())
+
+            metrics.requests += 1
+            metrics.errors += event.error is not None
+            metrics.rows += event.rows or 0
+            metrics.bytes += event.bytes or 0
+            metrics.latency.add(event.latency)
+
+    def summary(self) -> List[dict]:
+        """Returns metrics per kind and tables, the slowest first."""
+        with self._lock:
+            summary = [
+                {
+                    "kind": kind,
+                    "tables": tables,
+                    "requests": metrics.requests,
+                    "errors": metrics.errors,
+                    "rows": metrics.rows,
+                    "bytes": metrics.bytes,
+                    "total_latency": metrics.latency.total,
+                    "p50": metrics.latency.percentile(50),
+                    "p90": metrics.latency.percentile(90),
+                    "p99": metrics.latency.percentile(99),
+                    "max": metrics.latency.max,
+                }
+                for (kind, tables), metrics in self.metrics.items()
+            ]
+
+        return sorted(summary, key=lambda row: row["total_latency"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.metrics = {}
+
+
+class OpenTelemetrySpans:
+    """Pre and post-request hooks emitting an OpenTelemetry span per request.
+
+    Typical usage example:
+        spans = OpenTelemetrySpans()
+        leaguepedia.add_request_hook(pre=spans.start, post=spans.end)
+    """
+
+    def __init__(self, tracer=None):
+        """
+        Args:
+            tracer: the tracer creating spans, the global tracer provider’s one by default.
+        """
+        if tracer is None:
+            if opentelemetry_trace is None:
+                raise ImportError(
+                    "opentelemetry-api is required for spans, install it with `pip install leaguepedia_parser[otel]`"
+                )
+
+            tracer = opentelemetry_trace.get_tracer("leaguepedia_parser")
+
+        self.tracer = tracer
+
+    def start(self, event: RequestEvent):
+        event.context["span"] = self.tracer.start_span(
+            f"leaguepedia.{event.kind}",
+            attributes={
+                "leaguepedia.tables": event.tables,
+                "leaguepedia.offset": event.offset,
+                "leaguepedia.caller": event.caller or "",
+            },
+        )
+
+    def end(self, event: RequestEvent):
+        span = event.context.pop("span", None)
+
+        if span is None:
+            return
+
+        span.set_attribute("leaguepedia.rows", event.rows or 0)
+        span.set_attribute("leaguepedia.bytes", event.bytes or 0)
+        span.set_attribute("leaguepedia.replayed", event.replayed)
+
+        if event.error is not None:
+            span.record_exception(event.error)
+
+            if opentelemetry_trace is not None:
+                span.set_status(
+                    opentelemetry_trace.Status(opentelemetry_trace.StatusCode.ERROR)
+                )
+
+        span.end()
+
+
+def log_slow_requests(threshold: float = 1) -> RequestHook:
+    """Returns a post-request hook logging requests slower than threshold seconds as warnings."""
+
+    def hook(event: RequestEvent):
+        if event.latency >= threshold:
+            leaguepedia_parser_logger.warning(
+                f"Slow {event.kind} request on {', '.join(event.tables)} at offset {event.offset} "
+                f"from {event.caller}: {event.latency:.2f}s, {event.rows} rows, {event.bytes} bytes"
+            )
+
+    return hook
+
+
+def get_request_tables(kind: str, request_kwargs: dict) -> List[str]:
+    """Returns the cargo tables of a request, or its API action."""
+    if kind != "cargo":
+        return [request_kwargs.get("action", kind)]
+
+    # Aliases are removed, "ScoreboardGames=SG" being reported as ScoreboardGames
+    return [
+        table.split("=")[0].strip()
+        for table in request_kwargs.get("tables", "").split(",")
+    ]
+
+
+def get_caller() -> Optional[str]:
+    """Returns the module and name of the first function outside of the site package in the current stack."""
+    frame = sys._getframe(1)
+
+    while frame:
+        module = frame.f_globals.get("__name__", "")
+
+        # Executor threads do not hold their submitter in their stack
+        if not module.startswith(internal_modules):
+            return f"{module}.{frame.f_code.co_name}"
+
+        frame = frame.f_back
+
+    return None
+
+
+def run_hooks(hooks: List[RequestHook], event: RequestEvent):
+    """Runs the hooks on the event, a failing hook never failing the request."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            leaguepedia_parser_logger.exception(f"Request hook {hook!r} failed")
+
+
+def get_response_size(response) -> Optional[int]:
+    """Returns the approximate size of a JSON response in bytes."""
+    try:
+        return len(json.dumps(response, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_rows_count(kind: str, response) -> Optional[int]:
+    return len(response) if kind == "cargo" and isinstance(response, list) else None
@@ -1,4 +1,33 @@
-from mwrogue.esports_client import EsportsClient
+import copy
+import threading
+import time
+from concurrent.futures.thread import ThreadPoolExecutor
+from typing import Optional, Iterator, List, Callable, TypeVar
+
+from leaguepedia_parser.logger import leaguepedia_parser_logger
+from leaguepedia_parser.site.cache import QueryCache, normalize_query
+from leaguepedia_parser.site.instrumentation import (
+    RequestEvent,
+    RequestHook,
+    get_request_tables,
+    get_caller,
+    get_response_size,
+    get_rows_count,
+    run_hooks,
+)
+from leaguepedia_parser.site.mirror import CargoMirror
+from leaguepedia_parser.site.players_snapshot import PlayersSnapshot
+from leaguepedia_parser.site.recording import Recording
+from leaguepedia_parser.site.singleflight import Singleflight
+from leaguepedia_parser.site.rate_limiter import (
+    TokenBucket,
+    RequestStats,
+    is_retryable_error,
+    is_throttling_error,
+    get_backoff,
+)
+
+T = TypeVar("T")
 
 
 class LeaguepediaSite:
@@ -7,49 +36,532 @@ class LeaguepediaSite:
     Full documentation: https://lol.fandom.com/Help:API_Documentation
     """
 
-    def __init__(self, limit=500):
+    def __init__(
+        self,
+        limit=500,
+        cache: Optional[QueryCache] = None,
+        max_workers=8,
+        requests_per_second: Optional[float] = None,
+        max_retries=5,
+    ):
         self._site = None
         self.limit = limit
 
+        # Optional client-side rate limit shared by all threads, and retries on throttling or server errors
+        self.rate_limiter: Optional[TokenBucket] = None
+        self.set_rate_limit(requests_per_second)
+        self.max_retries = max_retries
+        self.stats = RequestStats()
+
+        # Maximum number of requests running at the same time on the shared executor
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_thread = threading.local()
+
+        # Optional persistent cache of query results
+        self.cache = cache
+
+        # Optional local copy of the Players and PlayerRedirects tables
+        self.players_snapshot: Optional[PlayersSnapshot] = None
+
+        # Optional local copy of cargo tables, answering queries on them without network access
+        self.mirror: Optional[CargoMirror] = None
+
+        # Optional record or replay of responses, for offline tests and benchmarks
+        self.recording: Optional[Recording] = None
+
+        # Instrumentation hooks called before and after each request
+        self.pre_request_hooks: List[RequestHook] = []
+        self.post_request_hooks: List[RequestHook] = []
+
+        # Identical queries and API requests issued at the same time by several threads share a single fetch
+        self.singleflight = Singleflight()
+
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
     @property
     def site(self):
         if not self._site:
-            self._load_site()
+            with self._lock:
+                if not self._site:
+                    self._load_site()
 
         return self._site
 
     def _load_site(self):
         """Creates site class fields.
 
-        Used for ghost loading the class during package import.
+        Used for ghost loading the class during package import. mwclient and mwrogue are only imported here, and the
+        site information request mwclient issues on creation is skipped, as cargo queries and API requests do not need
+        it. No login is needed for read-only access.
         """
+        from mwclient import Site
+        from mwrogue.esports_client import EsportsClient
+
+        # Retries are handled by _request()
+        client = Site("lol.fandom.com", path="/", max_retries=0, do_init=False)
+
         # If not, we create the self.client object as our way to interact with the wiki
-        self._site = EsportsClient("lol")
+        self._site = EsportsClient("lol", client=client)
+        self._mount_connection_pool()
+
+    def _mount_connection_pool(self):
+        """Sizes the keep-alive connection pool of the shared HTTP session to the number of workers.
+
+        requests’ default pool keeps 10 connections, and connections over that number are closed after each request.
+        """
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_workers)
+        self._site.client.connection.mount("https://", adapter)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Ghost loaded executor shared by all concurrent requests to Leaguepedia."""
+        if not self._executor:
+            with self._lock:
+                if not self._executor:
+                    self._executor = ThreadPoolExecutor(
+                        self._max_workers,
+                        thread_name_prefix="leaguepedia",
+                        initializer=self._mark_executor_thread,
+                    )
+
+        return self._executor
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, max_workers: int):
+        """Resizes the shared executor and connection pool, running requests are not interrupted."""
+        self._max_workers = max_workers
+        self.shutdown(wait=False)
+
+        if self._site:
+            self._mount_connection_pool()
+
+    def shutdown(self, wait=True):
+        """Shuts the shared executor down, a new one is created on the next concurrent request."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def _mark_executor_thread(self):
+        self._executor_thread.is_worker = True
+
+    def in_executor_thread(self) -> bool:
+        """Whether the current thread belongs to the shared executor.
+
+        Tasks running on the executor must not wait on other tasks of the executor, as it could deadlock.
+        """
+        return getattr(self._executor_thread, "is_worker", False)
+
+    def set_rate_limit(self, requests_per_second: Optional[float], burst: int = 1):
+        """Limits the rate of requests issued by all threads, None removing the limit.
+
+        Args:
+            requests_per_second: the sustained number of requests per second.
+            burst: the number of requests that can be issued at once after some idle time.
+        """
+        self.rate_limiter = (
+            TokenBucket(requests_per_second, burst) if requests_per_second else None
+        )
+
+    def api(self, action: str, **kwargs) -> dict:
+        """Issues a MediaWiki API request, with rate limiting and retries.
+
+        Identical requests issued at the same time by several threads share a single response.
+
+        Returns:
+            The JSON response.
+        """
+        request_kwargs = dict(action=action, **kwargs)
+
+        result, shared = self.singleflight.do(
+            ("api", normalize_query(request_kwargs)),
+            lambda: self._send(
+                "api", request_kwargs, lambda: self.site.client.api(action, **kwargs)
+            ),
+        )
+
+        return copy.deepcopy(result) if shared else result
+
+    def add_request_hook(
+        self, pre: Optional[RequestHook] = None, post: Optional[RequestHook] = None
+    ):
+        """Adds instrumentation hooks, called with a RequestEvent before and after each request.
+
+        Typical usage example:
+            stats = StatsAggregator()
+            leaguepedia.add_request_hook(post=stats)
+
+        Args:
+            pre: called before the request, with the tables, offset and caller of the request.
+            post: called after the request, with its rows count, bytes, latency and error too.
+        """
+        if pre:
+            self.pre_request_hooks.append(pre)
+        if post:
+            self.post_request_hooks.append(post)
+
+    def remove_request_hook(
+        self, pre: Optional[RequestHook] = None, post: Optional[RequestHook] = None
+    ):
+        if pre in self.pre_request_hooks:
+            self.pre_request_hooks.remove(pre)
+        if post in self.post_request_hooks:
+            self.post_request_hooks.remove(post)
+
+    def _send(self, kind: str, request_kwargs: dict, request: Callable[[], T]) -> T:
+        """Sends a request, calling instrumentation hooks around it if any are registered."""
+        if not self.pre_request_hooks and not self.post_request_hooks:
+            return self._send_request(kind, request_kwargs, request)
+
+        event = RequestEvent(
+            kind=kind,
+            tables=get_request_tables(kind, request_kwargs),
+            offset=request_kwargs.get("offset", 0),
+            caller=get_caller(),
+            replayed=bool(self.recording and self.recording.is_replaying),
+        )
+        run_hooks(self.pre_request_hooks, event)
+
+        start = time.perf_counter()
+
+        try:
+            response = self._send_request(kind, request_kwargs, request)
+        except Exception as error:
+            event.error = error
+            raise
+        else:
+            event.rows = get_rows_count(kind, response)
+
+            # Serializing the response again is only worth it for post-request hooks
+            if self.post_request_hooks:
+                event.bytes = get_response_size(response)
+
+            return response
+        finally:
+            event.latency = time.perf_counter() - start
+            run_hooks(self.post_request_hooks, event)
+
+    def _send_request(
+        self, kind: str, request_kwargs: dict, request: Callable[[], T]
+    ) -> T:
+        """Sends a request through _request(), or through the recording if one is enabled."""
+        if self.recording and self.recording.is_replaying:
+            return self.recording.replay(kind, request_kwargs)
+
+        result = self._request(request)
+
+        if self.recording:
+            self.recording.record(kind, request_kwargs, result)
+
+        return result
+
+    def _request(self, request: Callable[[], T]) -> T:
+        """Runs a request once the rate limiter allows it, retrying with backoff on throttling or server errors."""
+        attempt = 0
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            self._increment_stat("requests")
+
+            try:
+                return request()
+
+            except Exception as error:
+                if is_throttling_error(error):
+                    self._increment_stat("throttled")
+
+                if not is_retryable_error(error) or attempt >= self.max_retries:
+                    self._increment_stat("failed")
+                    raise
+
+                backoff = get_backoff(attempt, error)
+                leaguepedia_parser_logger.warning(
+                    f"Leaguepedia request failed with {error!r}, retrying in {backoff:.1f}s"
+                )
+
+                self._increment_stat("retried")
+                time.sleep(backoff)
+                attempt += 1
+
+    def _increment_stat(self, name: str):
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def enable_cache(self, path: str = "leaguepedia_cache.sqlite", **kwargs):
+        """Caches query results in a persistent SQLite database.
+
+        Args:
+            path: path of the SQLite database.
+            **kwargs: QueryCache arguments, like default_ttl, table_ttls, or max_size.
+        """
+        self.cache = QueryCache(path, **kwargs)
+
+    def disable_cache(self):
+        if self.cache:
+            self.cache.close()
 
-    def query(self, **kwargs) -> list:
+        self.cache = None
+
+    def enable_recording(self, path: str, mode: str = "replay", latency: float = 0):
+        """Records responses to files, or replays recorded responses without network access.
+
+        All cargo queries and API requests are recorded, including team names lookups.
+
+        Args:
+            path: directory holding the recorded responses.
+            mode: "record" to save live responses, "replay" to serve recorded ones.
+            latency: time in seconds added to each replayed response, to simulate the network.
+        """
+        self.recording = Recording(path, mode, latency)
+
+    def disable_recording(self):
+        self.recording = None
+
+    def enable_players_snapshot(
+        self, path: str = "leaguepedia_players.sqlite", **kwargs
+    ) -> PlayersSnapshot:
+        """Keeps a local copy of the Players and PlayerRedirects tables, used instead of joining them on every game.
+
+        Args:
+            path: path of the SQLite database.
+            **kwargs: PlayersSnapshot arguments, like refresh_interval.
+
+        Returns:
+            The snapshot, refreshed on first use.
+        """
+        self.players_snapshot = PlayersSnapshot(self, path, **kwargs)
+
+        return self.players_snapshot
+
+    def disable_players_snapshot(self):
+        if self.players_snapshot:
+            self.players_snapshot.close()
+
+        self.players_snapshot = None
+
+    def enable_mirror(
+        self,
+        path: str = "leaguepedia_mirror.sqlite",
+        background: bool = True,
+        **kwargs,
+    ) -> CargoMirror:
+        """Keeps a local copy of cargo tables, from which queries on those tables are answered instead of the wiki.
+
+        Queries are sent to the wiki until the tables they use are downloaded.
+
+        Args:
+            path: path of the SQLite database.
+            background: whether to download and refresh the tables in a background thread.
+            **kwargs: CargoMirror arguments, like tables or refresh_interval.
+
+        Returns:
+            The mirror, which can be refreshed with refresh() when background is False.
+        """
+        self.disable_mirror()
+        self.mirror = CargoMirror(self, path, **kwargs)
+
+        if background:
+            self.mirror.start()
+
+        return self.mirror
+
+    def disable_mirror(self):
+        if self.mirror:
+            self.mirror.close()
+
+        self.mirror = None
+
+    def query(
+        self, cache_ttl: Optional[float] = ..., parallel: bool = False, **kwargs
+    ) -> list:
         """Issues a cargo query to leaguepedia.
 
         Params are usually:
             tables, join_on, fields, order_by, where
 
+        If a mirror is enabled, queries on mirrored tables are answered from it. If a cache is enabled, results are read
+        from it first and saved in it afterwards. Identical queries issued at the same time by several threads are
+        coalesced, only the first one being sent and all of them getting its rows.
+
+        Args:
+            cache_ttl: TTL in seconds of this query in the cache, overriding the tables TTL. None never expires, and 0
+                bypasses the cache and the mirror.
+            parallel: whether to fetch pages of results at the same time, useful for tables with many rows.
+
         Returns:
             List of rows from the query.
         """
+        if self.mirror and cache_ttl != 0:
+            rows = self.mirror.query(**kwargs)
+
+            if rows is not None:
+                return rows
+
+        # Executor tasks must not wait on a parallel query, which needs the executor itself
+        uses_executor = parallel and not self.in_executor_thread()
+
+        rows, shared = self.singleflight.do(
+            ("cargo", normalize_query(kwargs), cache_ttl == 0, uses_executor),
+            lambda: self._query_cached(cache_ttl, parallel, **kwargs),
+        )
+
+        # Callers like _get_players_information() modify rows in place
+        return [dict(row) for row in rows] if shared else rows
+
+    def _query_cached(self, cache_ttl: Optional[float], parallel: bool, **kwargs):
+        """Issues a cargo query, reading and saving its results in the cache if one is enabled."""
+        if self.cache and cache_ttl != 0:
+            result = self.cache.get(kwargs)
+
+            if result is None:
+                result = self._query(parallel, **kwargs)
+                self.cache.set(kwargs, result, cache_ttl)
+
+            return result
+
+        return self._query(parallel, **kwargs)
+
+    def query_pages(
+        self, cache_ttl: Optional[float] = ..., **kwargs
+    ) -> Iterator[List[dict]]:
+        """Issues a cargo query to leaguepedia, yielding pages of rows as soon as they are downloaded.
+
+        Takes the same params as query(). Results are only saved in the cache once all pages have been read.
+
+        Yields:
+            Lists of at most self.limit rows from the query, in order.
+        """
+        if self.mirror and cache_ttl != 0:
+            rows = self.mirror.query(**kwargs)
+
+            if rows is not None:
+                for offset in range(0, len(rows) or 1, self.limit):
+                    yield rows[offset : offset + self.limit]
+
+                return
+
+        if self.cache and cache_ttl != 0:
+            result = self.cache.get(kwargs)
+
+            if result is not None:
+                # Like uncached queries, an empty result is a single empty page
+                for offset in range(0, len(result) or 1, self.limit):
+                    yield result[offset : offset + self.limit]
+
+                return
+
+            result = []
+
+            for page in self._iter_pages(**kwargs):
+                result.extend(page)
+                yield page
+
+            self.cache.set(kwargs, result, cache_ttl)
+
+            return
+
+        yield from self._iter_pages(**kwargs)
+
+    def _query(self, parallel: bool, **kwargs) -> list:
+        """Issues a cargo query to leaguepedia, going through all pages of results."""
+        if not parallel or self.in_executor_thread():
+            return [row for page in self._iter_pages(**kwargs) for row in page]
+
+        result = self._query_page(0, **kwargs)
+
+        # A page shorter than the limit is the last one
+        if len(result) < self.limit:
+            return result
+
+        return result + self._query_remaining_pages(**kwargs)
+
+    def _iter_pages(self, **kwargs) -> Iterator[List[dict]]:
+        """Yields pages of results one after the other, until a page is shorter than the limit."""
+        offset = 0
+
+        while True:
+            page = self._query_page(offset, **kwargs)
+
+            # We do not yield the empty page that follows a result with an exact multiple of the limit
+            if page or not offset:
+                yield page
+
+            if len(page) < self.limit:
+                return
+
+            offset += self.limit
+
+    def _query_page(self, offset: int, **kwargs) -> list:
+        """Returns a single page of results."""
+        return self._send(
+            "cargo",
+            dict(limit=self.limit, offset=offset, **kwargs),
+            lambda: self.site.cargo_client.query(
+                limit=self.limit, offset=offset, **kwargs
+            ),
+        )
+
+    def _query_remaining_pages(self, **kwargs) -> list:
+        """Fetches all pages after the first one at the same time, keeping rows in order.
+
+        The number of rows is counted first when possible, else pages are speculatively fetched max_workers at a time
+        until a page is shorter than the limit.
+        """
         result = []
+        count = self._count(**kwargs)
 
-        # We check if we hit the API limit
-        while len(result) % self.limit == 0:
-            result.extend(
-                self.site.cargo_client.query(
-                    limit=self.limit, offset=len(result), **kwargs
-                )
-            )
+        if count is not None:
+            for page in self.executor.map(
+                lambda offset: self._query_page(offset, **kwargs),
+                range(self.limit, count, self.limit),
+            ):
+                result.extend(page)
 
-            # If the cargoquery is empty, we stop the loop
-            if not result:
-                break
+            return result
 
-        return result
+        offset = self.limit
+
+        while True:
+            offsets = range(offset, offset + self.max_workers * self.limit, self.limit)
+
+            for page in self.executor.map(
+                lambda offset: self._query_page(offset, **kwargs), offsets
+            ):
+                result.extend(page)
+
+                # Pending speculative pages are cancelled when the map iterator is closed
+                if len(page) < self.limit:
+                    return result
+
+            offset = offsets[-1] + self.limit
+
+    def _count(self, **kwargs) -> Optional[int]:
+        """Returns the number of rows of the query, or None if it cannot be counted with a single query."""
+        if kwargs.get("group_by") or kwargs.get("having"):
+            return None
+
+        count_kwargs = {
+            **{key: value for key, value in kwargs.items() if key != "order_by"},
+            "fields": "COUNT(*)=count",
+        }
+        rows = self._send(
+            "cargo",
+            dict(limit=1, **count_kwargs),
+            lambda: self.site.cargo_client.query(**count_kwargs, limit=1),
+        )
+
+        return int(rows[0]["count"]) if rows else None
 
 
 # Ghost loaded instance shared by all other classes
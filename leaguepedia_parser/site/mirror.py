@@ -0,0 +1,496 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from leaguepedia_parser.logger import leaguepedia_parser_logger
+from leaguepedia_parser.site.page_data import (
+    MetadataTable,
+    delete_pages_rows,
+    get_changed_rows_query,
+)
+
+# Tables mirrored by default, the ones read by get_tournaments(), get_games() and get_game_details()
+mirrored_tables = [
+    "Tournaments",
+    "Leagues",
+    "ScoreboardGames",
+    "ScoreboardPlayers",
+    "PicksAndBansS7",
+]
+
+# Indexed columns per table, on top of _pageName which is indexed for all tables
+mirror_indexes = {
+    "Tournaments": ["OverviewPage", "League", "Region"],
+    "Leagues": ["League"],
+    "ScoreboardGames": ["OverviewPage", "GameId", "DateTime_UTC"],
+    "ScoreboardPlayers": ["GameId", "Link", "OverviewPage"],
+    "PicksAndBansS7": ["GameId", "OverviewPage"],
+}
+
+# Cargo field types stored as numbers, so that comparisons to numbers behave like on the wiki
+numeric_types = {"Integer", "Float", "Boolean"}
+
+# Pages modified while a table is downloaded are downloaded again by the next refresh, with a margin for clock skew
+download_margin = timedelta(hours=1)
+
+# Cargo-specific operators that SQLite cannot answer, queries using them are sent to the wiki
+unsupported_operators = re.compile(r"\b(HOLDS|WITHIN|NEAR)\b", re.IGNORECASE)
+
+# Single or double-quoted string literals, with backslash or doubled quotes escapes
+literal_pattern = re.compile(
+    r"'((?:[^'\\]|\\.|'')*)'|\"((?:[^\"\\]|\\.|\"\")*)\"", re.DOTALL
+)
+reference_pattern = re.compile(r"(?<![\w.\"])([A-Za-z_]\w*)\s*\.\s*([A-Za-z_]\w*)")
+field_pattern = re.compile(r"^(.*[^<>!=])=\s*(\w[\w ]*)$", re.DOTALL)
+
+
+class CargoMirror:
+    """A local indexed copy of cargo tables, backed by SQLite, answering cargo queries on them without network access.
+
+    Tables are first downloaded whole, then refreshed incrementally from the modification date of their pages, in a
+    background thread or with refresh(). Queries on tables that are not downloaded yet, or using syntax SQLite cannot
+    answer, return None and are sent to the wiki instead.
+
+    Typical usage example:
+        mirror = leaguepedia.enable_mirror("leaguepedia_mirror.sqlite")
+        mirror.refresh()
+        rows = mirror.query(tables="ScoreboardGames", fields="GameId", where="OverviewPage = 'LCK/2021 Season/Spring Season'")
+    """
+
+    def __init__(
+        self,
+        site,
+        path: str = "leaguepedia_mirror.sqlite",
+        tables: Optional[List[str]] = None,
+        refresh_interval: float = 3600,
+    ):
+        """
+        Args:
+            site: the LeaguepediaSite used to download the tables.
+            path: path of the SQLite database, ":memory:" for a non-persistent mirror.
+            tables: the cargo tables to mirror, mirrored_tables by default.
+            refresh_interval: time in seconds between two background refreshes.
+        """
+        self.site = site
+        self.tables = tables or mirrored_tables
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._metadata = MetadataTable(self._connection)
+        self._connection.commit()
+
+    def query(self, **kwargs) -> Optional[List[dict]]:
+        """Answers a cargo query from the mirror.
+
+        Takes the same params as LeaguepediaSite.query(), usually tables, join_on, fields, where, order_by, and
+        group_by.
+
+        Returns:
+            The rows, like cargo returns them, or None if the query cannot be answered by the mirror.
+        """
+        try:
+            sql, keys = self._translate(**kwargs)
+        except ValueError as error:
+            leaguepedia_parser_logger.debug(
+                f"Query not answered by the mirror: {error}"
+            )
+            return None
+
+        with self._lock:
+            try:
+                rows = self._connection.execute(sql).fetchall()
+            except sqlite3.Error as error:
+                leaguepedia_parser_logger.debug(
+                    f"Query not answered by the mirror: {error}, {sql}"
+                )
+                return None
+
+        # Cargo returns all values as strings
+        return [
+            {
+                key: value if value is None or type(value) is str else str(value)
+                for key, value in zip(keys, row)
+            }
+            for row in rows
+        ]
+
+    def is_downloaded(self, table: str) -> bool:
+        with self._lock:
+            return self._metadata.get(f"{table}.columns") is not None
+
+    def refresh(self, full: bool = False) -> int:
+        """Downloads tables that are not mirrored yet, and rows of pages modified since the last refresh of the others.
+
+        Rows of deleted pages, or pages that no longer hold rows of a table, are only removed by a full refresh.
+
+        Args:
+            full: whether to download all tables again, also picking up new fields.
+
+        Returns:
+            The number of downloaded rows.
+        """
+        rows_count = 0
+
+        with self._refresh_lock:
+            for table in self.tables:
+                with self._lock:
+                    watermark = self._metadata.get(f"{table}.watermark")
+
+                if full or watermark is None:
+                    rows_count += self._download_table(table)
+                else:
+                    rows_count += self._refresh_table(table, watermark)
+
+        return rows_count
+
+    def start(self):
+        """Starts refreshing the mirror every refresh_interval seconds in a background thread, starting now."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="leaguepedia-mirror", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background refresh, waiting for a running refresh to finish."""
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+
+        self._thread = None
+
+    def close(self):
+        self.stop()
+        self._connection.close()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                leaguepedia_parser_logger.exception("Cargo mirror refresh failed")
+
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def _download_table(self, table: str) -> int:
+        """Downloads a whole table in a staging table, replacing the mirrored one once done.
+
+        Rows are paged by _ID, which unlike offsets stays stable while the table is modified during the download.
+        """
+        started = datetime.now(timezone.utc) - download_margin
+        columns = self._get_columns(table)
+        staging_table = f"{table}__staging"
+
+        with self._lock:
+            self._connection.execute(f'DROP TABLE IF EXISTS "{staging_table}"')
+            self._create_table(staging_table, columns)
+            self._connection.commit()
+
+        rows_count, last_id = 0, 0
+
+        while True:
+            rows = self.site._query_page(
+                0,
+                tables=table,
+                fields=", ".join(self._get_fields(table, columns)),
+                where=f"{table}._ID > {last_id}",
+                order_by=f"{table}._ID",
+            )
+
+            with self._lock:
+                self._insert(staging_table, columns, rows)
+                self._connection.commit()
+
+            rows_count += len(rows)
+
+            if len(rows) < self.site.limit:
+                break
+
+            last_id = int(rows[-1]["rowID"])
+
+        with self._lock:
+            self._connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._connection.execute(
+                f'ALTER TABLE "{staging_table}" RENAME TO "{table}"'
+            )
+            self._create_indexes(table, columns)
+            self._metadata.set(f"{table}.columns", json.dumps(columns))
+            self._metadata.set(
+                f"{table}.watermark", started.strftime("%Y-%m-%d %H:%M:%S")
+            )
+            self._metadata.set(f"{table}.refreshed", str(time.time()))
+            self._connection.commit()
+
+        return rows_count
+
+    def _refresh_table(self, table: str, watermark: str) -> int:
+        """Replaces the rows of pages modified since the watermark."""
+        with self._lock:
+            columns = json.loads(self._metadata.get(f"{table}.columns"))
+
+        rows = self.site.query(
+            **get_changed_rows_query(
+                table, self._get_fields(table, columns), watermark
+            ),
+            cache_ttl=0,
+        )
+
+        with self._lock:
+            delete_pages_rows(
+                self._connection,
+                table,
+                "_pageName",
+                {row["pageName"] for row in rows},
+            )
+            self._insert(table, columns, rows)
+
+            if rows:
+                self._metadata.set(
+                    f"{table}.watermark", max(row["watermark"] for row in rows)
+                )
+
+            self._metadata.set(f"{table}.refreshed", str(time.time()))
+            self._connection.commit()
+
+        return len(rows)
+
+    def _get_columns(self, table: str) -> Dict[str, str]:
+        """Returns the SQLite type of each field of the cargo table."""
+        fields = self.site.api("cargofields", table=table)["cargofields"]
+
+        return {
+            field: "NUMERIC" if description.get("type") in numeric_types else "TEXT"
+            for field, description in fields.items()
+        }
+
+    @staticmethod
+    def _get_fields(table: str, columns: Dict[str, str]) -> List[str]:
+        """Returns the cargo fields downloading all columns, aliased to their own name."""
+        return [
+            f"{table}._ID=rowID",
+            f"{table}._pageName=pageName",
+            f"{table}._pageID=pageID",
+        ] + [f"{table}.{column}={column}" for column in columns]
+
+    def _create_table(self, table: str, columns: Dict[str, str]):
+        # Cargo compares strings case-insensitively
+        definitions = [
+            (
+                f'"{column}" {type_} COLLATE NOCASE'
+                if type_ == "TEXT"
+                else f'"{column}" {type_}'
+            )
+            for column, type_ in columns.items()
+        ]
+
+        self._connection.execute(f"""
+            CREATE TABLE "{table}" (
+                _ID INTEGER PRIMARY KEY,
+                _pageName TEXT COLLATE NOCASE,
+                _pageID INTEGER,
+                {', '.join(definitions)}
+            )
+            """)
+
+    def _create_indexes(self, table: str, columns: Dict[str, str]):
+        for column in ["_pageName"] + mirror_indexes.get(table, []):
+            if column == "_pageName" or column in columns:
+                self._connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{table}_{column}" ON "{table}" ("{column}")'
+                )
+
+    def _insert(self, table: str, columns: Dict[str, str], rows: List[dict]):
+        self._connection.executemany(
+            f'INSERT OR REPLACE INTO "{table}" VALUES ({", ".join("?" * (len(columns) + 3))})',
+            [
+                (int(row["rowID"]), row["pageName"], row["pageID"])
+                + tuple(row.get(column) for column in columns)
+                for row in rows
+            ],
+        )
+
+    def _translate(
+        self,
+        tables: str,
+        fields: str,
+        join_on: str = None,
+        where: str = None,
+        order_by: str = None,
+        group_by: str = None,
+        having: str = None,
+        **kwargs,
+    ) -> Tuple[str, List[str]]:
+        """Translates cargo query kwargs to an SQLite query on the mirror.
+
+        Returns:
+            The SQL query, and the keys of the returned rows.
+
+        Raises:
+            ValueError: if the query cannot be answered by the mirror.
+        """
+        if kwargs:
+            raise ValueError(f"unsupported parameters {', '.join(kwargs)}")
+
+        # Table names and aliases, referenced in the query by their alias if they have one
+        aliases = {}
+
+        for table in _split(tables):
+            name, _, alias = (part.strip() for part in table.partition("="))
+
+            if not self.is_downloaded(name):
+                raise ValueError(f"{name} is not mirrored")
+
+            aliases[name] = alias or name
+
+        # Cargo joins are left outer joins, each table being joined to the previous ones
+        conditions = [
+            _translate_expression(condition, aliases)
+            for condition in _split(join_on or "")
+        ]
+        names = list(aliases)
+        joined = {aliases[names[0]]}
+        sql_tables = [f'"{names[0]}" AS "{aliases[names[0]]}"']
+
+        for name in names[1:]:
+            alias = aliases[name]
+            table_conditions = [
+                condition
+                for condition in conditions
+                if alias in _get_references(condition)
+                and _get_references(condition) <= joined | {alias}
+            ]
+
+            if not table_conditions:
+                raise ValueError(f"{name} is not joined")
+
+            joined.add(alias)
+            conditions = [
+                condition
+                for condition in conditions
+                if condition not in table_conditions
+            ]
+            sql_tables.append(
+                f'LEFT JOIN "{name}" AS "{alias}" ON {" AND ".join(table_conditions)}'
+            )
+
+        if conditions:
+            raise ValueError(f"unused join conditions {', '.join(conditions)}")
+
+        sql_fields, keys = [], []
+
+        for field in _split(fields):
+            match = field_pattern.match(field.strip())
+            expression, key = match.groups() if match else (field.strip(), None)
+
+            if key is None:
+                # Cargo default aliases are field names with spaces instead of underscores
+                key = expression.split(".")[-1].strip().replace("_", " ")
+
+            keys.append(key.strip())
+            sql_fields.append(
+                f'{_translate_expression(expression, aliases)} AS "{key.strip()}"'
+            )
+
+        sql = f"SELECT {', '.join(sql_fields)} FROM {' '.join(sql_tables)}"
+
+        if where:
+            sql += f" WHERE {_translate_expression(where, aliases)}"
+        if group_by:
+            sql += f" GROUP BY {_translate_expression(group_by, aliases)}"
+        if having:
+            sql += f" HAVING {_translate_expression(having, aliases)}"
+
+        if order_by:
+            sql += f" ORDER BY {_translate_expression(order_by, aliases)}"
+        elif not group_by:
+            # Cargo orders by page name by default
+            sql += (
+                f' ORDER BY "{aliases[names[0]]}"._pageName, "{aliases[names[0]]}"._ID'
+            )
+
+        return sql, keys
+
+
+def _split(expression: str) -> List[str]:
+    """Splits a cargo list of tables, fields or conditions on commas outside of parentheses and string literals."""
+    parts, depth, start, position = [], 0, 0, 0
+
+    while position < len(expression):
+        literal = literal_pattern.match(expression, position)
+
+        if literal:
+            position = literal.end()
+            continue
+
+        character = expression[position]
+
+        if character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+        elif character == "," and not depth:
+            parts.append(expression[start:position])
+            start = position + 1
+
+        position += 1
+
+    parts.append(expression[start:])
+
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _translate_expression(expression: str, aliases: Dict[str, str]) -> str:
+    """Translates a cargo expression to SQLite, quoting table references and converting string literals."""
+    translated, position = [], 0
+
+    for literal in literal_pattern.finditer(expression):
+        translated.append(
+            _translate_references(expression[position : literal.start()], aliases)
+        )
+
+        if literal.group(1) is not None:
+            value = literal.group(1).replace("''", "'")
+        else:
+            value = literal.group(2).replace('""', '"')
+
+        value = re.sub(r"\\(.)", r"\1", value, flags=re.DOTALL)
+        translated.append("'" + value.replace("'", "''") + "'")
+        position = literal.end()
+
+    translated.append(_translate_references(expression[position:], aliases))
+
+    return "".join(translated)
+
+
+def _translate_references(expression: str, aliases: Dict[str, str]) -> str:
+    if unsupported_operators.search(expression):
+        raise ValueError(f"unsupported operator in {expression}")
+
+    def replace(match: re.Match) -> str:
+        table, field = match.groups()
+
+        if table not in aliases and table not in aliases.values():
+            raise ValueError(f"unknown table {table}")
+
+        return f'"{aliases.get(table, table)}"."{field}"'
+
+    return reference_pattern.sub(replace, expression)
+
+
+def _get_references(condition: str) -> set:
+    """Returns the tables referenced by a translated condition."""
+    return set(re.findall(r'"([^"]+)"\."', condition))
@@ -0,0 +1,72 @@
+import sqlite3
+from typing import Iterable, List, Optional
+
+
+def get_changed_rows_query(
+    table: str, fields: List[str], watermark: Optional[str], where: str = None
+) -> dict:
+    """Returns the cargo query kwargs used to get rows of pages modified since the watermark.
+
+    Rows have the modification date of their page as "watermark", the next watermark being the highest one returned.
+
+    Args:
+        table: the cargo table.
+        fields: the queried fields.
+        watermark: the modification date rows were last queried at, None to query all rows.
+        where: an optional condition on the rows.
+    """
+    conditions = [where] if where else []
+
+    # We include the watermark itself as other pages can share the same second
+    if watermark:
+        conditions.append(f"_pageData._modificationDate >= '{watermark}'")
+
+    query = dict(
+        tables=f"{table}, _pageData",
+        join_on=f"{table}._pageName = _pageData._pageName",
+        fields=", ".join(fields + ["_pageData._modificationDate=watermark"]),
+        order_by=f"_pageData._modificationDate, {table}._ID",
+    )
+
+    if conditions:
+        query["where"] = " AND ".join(conditions)
+
+    return query
+
+
+def delete_pages_rows(
+    connection: sqlite3.Connection, table: str, column: str, page_names: Iterable[str]
+):
+    """Deletes the rows of modified pages from a local copy of a cargo table, before inserting their new rows.
+
+    Rows removed from a modified page must disappear from the local copy too.
+    """
+    connection.executemany(
+        f'DELETE FROM "{table}" WHERE "{column}" = ?',
+        [(page_name,) for page_name in page_names],
+    )
+
+
+class MetadataTable:
+    """A key-value table of an SQLite database, holding the watermarks of the local copies of cargo tables it holds.
+
+    Callers are expected to hold the lock of the connection and to commit.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT value FROM metadata WHERE key = ?", (key,)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?)", (key, value)
+        )
@@ -0,0 +1,183 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from leaguepedia_parser.site.page_data import (
+    MetadataTable,
+    delete_pages_rows,
+    get_changed_rows_query,
+)
+
+# Players fields kept in the snapshot, named like the game_players_fields aliases
+players_snapshot_fields = {
+    "Players.Name": "irlName",
+    "Players.Country": "Country",
+    "Players.Birthdate": "Birthdate",
+    "Players.ID": "currentGameName",
+    "Players._pageID": "pageId",
+}
+
+
+class PlayersSnapshot:
+    """A local indexed copy of the Players and PlayerRedirects tables, backed by SQLite.
+
+    Player information hardly ever changes, so games only query ScoreboardPlayers and players are enriched from the
+    snapshot. It is refreshed incrementally from the modification date of the players pages.
+
+    Typical usage example:
+        leaguepedia.enable_players_snapshot("players.sqlite")
+    """
+
+    def __init__(
+        self,
+        site,
+        path: str = "leaguepedia_players.sqlite",
+        refresh_interval: Optional[float] = 24 * 3600,
+    ):
+        """
+        Args:
+            site: the LeaguepediaSite used to download the tables.
+            path: path of the SQLite database, ":memory:" for a non-persistent snapshot.
+            refresh_interval: time in seconds after which the snapshot is refreshed on use. None never refreshes it.
+        """
+        self.site = site
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS players (
+                overview_page TEXT PRIMARY KEY,
+                page_name TEXT NOT NULL,
+                {', '.join(f'{alias} TEXT' for alias in players_snapshot_fields.values())}
+            );
+            CREATE INDEX IF NOT EXISTS players_page_name ON players (page_name);
+            CREATE TABLE IF NOT EXISTS redirects (
+                all_name TEXT NOT NULL,
+                overview_page TEXT NOT NULL,
+                page_name TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS redirects_all_name ON redirects (all_name);
+            CREATE INDEX IF NOT EXISTS redirects_page_name ON redirects (page_name);
+            """)
+        self._metadata = MetadataTable(self._connection)
+        self._connection.commit()
+
+    def refresh(self, full: bool = False) -> int:
+        """Downloads Players and PlayerRedirects rows of pages modified since the last refresh.
+
+        Pages deleted from the wiki are only removed by a full refresh.
+
+        Args:
+            full: whether to download the whole tables again.
+
+        Returns:
+            The number of refreshed pages.
+        """
+        with self._lock:
+            watermark = None if full else self._metadata.get("watermark")
+
+        players = self.site.query(
+            **get_changed_rows_query(
+                "Players",
+                [f"{field}={alias}" for field, alias in players_snapshot_fields.items()]
+                + ["Players.OverviewPage=OverviewPage", "Players._pageName=pageName"],
+                watermark,
+            ),
+            cache_ttl=0,
+        )
+        redirects = self.site.query(
+            **get_changed_rows_query(
+                "PlayerRedirects",
+                [
+                    "PlayerRedirects.AllName=AllName",
+                    "PlayerRedirects.OverviewPage=OverviewPage",
+                    "PlayerRedirects._pageName=pageName",
+                ],
+                watermark,
+            ),
+            cache_ttl=0,
+        )
+
+        page_names = {row["pageName"] for row in players + redirects}
+
+        with self._lock:
+            if full:
+                self._connection.execute("DELETE FROM players")
+                self._connection.execute("DELETE FROM redirects")
+            else:
+                delete_pages_rows(self._connection, "players", "page_name", page_names)
+                delete_pages_rows(
+                    self._connection, "redirects", "page_name", page_names
+                )
+
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO players VALUES ({', '.join('?' * (len(players_snapshot_fields) + 2))})",
+                [
+                    (row["OverviewPage"], row["pageName"])
+                    + tuple(row[alias] for alias in players_snapshot_fields.values())
+                    for row in players
+                ],
+            )
+            self._connection.executemany(
+                "INSERT INTO redirects VALUES (?, ?, ?)",
+                [
+                    (row["AllName"].lower(), row["OverviewPage"], row["pageName"])
+                    for row in redirects
+                ],
+            )
+
+            watermarks = [row["watermark"] for row in players + redirects]
+
+            if watermarks:
+                self._metadata.set("watermark", max(watermarks))
+
+            self._metadata.set("refreshed", str(time.time()))
+            self._connection.commit()
+
+        return len(page_names)
+
+    def refresh_if_stale(self):
+        """Refreshes the snapshot if it was never refreshed, or more than refresh_interval seconds ago."""
+        # Concurrent games wait for a single refresh
+        with self._refresh_lock:
+            with self._lock:
+                refreshed = self._metadata.get("refreshed")
+
+            if refreshed is None or (
+                self.refresh_interval is not None
+                and time.time() - float(refreshed) > self.refresh_interval
+            ):
+                self.refresh()
+
+    def get_players(self, links: List[str]) -> Dict[str, dict]:
+        """Returns players information keyed by link, following player redirects case-insensitively.
+
+        Args:
+            links: ScoreboardPlayers.Link values.
+
+        Returns:
+            A dict of Players rows with game_players_fields aliases. Unknown players are absent.
+        """
+        players = {}
+
+        with self._lock:
+            for link in links:
+                row = self._connection.execute(
+                    f"""
+                    SELECT {', '.join(players_snapshot_fields.values())}
+                    FROM redirects JOIN players ON redirects.overview_page = players.overview_page
+                    WHERE redirects.all_name = ?
+                    """,
+                    (link.lower(),),
+                ).fetchone()
+
+                if row:
+                    players[link] = dict(zip(players_snapshot_fields.values(), row))
+
+        return players
+
+    def close(self):
+        self._connection.close()
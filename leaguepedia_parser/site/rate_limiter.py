@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# MediaWiki API error codes returned when a client is throttled
+throttling_error_codes = {"ratelimited", "maxlag"}
+
+
+class TokenBucket:
+    """A thread-safe token bucket limiting the rate of requests.
+
+    Tokens are refilled at requests_per_second, and up to burst requests can be issued at once.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request can be issued."""
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.requests_per_second,
+            )
+            self._updated = now
+
+            # Tokens can go negative, which reserves the next ones for the waiting callers
+            self._tokens -= 1
+            wait = -self._tokens / self.requests_per_second
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+@dataclass
+class RequestStats:
+    requests: int = 0
+    throttled: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Whether the error means the wiki is throttling us."""
+    # Errors are only checked once a request failed, so the HTTP libraries are already imported
+    import requests
+    from mwclient.errors import APIError
+
+    if isinstance(error, APIError):
+        return error.code in throttling_error_codes
+
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429
+
+    return False
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether the request can be retried after this error, throttling or temporary server errors."""
+    import requests
+    from mwclient.errors import MaximumRetriesExceeded
+
+    if is_throttling_error(error):
+        return True
+
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+
+    return isinstance(
+        error,
+        (MaximumRetriesExceeded, requests.ConnectionError, requests.Timeout),
+    )
+
+
+def get_backoff(
+    attempt: int, error: Exception, base: float = 1, max_backoff: float = 60
+) -> float:
+    """Returns the time to wait before retrying, with full jitter exponential backoff.
+
+    The server’s Retry-After header is respected when present.
+    """
+    import requests
+
+    retry_after: Optional[str] = None
+
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        retry_after = error.response.headers.get("Retry-After")
+
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+
+    return random.uniform(0, min(max_backoff, base * 2**attempt))
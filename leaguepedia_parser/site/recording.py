@@ -0,0 +1,84 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from leaguepedia_parser.site.cache import normalize_query
+
+recording_modes = {"record", "replay"}
+
+
+class Recording:
+    """Records Leaguepedia responses to compressed files, or replays them without any network access.
+
+    Each request is saved in its own gzipped JSON file, named after a hash of its normalized arguments, so replays are
+    deterministic whatever the order of requests.
+
+    Typical usage example:
+        leaguepedia.enable_recording("tests/recordings", mode="record")
+        leaguepedia.enable_recording("tests/recordings", mode="replay", latency=0.2)
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: float = 0):
+        """
+        Args:
+            path: directory holding the recorded responses.
+            mode: "record" to save live responses, "replay" to serve recorded ones.
+            latency: time in seconds to wait before returning each replayed response, to simulate the network.
+        """
+        if mode not in recording_modes:
+            raise ValueError(f"Recording mode must be one of {recording_modes}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+
+        if mode == "record":
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, kind: str, request: dict, response):
+        """Saves the response of a request.
+
+        Args:
+            kind: "cargo" for cargo queries, "api" for other MediaWiki API requests.
+            request: the request arguments.
+            response: the JSON-serializable response.
+        """
+        # Written to a temporary file first so concurrent replays never read a partial file
+        file_path = self._get_file_path(kind, request)
+
+        with gzip.open(f"{file_path}.tmp", "wt", encoding="utf-8") as file:
+            json.dump(
+                {"kind": kind, "request": request, "response": response},
+                file,
+                sort_keys=True,
+            )
+
+        os.replace(f"{file_path}.tmp", file_path)
+
+    def replay(self, kind: str, request: dict):
+        """Returns the recorded response of a request, raising a KeyError if it was never recorded."""
+        file_path = self._get_file_path(kind, request)
+
+        try:
+            with gzip.open(file_path, "rt", encoding="utf-8") as file:
+                response = json.load(file)["response"]
+        except FileNotFoundError:
+            raise KeyError(f"No recorded response for {kind} request {request}")
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        return response
+
+    def _get_file_path(self, kind: str, request: dict) -> str:
+        key = hashlib.sha1(
+            normalize_query({"kind": kind, **request}).encode()
+        ).hexdigest()
+
+        return os.path.join(self.path, f"{key}.json.gz")
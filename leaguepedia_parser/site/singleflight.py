@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Hashable, Callable, Awaitable, Tuple, TypeVar, Any
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A call running for a key, with the future its followers wait on."""
+
+    def __init__(self, future, owner: Any):
+        self.future = future
+        # Thread or task running the call, which must not wait on itself
+        self.owner = owner
+        self.followers = 0
+        # Coroutines awaiting the call, which is cancelled when all of them are
+        self.waiters = 0
+
+
+class Singleflight:
+    """Coalesces identical concurrent calls from threads, so that only the first one runs and all get its result.
+
+    Typical usage example:
+        rows, shared = singleflight.do(normalize_query(kwargs), lambda: query(**kwargs))
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> Tuple[T, bool]:
+        """Runs function, or waits for the running call with the same key.
+
+        A call made again with the same key from inside function runs on its own, like without coalescing.
+
+        Returns:
+            The result, and whether it is shared with other callers, who must then not modify it in place. Exceptions
+            are raised in all callers.
+        """
+        thread = threading.get_ident()
+
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is not None and call.owner != thread:
+                call.followers += 1
+            elif call is None:
+                call = self._calls[key] = _Call(Future(), thread)
+            else:
+                call = None
+
+        if call is None:
+            return function(), False
+
+        if call.owner != thread:
+            return call.future.result(), True
+
+        try:
+            result = function()
+        except BaseException as error:
+            call.future.set_exception(error)
+            self._remove(key, call)
+            raise
+
+        call.future.set_result(result)
+
+        return result, self._remove(key, call) > 0
+
+    def _remove(self, key: Hashable, call: _Call) -> int:
+        """Stops followers from joining the call, returning how many joined it."""
+        with self._lock:
+            del self._calls[key]
+
+            return call.followers
+
+
+class AsyncSingleflight:
+    """Coalesces identical concurrent calls from coroutines of the same event loop, like Singleflight."""
+
+    def __init__(self):
+        # Keyed by event loop too, as futures are bound to the loop that created them
+        self._calls: Dict[Tuple[Any, Hashable], _Call] = {}
+
+    async def do(
+        self, key: Hashable, function: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """Awaits function, or the running call with the same key.
+
+        Returns:
+            The result, and whether it is shared with other callers, who must then not modify it in place. Exceptions
+            are raised in all callers, and cancelling a caller only cancels the call if no other caller awaits it.
+        """
+        # Imported here as asyncio is slow to import and only needed by asyncio callers
+        import asyncio
+
+        task = asyncio.current_task()
+        key = (asyncio.get_running_loop(), key)
+        call = self._calls.get(key)
+
+        if call is not None and call.owner is task:
+            return await function(), False
+
+        if call is None:
+            # The call runs in its own task, so that cancelling the caller who started it does not cancel the others
+            future = asyncio.ensure_future(function())
+            call = self._calls[key] = _Call(future, future)
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            call.followers += 1
+
+        call.waiters += 1
+
+        try:
+            result = await asyncio.shield(call.future)
+        except asyncio.CancelledError:
+            # The call is only cancelled once nobody waits for it anymore
+            if not call.future.done():
+                call.waiters -= 1
+
+                if not call.waiters:
+                    call.future.cancel()
+
+            raise
+
+        return result, call.followers > 0
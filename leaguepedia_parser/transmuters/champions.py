@@ -0,0 +1,31 @@
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# There are about 170 champions, the rest of the cache holds alternative spellings found on Leaguepedia
+champion_cache_size = 1024
+
+
+@lru_cache(maxsize=champion_cache_size)
+def get_champion_id(champion_name: str) -> Optional[int]:
+    """
+    Returns the Riot ID of a champion from its Leaguepedia name
+
+    lol_id_tools uses fuzzy matching, which is too slow to run for every pick and ban of every game, so results are
+    memoized in a bounded cache shared by all transmuters. lol_id_tools is only imported on the first lookup, as it
+    loads its champion data on import.
+    """
+    import lol_id_tools as lit
+
+    return lit.get_id(champion_name, object_type="champion")
+
+
+def warm_champion_cache(champion_names: Iterable[str]):
+    """
+    Resolves all champion names at once, for example at startup with get_champions_names()
+    """
+    for champion_name in champion_names:
+        get_champion_id(champion_name)
+
+
+def clear_champion_cache():
+    get_champion_id.cache_clear()
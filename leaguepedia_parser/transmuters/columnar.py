@@ -0,0 +1,117 @@
+from typing import List, Dict
+
+from leaguepedia_parser.transmuters.champions import get_champion_id
+
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:
+    pyarrow = None
+
+# Team-level integer fields of ScoreboardGames, exported for both sides
+team_int_fields = ["Score", "Towers", "Dragons", "Barons", "RiftHeralds", "Inhibitors"]
+
+sides = [("blue", 1), ("red", 2)]
+
+
+def transmute_games_columns(source_dicts: List[dict]) -> Dict[str, list]:
+    """
+    Transforms ScoreboardGames rows into columns, without building a LolGame per row
+
+    Values are cast to their final Python type, except the start timestamp that is kept as a string.
+    Picks and bans are lists of champion IDs.
+    """
+    columns = {
+        "gameId": [row["GameId"] for row in source_dicts],
+        "matchId": [row["MatchId"] for row in source_dicts],
+        "overviewPage": [row["OverviewPage"] for row in source_dicts],
+        "tournamentName": [row["Tournament"] for row in source_dicts],
+        "gameInSeries": [int(row["N GameInMatch"] or 0) for row in source_dicts],
+        "start": [row["DateTime UTC"] for row in source_dicts],
+        "duration": [
+            int(float(row["Gamelength Number"] or 0) * 60) for row in source_dicts
+        ],
+        "patch": [row["Patch"] for row in source_dicts],
+        "winner": ["BLUE" if row["Winner"] == "1" else "RED" for row in source_dicts],
+    }
+
+    for side, idx in sides:
+        columns[f"{side}Team"] = [row[f"Team{idx}"] for row in source_dicts]
+
+        for field in team_int_fields:
+            columns[f"{side}{field}"] = [
+                int(row[f"Team{idx}{field}"] or 0) for row in source_dicts
+            ]
+
+        for field in ["Picks", "Bans"]:
+            columns[f"{side}{field}"] = [
+                [
+                    get_champion_id(champion_name)
+                    for champion_name in row[f"Team{idx}{field}"].split(",")
+                ]
+                for row in source_dicts
+            ]
+
+        columns[f"{side}Players"] = [
+            row[f"Team{idx}Players"].split(",") for row in source_dicts
+        ]
+
+    return columns
+
+
+def get_games_schema() -> "pyarrow.Schema":
+    """Returns the Arrow schema of games tables."""
+    if pyarrow is None:
+        raise ImportError(
+            "pyarrow is required for Arrow tables, install it with `pip install leaguepedia_parser[parquet]`"
+        )
+
+    fields = [
+        ("gameId", pyarrow.string()),
+        ("matchId", pyarrow.string()),
+        ("overviewPage", pyarrow.string()),
+        ("tournamentName", pyarrow.string()),
+        ("gameInSeries", pyarrow.int16()),
+        ("start", pyarrow.timestamp("s", tz="UTC")),
+        ("duration", pyarrow.int32()),
+        ("patch", pyarrow.string()),
+        ("winner", pyarrow.string()),
+    ]
+
+    for side, _ in sides:
+        fields.append((f"{side}Team", pyarrow.string()))
+        fields.extend((f"{side}{field}", pyarrow.int16()) for field in team_int_fields)
+        fields.append((f"{side}Picks", pyarrow.list_(pyarrow.int32())))
+        fields.append((f"{side}Bans", pyarrow.list_(pyarrow.int32())))
+        fields.append((f"{side}Players", pyarrow.list_(pyarrow.string())))
+
+    return pyarrow.schema(fields)
+
+
+def transmute_games_table(source_dicts: List[dict]) -> "pyarrow.Table":
+    """
+    Transforms ScoreboardGames rows into an Arrow table with typed columns
+
+    Timestamps are parsed in a single vectorized call instead of once per row.
+    """
+    schema = get_games_schema()
+    columns = transmute_games_columns(source_dicts)
+
+    # Naive timestamps keep their values when cast, so they are interpreted as UTC
+    start = pyarrow.compute.strptime(
+        pyarrow.array(columns.pop("start"), pyarrow.string()),
+        format="%Y-%m-%d %H:%M:%S",
+        unit="s",
+    ).cast(schema.field("start").type)
+
+    return pyarrow.table(
+        [
+            (
+                start
+                if field.name == "start"
+                else pyarrow.array(columns[field.name], field.type)
+            )
+            for field in schema
+        ],
+        schema=schema,
+    )
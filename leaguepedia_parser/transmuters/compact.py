@@ -0,0 +1,142 @@
+import dataclasses
+import sys
+from typing import Dict, Tuple, TypeVar
+
+from leaguepedia_parser.transmuters.game import (
+    LeaguepediaGameIdentifier,
+    LeaguepediaTeamIdentifier,
+)
+from leaguepedia_parser.transmuters.game_players import LeaguepediaPlayerIdentifier
+from leaguepedia_parser.transmuters.tournament import LeaguepediaTournament
+
+T = TypeVar("T")
+
+
+def make_compact_class(cls: type, frozen: bool = False) -> type:
+    """Returns a variant of a dataclass with __slots__ instead of a per-instance __dict__, interning its strings.
+
+    Values like regions, leagues, tournament names, overview pages, countries and team names repeat across hundreds of
+    thousands of objects, and interning stores each distinct value once.
+
+    Args:
+        cls: the dataclass to copy the fields of.
+        frozen: whether instances are immutable and hashable.
+    """
+    fields = [
+        (
+            (field.name, field.type, dataclasses.field(default=field.default))
+            if field.default is not dataclasses.MISSING
+            else (field.name, field.type)
+        )
+        for field in dataclasses.fields(cls)
+    ]
+    field_names = tuple(field[0] for field in fields)
+
+    def __post_init__(self):
+        for name in field_names:
+            value = getattr(self, name)
+
+            if type(value) is str:
+                # Frozen instances forbid setattr
+                object.__setattr__(self, name, sys.intern(value))
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in field_names)
+
+    def __setstate__(self, state):
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+
+    # The dataclass is created first to generate its methods, then again with __slots__ as class attributes holding
+    # default values would conflict with slots, like dataclass(slots=True) does on Python 3.10+
+    dataclass = dataclasses.make_dataclass(
+        f"{'Frozen' if frozen else 'Compact'}{cls.__name__}",
+        fields,
+        namespace={
+            "__post_init__": __post_init__,
+            "__getstate__": __getstate__,
+            "__setstate__": __setstate__,
+        },
+        frozen=frozen,
+    )
+
+    namespace = {
+        key: value
+        for key, value in dataclass.__dict__.items()
+        if key not in field_names and key not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = field_names
+    namespace["__module__"] = __name__
+
+    return type(dataclass.__name__, (), namespace)
+
+
+CompactLeaguepediaTournament = make_compact_class(LeaguepediaTournament)
+CompactLeaguepediaGameIdentifier = make_compact_class(LeaguepediaGameIdentifier)
+CompactLeaguepediaTeamIdentifier = make_compact_class(LeaguepediaTeamIdentifier)
+CompactLeaguepediaPlayerIdentifier = make_compact_class(LeaguepediaPlayerIdentifier)
+
+FrozenLeaguepediaTournament = make_compact_class(LeaguepediaTournament, frozen=True)
+FrozenLeaguepediaGameIdentifier = make_compact_class(
+    LeaguepediaGameIdentifier, frozen=True
+)
+FrozenLeaguepediaTeamIdentifier = make_compact_class(
+    LeaguepediaTeamIdentifier, frozen=True
+)
+FrozenLeaguepediaPlayerIdentifier = make_compact_class(
+    LeaguepediaPlayerIdentifier, frozen=True
+)
+
+# Compact variants by original class and frozen flag
+compact_classes: Dict[Tuple[type, bool], type] = {
+    (LeaguepediaTournament, False): CompactLeaguepediaTournament,
+    (LeaguepediaGameIdentifier, False): CompactLeaguepediaGameIdentifier,
+    (LeaguepediaTeamIdentifier, False): CompactLeaguepediaTeamIdentifier,
+    (LeaguepediaPlayerIdentifier, False): CompactLeaguepediaPlayerIdentifier,
+    (LeaguepediaTournament, True): FrozenLeaguepediaTournament,
+    (LeaguepediaGameIdentifier, True): FrozenLeaguepediaGameIdentifier,
+    (LeaguepediaTeamIdentifier, True): FrozenLeaguepediaTeamIdentifier,
+    (LeaguepediaPlayerIdentifier, True): FrozenLeaguepediaPlayerIdentifier,
+}
+
+
+def to_compact(obj: T, frozen: bool = False) -> T:
+    """Returns the compact variant of a tournament or of a Leaguepedia identifier.
+
+    Typical usage example:
+        tournaments = [to_compact(tournament, frozen=True) for tournament in iter_tournaments()]
+
+    Args:
+        obj: a LeaguepediaTournament, or a Leaguepedia game, team or player identifier.
+        frozen: whether the returned object is immutable and hashable.
+    """
+    compact_class = compact_classes[(type(obj), frozen)]
+
+    return compact_class(
+        **{field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    )
+
+
+def compact_game(game, frozen: bool = False):
+    """Replaces the Leaguepedia identifiers of a LolGame, its teams and its players by their compact variants.
+
+    Args:
+        game: a LolGame, modified in place.
+        frozen: whether identifiers are immutable and hashable.
+
+    Returns:
+        The same LolGame.
+    """
+    sources = [game.sources] + [
+        source
+        for team in game.teams
+        for source in [team.sources] + [player.sources for player in team.players]
+    ]
+
+    for source in sources:
+        identifier = getattr(source, "leaguepedia", None)
+
+        if identifier is not None and (type(identifier), frozen) in compact_classes:
+            setattr(source, "leaguepedia", to_compact(identifier, frozen))
+
+    return game
@@ -1,17 +1,14 @@
 import urllib.parse
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
-import lol_id_tools as lit
-from lol_dto.classes.game import (
-    LolGame,
-    LolGamePlayer,
-    LolGameTeamEndOfGameStats,
-)
-from lol_dto.classes.sources.riot_lol_api import RiotGameSource
-
+from leaguepedia_parser.transmuters.champions import get_champion_id
 from leaguepedia_parser.transmuters.game_players import LeaguepediaPlayerIdentifier
 
+if TYPE_CHECKING:
+    from lol_dto.classes.game import LolGame
+
 
 @dataclass
 class LeaguepediaGameIdentifier:
@@ -29,70 +26,105 @@ class LeaguepediaTeamIdentifier:
     name: str = None
 
 
-def transmute_game(source_dict: dict) -> LolGame:
+# ScoreboardGames fields of each team and the end of game stats they are transmuted to
+team_end_of_game_stats = [
+    ("Towers", "turretKills"),
+    ("Dragons", "dragonKills"),
+    ("RiftHeralds", "riftHeraldKills"),
+    ("Barons", "baronKills"),
+]
+
+
+def transmute_game(source_dict: dict) -> "LolGame":
     """
     Transforms a ScoreboardGames row into a LolGame
 
     Some fields like team gold and kills are not present. Get_game_details should be used for it.
-    """
 
-    game = LolGame(
-        start=datetime.fromisoformat(source_dict["DateTime UTC"])
-        .replace(tzinfo=timezone.utc)
-        .isoformat(timespec="seconds"),
-        gameInSeries=int(source_dict["N GameInMatch"]),
-        patch=source_dict["Patch"],
-        duration=int(float(source_dict["Gamelength Number"] or 0) * 60),
-        vod=source_dict["VOD"],
-        winner="BLUE" if source_dict["Winner"] == "1" else "RED",
+    Rows queried with a fields projection only have some of the game_fields, and give a partially populated LolGame
+    where missing fields keep their default value. Players are only created when picks are present.
+    """
+    # lol_dto is only imported once needed, as it loads lol_id_tools’ champion data
+    from lol_dto.classes.game import (
+        LolGame,
+        LolGamePlayer,
+        LolGameTeamEndOfGameStats,
     )
+    from lol_dto.classes.sources.riot_lol_api import RiotGameSource
+
+    game = LolGame()
+
+    if "DateTime UTC" in source_dict:
+        game.start = (
+            datetime.fromisoformat(source_dict["DateTime UTC"])
+            .replace(tzinfo=timezone.utc)
+            .isoformat(timespec="seconds")
+        )
+    if "N GameInMatch" in source_dict:
+        game.gameInSeries = int(source_dict["N GameInMatch"])
+    if "Patch" in source_dict:
+        game.patch = source_dict["Patch"]
+    if "Gamelength Number" in source_dict:
+        game.duration = int(float(source_dict["Gamelength Number"] or 0) * 60)
+    if "VOD" in source_dict:
+        game.vod = source_dict["VOD"]
+    if "Winner" in source_dict:
+        game.winner = "BLUE" if source_dict["Winner"] == "1" else "RED"
 
     setattr(
         game.sources,
         "leaguepedia",
         LeaguepediaGameIdentifier(
-            gameId=source_dict["GameId"],
-            matchId=source_dict["MatchId"],
-            matchHistoryUrl=source_dict["MatchHistory"],
-            overviewPage=source_dict["OverviewPage"],
-            tournamentName=source_dict["Tournament"],
+            gameId=source_dict.get("GameId"),
+            matchId=source_dict.get("MatchId"),
+            matchHistoryUrl=source_dict.get("MatchHistory"),
+            overviewPage=source_dict.get("OverviewPage"),
+            tournamentName=source_dict.get("Tournament"),
         ),
     )
 
     for team, idx in [(game.teams.BLUE, 1), (game.teams.RED, 2)]:
-        team.bans = [
-            lit.get_id(champion_name, object_type="champion")
-            for champion_name in source_dict[f"Team{idx}Bans"].split(",")
-        ]
-
-        team.endOfGameStats = LolGameTeamEndOfGameStats(
-            turretKills=int(source_dict[f"Team{idx}Towers"] or 0),
-            dragonKills=int(source_dict[f"Team{idx}Dragons"] or 0),
-            riftHeraldKills=int(source_dict[f"Team{idx}RiftHeralds"] or 0),
-            baronKills=int(source_dict[f"Team{idx}Barons"] or 0),
-        )
-
-        for player_idx, champion_name in enumerate(
-            source_dict[f"Team{idx}Picks"].split(",")
-        ):
-            player_object = LolGamePlayer(
-                championId=lit.get_id(champion_name, object_type="champion"),
-            )
-
-            setattr(
-                player_object.sources,
-                "leaguepedia",
-                LeaguepediaPlayerIdentifier(
-                    gameName=source_dict[f"Team{idx}Players"].split(",")[idx]
-                ),
-            )
-
-            team.players.append(player_object)
+        if f"Team{idx}Bans" in source_dict:
+            team.bans = [
+                get_champion_id(champion_name)
+                for champion_name in source_dict[f"Team{idx}Bans"].split(",")
+            ]
+
+        end_of_game_stats = {
+            stat: int(source_dict[f"Team{idx}{field}"] or 0)
+            for field, stat in team_end_of_game_stats
+            if f"Team{idx}{field}" in source_dict
+        }
+
+        if end_of_game_stats:
+            team.endOfGameStats = LolGameTeamEndOfGameStats(**end_of_game_stats)
+
+        if f"Team{idx}Picks" in source_dict:
+            # Split once per team rather than once per player
+            players_names = source_dict.get(f"Team{idx}Players")
+            players_names = players_names.split(",") if players_names else None
+
+            for player_idx, champion_name in enumerate(
+                source_dict[f"Team{idx}Picks"].split(",")
+            ):
+                player_object = LolGamePlayer(
+                    championId=get_champion_id(champion_name),
+                )
+
+                setattr(
+                    player_object.sources,
+                    "leaguepedia",
+                    LeaguepediaPlayerIdentifier(
+                        gameName=players_names[player_idx] if players_names else None
+                    ),
+                )
+
+                team.players.append(player_object)
 
         setattr(
             team.sources,
             "leaguepedia",
-            LeaguepediaTeamIdentifier(name=source_dict[f"Team{idx}"]),
+            LeaguepediaTeamIdentifier(name=source_dict.get(f"Team{idx}")),
         )
 
     # For Riot API games, I directly parse the URL for the game to have its actual identifiers.
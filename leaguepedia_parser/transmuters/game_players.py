@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from typing import List
-from lol_dto.classes.game import LolGame, LolGamePlayer
-import lol_id_tools as lit
+from typing import List, Dict, Tuple, TYPE_CHECKING
+from leaguepedia_parser.transmuters.champions import get_champion_id
 
+if TYPE_CHECKING:
+    from lol_dto.classes.game import LolGame, LolGamePlayer
 
 role_translation = {"1": "TOP", "2": "JGL", "3": "MID", "4": "BOT", "5": "SUP"}
 
@@ -18,28 +19,40 @@ class LeaguepediaPlayerIdentifier:
 
 
 def add_players(
-    game: LolGame, players: List[dict], add_page_id: bool = False
-) -> LolGame:
+    game: "LolGame",
+    players: List[dict],
+    add_page_id: bool = False,
+    players_snapshot=None,
+) -> "LolGame":
     """
     Adds additional player information from ScoreboardPlayers
+
+    Players are matched on their side and champion, falling back to their side and role when the champion is missing.
+    If a PlayersSnapshot is given, ScoreboardPlayers rows are enriched with its Players information from their Link.
     """
+    if players_snapshot:
+        players_information = players_snapshot.get_players(
+            list({player["Link"] for player in players if player.get("Link")})
+        )
+        players = [
+            {**players_information.get(player.get("Link"), {}), **player}
+            for player in players
+        ]
+
+    players_by_champion, players_by_role = index_players(players)
 
     for idx, team in enumerate(game.teams):
         team_side_leaguepedia = "1" if idx == 0 else "2"
 
         for player_idx, game_player in enumerate(team.players):
-            game_player: LolGamePlayer
-
-            try:
-                # We get the player object from the Leaguepedia players list
-                player_latest_data = next(
-                    p
-                    for p in players
-                    if p["Side"] == team_side_leaguepedia
-                    and lit.get_id(p["Champion"], object_type="champion")
-                    == game_player.championId
-                )
-            except StopIteration:
+            game_player: "LolGamePlayer"
+
+            # We get the player object from the Leaguepedia players list
+            player_latest_data = players_by_champion.get(
+                (team_side_leaguepedia, game_player.championId)
+            ) or players_by_role.get((team_side_leaguepedia, str(player_idx + 1)))
+
+            if not player_latest_data:
                 # Since we cannot get the role properly, we try to infer it from the index
                 game_player.role = list(role_translation.values())[player_idx]
                 continue
@@ -59,3 +72,27 @@ def add_players(
             setattr(game_player.sources, "leaguepedia", leaguepedia_identifier)
 
     return game
+
+
+def index_players(
+    players: List[dict],
+) -> Tuple[Dict[Tuple[str, int], dict], Dict[Tuple[str, str], dict]]:
+    """
+    Indexes ScoreboardPlayers rows by (side, championId) and by (side, role number)
+
+    The first row wins for duplicate keys, and each champion name is only resolved once.
+    """
+    players_by_champion = {}
+    players_by_role = {}
+
+    for player in players:
+        champion_id = (
+            get_champion_id(player["Champion"]) if player["Champion"] else None
+        )
+
+        if champion_id is not None:
+            players_by_champion.setdefault((player["Side"], champion_id), player)
+
+        players_by_role.setdefault((player["Side"], player["gameRoleNumber"]), player)
+
+    return players_by_champion, players_by_role
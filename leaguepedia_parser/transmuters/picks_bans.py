@@ -1,17 +1,22 @@
-from typing import List
-from lol_dto.classes.game.lol_game import LolPickBan
-import lol_id_tools as lit
+from typing import List, TYPE_CHECKING
 
+from leaguepedia_parser.transmuters.champions import get_champion_id
 from leaguepedia_parser.transmuters.field_names import picks_bans_fields
 
+if TYPE_CHECKING:
+    from lol_dto.classes.game.lol_game import LolPickBan
+
+
+def transmute_picks_bans(input_dict) -> List["LolPickBan"]:
+    # lol_dto is only imported once needed, as it loads lol_id_tools’ champion data
+    from lol_dto.classes.game.lol_game import LolPickBan
 
-def transmute_picks_bans(input_dict) -> List[LolPickBan]:
     pb_list = []
 
     for field in picks_bans_fields:
         pb_list.append(
             LolPickBan(
-                championId=lit.get_id(input_dict[field], object_type="champion"),
+                championId=get_champion_id(input_dict[field]),
                 isBan="Ban" in field,
                 team="BLUE" if "Team1" in field else "RED",
             )
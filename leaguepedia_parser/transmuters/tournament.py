@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -24,17 +25,26 @@ class LeaguepediaTournament:
 
 
 def transmute_tournament(tournament: dict) -> LeaguepediaTournament:
+    """Transforms a Tournaments row into a LeaguepediaTournament.
+
+    Rows queried with a fields projection give a partially populated LeaguepediaTournament, where missing fields are
+    None.
+    """
     return LeaguepediaTournament(
-        name=tournament["Name"],
-        start=tournament["DateStart"],
-        end=tournament["Date"],
-        region=tournament["Region"],
-        league=tournament["League"],
-        leagueShort=tournament["League Short"],
-        rulebook=tournament["Rulebook"],
-        tournamentLevel=tournament["TournamentLevel"],
-        isQualifier=bool(tournament["IsQualifier"]),
-        isPlayoffs=bool(tournament["IsPlayoffs"]),
-        isOfficial=bool(tournament["IsOfficial"]),
-        overviewPage=tournament["OverviewPage"],
+        name=tournament.get("Name"),
+        start=tournament.get("DateStart"),
+        end=tournament.get("Date"),
+        region=tournament.get("Region"),
+        league=tournament.get("League"),
+        leagueShort=tournament.get("League Short"),
+        rulebook=tournament.get("Rulebook"),
+        tournamentLevel=tournament.get("TournamentLevel"),
+        isQualifier=_get_flag(tournament, "IsQualifier"),
+        isPlayoffs=_get_flag(tournament, "IsPlayoffs"),
+        isOfficial=_get_flag(tournament, "IsOfficial"),
+        overviewPage=tournament.get("OverviewPage"),
     )
+
+
+def _get_flag(tournament: dict, key: str) -> Optional[bool]:
+    return bool(tournament[key]) if key in tournament else None
@@ -0,0 +1,77 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Optional
+
+import lol_id_tools as lit
+import pytest
+
+from benchmarks.fixtures import champions as synthetic_champions
+from leaguepedia_parser.site.leaguepedia import leaguepedia
+from leaguepedia_parser.transmuters.champions import clear_champion_cache
+
+# Champions of the ten players of a game, shared with the synthetic wiki of the benchmarks
+champions = synthetic_champions[:10]
+
+
+def get_watermark(where: Optional[str]) -> str:
+    """Returns the watermark of a query of changed rows, like the ones of get_changed_rows_query(), or "" if absent."""
+    match = re.search(r">= '([^']*)'", where or "")
+
+    return match.group(1) if match else ""
+
+
+@pytest.fixture
+def fake_champion_ids(monkeypatch):
+    """Replaces lol_id_tools fuzzy matching with a lookup in champions, counting calls."""
+    calls = []
+
+    def get_id(name, **kwargs):
+        calls.append(name)
+        return champions.index(name) + 1
+
+    monkeypatch.setattr(lit, "get_id", get_id)
+    clear_champion_cache()
+
+    yield calls
+
+    clear_champion_cache()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def leaguepedia_recording():
+    """Records or replays live tests when LEAGUEPEDIA_RECORDING points to a directory of recorded responses.
+
+    LEAGUEPEDIA_RECORDING_MODE is "replay" by default, and "record" saves the responses of a run against the wiki.
+    """
+    path = os.environ.get("LEAGUEPEDIA_RECORDING")
+
+    if path:
+        leaguepedia.enable_recording(
+            path, mode=os.environ.get("LEAGUEPEDIA_RECORDING_MODE", "replay")
+        )
+
+    yield
+
+    leaguepedia.disable_recording()
+
+
+@pytest.fixture
+def run_with_hash_seed():
+    """Returns a function running Python code in a new interpreter with the given PYTHONHASHSEED, returning its output.
+
+    Sets and strings are ordered differently in each interpreter, which a single test process cannot notice.
+    """
+
+    def run(code: str, seed: int) -> str:
+        return subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    return run
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+from leaguepedia_parser import aio
+from leaguepedia_parser.parsers import async_game_parser, game_parser
+from leaguepedia_parser.site.cache import TTLCache
+
+regions = [{"Region": region} for region in ["China", "Europe", "Korea"]]
+
+# Rows of cargo tables other than Tournaments, keyed by the first queried table
+tables_rows = {
+    "ScoreboardPlayers": [
+        {"GameId": "1", "Link": "Faker"},
+        {"GameId": "1", "Link": "Unknown"},
+    ],
+    "PlayerRedirects": [{"Link": "Faker", "Country": "South Korea"}],
+}
+
+# Requests received by the fake API
+requests = []
+
+# Number of requests handled at the same time by the fake API, and its maximum
+concurrency = {"current": 0, "max": 0}
+
+
+async def fake_api(request):
+    """A local fake of the MediaWiki API, serving cargo queries and image info."""
+    data = await request.post()
+    requests.append(dict(data))
+
+    concurrency["current"] += 1
+    concurrency["max"] = max(concurrency["max"], concurrency["current"])
+
+    # Leaves time for identical requests to be coalesced
+    await asyncio.sleep(0.05)
+
+    concurrency["current"] -= 1
+
+    if data["action"] == "cargoquery":
+        offset, limit = int(data["offset"]), int(data["limit"])
+        rows = tables_rows.get(data["tables"].split(",")[0], regions)
+        rows = rows[offset : offset + limit]
+        return web.json_response({"cargoquery": [{"title": row} for row in rows]})
+
+    if data["action"] == "query":
+        pages = {
+            str(idx): {"title": title, "imageinfo": [{"url": f"https://{title}"}]}
+            for idx, title in enumerate(data["titles"].split("|"))
+        }
+        return web.json_response({"query": {"pages": pages}})
+
+    return web.json_response({"error": {"code": "unknown_action"}})
+
+
+def run_with_fake_api(coroutine_function):
+    async def run():
+        app = web.Application()
+        app.router.add_post("/api.php", fake_api)
+
+        async with test_utils.TestServer(app) as server:
+            url, limit = aio.async_leaguepedia.url, aio.async_leaguepedia.limit
+
+            # A small limit makes sure pagination is tested
+            aio.async_leaguepedia.url = str(server.make_url("/api.php"))
+            aio.async_leaguepedia.limit = 2
+
+            try:
+                return await coroutine_function()
+            finally:
+                await aio.async_leaguepedia.close()
+                aio.async_leaguepedia.url, aio.async_leaguepedia.limit = url, limit
+
+    return asyncio.run(run())
+
+
+def test_async_regions():
+    assert run_with_fake_api(aio.get_regions) == ["China", "Europe", "Korea"]
+
+
+def test_async_team_logo():
+    logo_url = run_with_fake_api(lambda: aio.get_team_logo("T1"))
+
+    assert logo_url == "https://File:T1logo square.png"
+
+
+def test_async_concurrent_queries():
+    async def get_many_regions():
+        return await asyncio.gather(*(aio.get_regions() for _ in range(20)))
+
+    requests.clear()
+
+    assert all(len(result) == 3 for result in run_with_fake_api(get_many_regions))
+
+    # The two pages of regions are only requested once
+    assert len(requests) == 2
+
+
+def test_async_max_concurrency():
+    async def get_many_logos():
+        await aio.get_regions()
+
+        # Resizing takes effect on the next requests, even once the session exists
+        aio.async_leaguepedia.max_concurrency = 2
+        concurrency["max"] = 0
+
+        try:
+            await asyncio.gather(
+                *(
+                    aio.async_leaguepedia.api("query", titles=f"File:{idx}.png")
+                    for idx in range(6)
+                )
+            )
+        finally:
+            aio.async_leaguepedia.max_concurrency = 8
+
+    run_with_fake_api(get_many_logos)
+
+    assert concurrency["max"] == 2
+
+
+def test_async_players_information_cache(monkeypatch):
+    monkeypatch.setattr(game_parser, "players_cache", TTLCache())
+
+    async def query_players_twice():
+        return [
+            await async_game_parser._query_players("ScoreboardPlayers.GameId = '1'")
+            for _ in range(2)
+        ]
+
+    requests.clear()
+
+    for players in run_with_fake_api(query_players_twice):
+        assert players[0]["Country"] == "South Korea"
+        assert "Country" not in players[1]
+
+    # Players information, including missing players, is only queried once and shared with the sync parser
+    assert [request["tables"] for request in requests].count(
+        "PlayerRedirects, Players"
+    ) == 1
+    assert game_parser.players_cache.get("unknown") == {}
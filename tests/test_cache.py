@@ -0,0 +1,189 @@
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from leaguepedia_parser.site.cache import QueryCache, TTLCache
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite
+
+query = {"tables": "Tournaments", "fields": "Name", "where": "Region='Korea'"}
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"))
+
+    assert cache.get(query) is None
+
+    cache.set(query, [{"Name": "LCK"}])
+
+    # Whitespace does not change the cache key
+    assert cache.get({**query, "where": "Region='Korea'  "}) == [{"Name": "LCK"}]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_persistence(tmp_path):
+    QueryCache(str(tmp_path / "cache.sqlite")).set(query, [{"Name": "LCK"}])
+
+    assert QueryCache(str(tmp_path / "cache.sqlite")).get(query) == [{"Name": "LCK"}]
+
+
+def test_cache_ttl(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"), table_ttls={"Tournaments": 0.01})
+    cache.set(query, [])
+
+    time.sleep(0.02)
+
+    assert cache.get(query) is None
+
+    # A TTL of None never expires
+    cache.set(query, [], ttl=None)
+
+    assert cache.get(query) == []
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"), max_size=300)
+
+    for region in ["Korea", "China", "Europe"]:
+        # Random names are not compressible, each entry takes more than 100 bytes
+        cache.set({**query, "where": region}, [{"Name": os.urandom(64).hex()}])
+        cache.get({**query, "where": "Korea"})
+
+    # Korea is the most recently used entry, China is evicted first
+    assert cache.get({**query, "where": "Korea"})
+    assert cache.get({**query, "where": "China"}) is None
+    assert cache.stats.evictions
+
+
+def test_site_uses_cache(tmp_path):
+    site = LeaguepediaSite()
+    site.enable_cache(str(tmp_path / "cache.sqlite"))
+
+    calls = []
+    site._query = lambda parallel, **kwargs: calls.append(kwargs) or [{"Name": "LCK"}]
+
+    assert site.query(**query) == site.query(**query) == [{"Name": "LCK"}]
+    assert len(calls) == 1
+
+
+def test_ttl_cache():
+    cache = TTLCache(ttl=0.01, max_entries=2)
+    calls = []
+
+    def get_logo():
+        calls.append(1)
+        return "logo_url"
+
+    assert cache.get_or_set(("logo", "T1"), get_logo) == "logo_url"
+    assert cache.get_or_set(("logo", "T1"), get_logo) == "logo_url"
+    assert len(calls) == 1
+    assert cache.stats.hit_rate == 0.5
+
+    time.sleep(0.02)
+
+    assert cache.get(("logo", "T1")) is None
+
+
+def test_ttl_cache_concurrent_misses():
+    cache = TTLCache()
+    calls = []
+
+    def get_long_name():
+        calls.append(1)
+        time.sleep(0.1)
+        return "Royal Never Give Up"
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(
+                lambda _: cache.get_or_set(("long_name", "rng", None), get_long_name),
+                range(8),
+            )
+        )
+
+    assert results == ["Royal Never Give Up"] * 8
+    assert len(calls) == 1
+
+
+def test_ttl_cache_eviction_and_invalidation():
+    cache = TTLCache(max_entries=2)
+
+    cache.set(("logo", "T1"), "T1")
+    cache.set(("logo", "G2"), "G2")
+    cache.get(("logo", "T1"))
+    cache.set(("logo", "DRX"), "DRX")
+
+    # G2 was the least recently used entry
+    assert cache.get(("logo", "G2")) is None
+    assert cache.stats.evictions == 1
+
+    cache.invalidate_where(lambda key: key[1] == "T1")
+
+    assert cache.get(("logo", "T1")) is None
+    assert len(cache) == 1
+
+
+def test_ttl_cache_persistence(tmp_path):
+    path = str(tmp_path / "cache.pickle")
+
+    cache = TTLCache(path=path)
+    cache.set(("long_name", "t1", None), "T1")
+    cache.flush()
+
+    assert TTLCache(path=path).get(("long_name", "t1", None)) == "T1"
+
+
+def test_ttl_cache_batched_writes(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.pickle")
+    cache = TTLCache(path=path, save_interval=60)
+    dumps = []
+    dump = pickle.dump
+    monkeypatch.setattr(
+        pickle, "dump", lambda entries, file: dumps.append(1) or dump(entries, file)
+    )
+
+    for i in range(100):
+        cache.set(("logo", str(i)), str(i))
+    cache.invalidate(("logo", "0"))
+
+    # Writes are only persisted once the interval has passed
+    assert not dumps
+    assert not os.path.exists(path)
+
+    cache.flush()
+    cache.flush()
+
+    assert len(dumps) == 1
+    assert len(TTLCache(path=path)) == 99
+
+    # Without an interval, each write is persisted
+    cache.save_interval = 0
+    cache.set(("logo", "0"), "0")
+
+    assert len(dumps) == 2
+
+
+def test_ttl_cache_flush_at_exit(tmp_path, run_with_hash_seed):
+    path = str(tmp_path / "cache.pickle")
+
+    run_with_hash_seed(
+        "from leaguepedia_parser.site.cache import TTLCache\n"
+        f"cache = TTLCache(path={path!r})\n"
+        "cache.set(('logo', 'G2'), 'G2')\n",
+        0,
+    )
+
+    assert TTLCache(path=path).get(("logo", "G2")) == "G2"
+
+
+def test_query_keys_across_processes(run_with_hash_seed):
+    code = (
+        "from leaguepedia_parser.parsers import game_parser\n"
+        "from leaguepedia_parser.site.cache import normalize_query\n"
+        "print(normalize_query(game_parser._get_games_query('LCK/2021 Season/Spring Season')))\n"
+        "print(normalize_query(game_parser._get_tournaments_query('Korea', 2021, 'Primary', None)))\n"
+    )
+
+    # Keys of cached queries must not change when the interpreter restarts
+    assert run_with_hash_seed(code, 1) == run_with_hash_seed(code, 2)
@@ -0,0 +1,67 @@
+import dataclasses
+import pickle
+
+import pytest
+from lol_dto.classes.game import LolGame, LolGamePlayer
+
+from leaguepedia_parser.transmuters.compact import to_compact, compact_game
+from leaguepedia_parser.transmuters.game_players import LeaguepediaPlayerIdentifier
+from leaguepedia_parser.transmuters.tournament import LeaguepediaTournament
+
+
+def get_tournament() -> LeaguepediaTournament:
+    # Strings are built at runtime to not be interned by the compiler
+    return LeaguepediaTournament(
+        name="".join(["LCK 2021", " Spring"]),
+        start="2021-01-13",
+        end="2021-04-10",
+        region="".join(["Ko", "rea"]),
+        league="LoL Champions Korea",
+        leagueShort="LCK",
+        rulebook=None,
+        tournamentLevel="Primary",
+        isQualifier=False,
+        isPlayoffs=False,
+        isOfficial=True,
+        overviewPage="LCK/2021 Season/Spring Season",
+    )
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_to_compact(frozen):
+    tournament = get_tournament()
+    compact = to_compact(tournament, frozen)
+
+    assert dataclasses.asdict(compact) == dataclasses.asdict(tournament)
+    assert not hasattr(compact, "__dict__")
+
+    # Repeated strings are shared between objects
+    assert compact.region is to_compact(get_tournament(), frozen).region
+
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+
+def test_frozen():
+    frozen = to_compact(get_tournament(), frozen=True)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.name = "LCK 2021 Summer"
+
+    assert len({frozen, to_compact(get_tournament(), frozen=True)}) == 1
+
+
+def test_compact_game():
+    game = LolGame()
+    game.teams.BLUE.players = [LolGamePlayer()]
+    setattr(
+        game.teams.BLUE.players[0].sources,
+        "leaguepedia",
+        LeaguepediaPlayerIdentifier(name="Faker"),
+    )
+
+    compact_game(game, frozen=True)
+
+    identifier = game.teams.BLUE.players[0].sources.leaguepedia
+
+    assert identifier.name == "Faker"
+    assert not hasattr(identifier, "__dict__")
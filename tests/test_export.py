@@ -0,0 +1,106 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import lol_id_tools as lit
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+
+import pyarrow.parquet
+
+from benchmarks import fixtures
+from leaguepedia_parser.parsers import export_parser
+from leaguepedia_parser.parsers.game_parser import _get_games_query
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite
+from leaguepedia_parser.transmuters.champions import clear_champion_cache
+from leaguepedia_parser.transmuters.columnar import transmute_games_table
+from tests.conftest import champions
+
+game_row = {
+    "GameId": "LCK/2020 Season/Spring Season_Week 1_1_1",
+    "MatchId": "LCK/2020 Season/Spring Season_Week 1_1",
+    "Tournament": "LCK 2020 Spring",
+    "OverviewPage": "LCK/2020 Season/Spring Season",
+    "N GameInMatch": "1",
+    "DateTime UTC": "2020-02-05 08:14:00",
+    "Gamelength Number": "32.5",
+    "Patch": "10.2",
+    "Winner": "2",
+    "Team1": "T1",
+    "Team2": "DRX",
+    "Team1Picks": ",".join(champions[:5]),
+    "Team2Picks": ",".join(champions[5:]),
+    "Team1Bans": ",".join(champions[5:]),
+    "Team2Bans": ",".join(champions[:5]),
+    "Team1Players": "Faker,Cuzz,Teddy,Effort,Canna",
+    "Team2Players": "Chovy,Pyosik,Deft,Keria,Doran",
+    **{
+        f"Team{idx}{field}": "1"
+        for idx in [1, 2]
+        for field in ["Score", "Towers", "Dragons", "Barons", "RiftHeralds"]
+    },
+    "Team1Inhibitors": "",
+    "Team2Inhibitors": "2",
+}
+
+
+def test_transmute_games_table(fake_champion_ids):
+    table = transmute_games_table([game_row, game_row])
+
+    assert table.num_rows == 2
+
+    game = table.to_pylist()[0]
+
+    assert game["start"].isoformat() == "2020-02-05T08:14:00+00:00"
+    assert game["duration"] == 1950
+    assert game["winner"] == "RED"
+    assert game["bluePicks"] == [1, 2, 3, 4, 5]
+    assert game["redBans"] == [1, 2, 3, 4, 5]
+    assert game["blueInhibitors"] == 0
+    assert game["redPlayers"][0] == "Chovy"
+
+
+@pytest.fixture
+def synthetic_champion_ids(monkeypatch):
+    """Resolves the champions of the synthetic wiki from their fixed IDs."""
+    monkeypatch.setattr(
+        lit, "get_id", lambda name, **kwargs: fixtures.champion_ids[name]
+    )
+    clear_champion_cache()
+
+    yield
+
+    clear_champion_cache()
+
+
+def test_write_games_parquet_workers(tmp_path, monkeypatch, synthetic_champion_ids):
+    site = LeaguepediaSite(limit=10)
+    monkeypatch.setattr(export_parser, "leaguepedia", site)
+
+    in_process_path = str(tmp_path / "in_process.parquet")
+    workers_path = str(tmp_path / "workers.parquet")
+
+    # Workers replay the pages recorded by the current process, along with the games count
+    fixtures.record_fixtures(
+        site,
+        str(tmp_path / "recording"),
+        25,
+        lambda: [
+            export_parser.write_games_parquet(in_process_path, fixtures.overview_page),
+            site._count(**_get_games_query(fixtures.overview_page)),
+        ],
+    )
+
+    # Forked workers inherit the fixture champion IDs
+    with ProcessPoolExecutor(
+        2, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        rows_count = export_parser.write_games_parquet(
+            workers_path, fixtures.overview_page, executor=executor
+        )
+
+    assert rows_count == 25
+    assert pyarrow.parquet.read_table(workers_path).equals(
+        pyarrow.parquet.read_table(in_process_path)
+    )
+    assert site._site is None
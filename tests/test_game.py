@@ -66,3 +66,49 @@ def test_get_details(tournament_name):
             assert hasattr(player.sources.leaguepedia, "birthday")
             assert player.sources.leaguepedia.pageId
             assert player.role
+
+
+@pytest.mark.parametrize("tournament_name", tournaments_names)
+def test_get_games_details(tournament_name):
+    games = leaguepedia_parser.get_games(tournament_name)
+
+    games = leaguepedia_parser.get_games_details(games, True)
+
+    for game in games:
+        assert game.picksBans
+
+        for team in game.teams:
+            assert len(team.players) == 5
+
+            for player in team.players:
+                assert player.sources.leaguepedia.pageId
+                assert player.role
+
+
+@pytest.mark.parametrize("region", regions_names)
+def test_iter_tournaments(region):
+    tournaments = list(leaguepedia_parser.iter_tournaments(region, year=2020))
+
+    assert tournaments == leaguepedia_parser.get_tournaments(region, year=2020)
+
+
+@pytest.mark.parametrize("tournament_name", tournaments_names)
+def test_iter_games(tournament_name):
+    games = list(leaguepedia_parser.iter_games(tournament_name))
+
+    assert games == leaguepedia_parser.get_games(tournament_name)
+
+
+@pytest.mark.parametrize("tournament_name", tournaments_names)
+def test_get_tournament_full(tournament_name):
+    games = leaguepedia_parser.get_tournament_full(tournament_name, True)
+
+    assert len(games) == len(leaguepedia_parser.get_games(tournament_name))
+
+    for game in games:
+        assert game.picksBans
+
+        for team in game.teams:
+            for player in team.players:
+                assert player.sources.leaguepedia.pageId
+                assert player.role
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import pytest
+
+import leaguepedia_parser
+from leaguepedia_parser.parsers import export_parser
+from leaguepedia_parser.transmuters import columnar
+
+
+def test_lazy_imports():
+    # A new interpreter is needed, as other tests already imported the heavy dependencies
+    modules = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, leaguepedia_parser; leaguepedia_parser.get_regions; print(' '.join(sys.modules))",
+        ],
+        text=True,
+    ).split()
+
+    for module in ["lol_dto", "lol_id_tools", "mwrogue", "mwclient", "requests"]:
+        assert module not in modules
+
+
+def test_public_names():
+    for name in leaguepedia_parser.__all__:
+        assert callable(getattr(leaguepedia_parser, name))
+
+    assert "get_games" in dir(leaguepedia_parser)
+
+
+def test_missing_optional_dependency(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_parser, "pyarrow", None)
+    monkeypatch.setattr(columnar, "pyarrow", None)
+
+    # Nothing is queried or written without pyarrow
+    with pytest.raises(ImportError, match="leaguepedia_parser\\[parquet\\]"):
+        export_parser.write_games_parquet(
+            str(tmp_path / "games.parquet"), "LCK/2021 Season/Spring Season"
+        )
+
+    assert not (tmp_path / "games.parquet").exists()
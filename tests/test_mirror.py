@@ -0,0 +1,245 @@
+import re
+import time
+from typing import Optional
+
+import requests
+
+from leaguepedia_parser.parsers.game_parser import (
+    _get_games_query,
+    _get_tournaments_query,
+    _in_condition,
+)
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite
+from leaguepedia_parser.transmuters.field_names import game_fields, tournaments_fields
+from tests.conftest import get_watermark
+
+overview_page = "LCK/2021 Season/Spring Season"
+
+# Rows of the fake wiki, with the _ID, _pageName and modification date of their page
+tables = {
+    "ScoreboardGames": [
+        {
+            **{field: None for field in sorted(game_fields)},
+            "_ID": idx + 1,
+            "_pageName": f"Data:{overview_page}/Week {idx // 2 + 1}",
+            "_modificationDate": f"2021-01-0{idx // 2 + 1} 00:00:00",
+            "GameId": f"{overview_page}_Week {idx // 2 + 1}_{idx % 2 + 1}",
+            "OverviewPage": overview_page,
+            "DateTime_UTC": f"2021-01-{10 - idx:02} 08:00:00",
+            "Gamelength_Number": str(25 + idx * 3),
+            "Team1": "T1",
+            "Team2": "Gen.G",
+        }
+        for idx in range(5)
+    ],
+    "Tournaments": [
+        {
+            **{field: None for field in sorted(tournaments_fields)},
+            "_ID": 1,
+            "_pageName": overview_page,
+            "_modificationDate": "2021-01-01 00:00:00",
+            "Name": "LCK 2021 Spring",
+            "Region": "Korea",
+            "League": "LoL Champions Korea",
+            "Year": "2021",
+            "OverviewPage": overview_page,
+        }
+    ],
+    "Leagues": [
+        {
+            "_ID": 1,
+            "_pageName": "LoL Champions Korea",
+            "_modificationDate": "2021-01-01 00:00:00",
+            "League": "LoL Champions Korea",
+            "League_Short": "LCK",
+        }
+    ],
+}
+
+fields_types = {"Gamelength_Number": "Float", "Year": "Integer"}
+
+
+class FakeWikiCargoClient:
+    """Answers the keyset and modification date queries of the mirror from tables."""
+
+    def __init__(self):
+        self.tables = {
+            table: [dict(row) for row in rows] for table, rows in tables.items()
+        }
+        self.calls = []
+
+    def query(self, tables, fields, limit, offset=0, where="", **kwargs):
+        self.calls.append(dict(tables=tables, where=where))
+        rows = self.tables[tables.split(",")[0]]
+
+        if "_ID >" in where:
+            last_id = int(re.search(r"_ID > (\d+)", where).group(1))
+            rows = [row for row in rows if row["_ID"] > last_id]
+        else:
+            watermark = get_watermark(where)
+            rows = [row for row in rows if row["_modificationDate"] >= watermark]
+
+        return [
+            {
+                alias: self.get_value(row, field.split(".")[-1])
+                for field, alias in (field.split("=") for field in fields.split(", "))
+            }
+            for row in sorted(rows, key=lambda row: row["_ID"])
+        ][offset : offset + limit]
+
+    @staticmethod
+    def get_value(row: dict, field: str) -> Optional[str]:
+        # Each page holds a single row of Tournaments and Leagues, and page IDs are not tested
+        value = row["_ID"] if field == "_pageID" else row[field]
+
+        return None if value is None else str(value)
+
+    def get_fields(self, table):
+        return {
+            field: {"type": fields_types.get(field, "String")}
+            for field in self.tables[table][0]
+            if field not in ("_ID", "_pageName", "_modificationDate")
+        }
+
+
+def get_mirror_site(tmp_path, **kwargs) -> LeaguepediaSite:
+    cargo_client = FakeWikiCargoClient()
+
+    site = LeaguepediaSite(limit=2)
+    site._site = type(
+        "FakeSite",
+        (),
+        {
+            "cargo_client": cargo_client,
+            "client": type(
+                "FakeClient",
+                (),
+                {
+                    "connection": requests.Session(),
+                    "api": staticmethod(
+                        lambda action, table: {
+                            "cargofields": cargo_client.get_fields(table)
+                        }
+                    ),
+                },
+            ),
+        },
+    )
+    site.enable_mirror(
+        str(tmp_path / "mirror.sqlite"),
+        background=False,
+        tables=list(tables),
+        **kwargs,
+    )
+
+    return site
+
+
+def test_mirror_query(tmp_path):
+    site = get_mirror_site(tmp_path)
+
+    # Tables are paged by _ID, two rows at a time
+    assert site.mirror.refresh() == 7
+
+    calls = len(site.site.cargo_client.calls)
+
+    games = site.query(**_get_games_query(overview_page))
+
+    assert [game["DateTime UTC"] for game in games] == sorted(
+        row["DateTime_UTC"] for row in tables["ScoreboardGames"]
+    )
+    assert games[0]["Gamelength Number"] == "37"
+
+    tournaments = site.query(**_get_tournaments_query("Korea", 2021, None, None))
+
+    assert tournaments[0]["League Short"] == "LCK"
+    assert tournaments[0]["Name"] == "LCK 2021 Spring"
+
+    # Numbers are compared as numbers, strings case-insensitively, and both kinds of quotes are string literals
+    assert site.query(
+        tables="ScoreboardGames=SG",
+        fields="SG.OverviewPage, COUNT(*)=count",
+        where=f'SG.Gamelength_Number > 30 AND SG.OverviewPage = "{overview_page.lower()}"',
+        group_by="SG.OverviewPage",
+    ) == [{"OverviewPage": overview_page, "count": "3"}]
+
+    game_ids = [game["GameId"] for game in games[:2]]
+
+    assert [
+        row["GameId"]
+        for row in site.query(
+            tables="ScoreboardGames",
+            fields="ScoreboardGames.GameId=GameId",
+            where=_in_condition(
+                "ScoreboardGames.GameId", game_ids + ['Quoted "Game", \\ Id']
+            ),
+        )
+    ] == game_ids[::-1]
+
+    assert len(site.site.cargo_client.calls) == calls
+
+    site.disable_mirror()
+
+
+def test_mirror_fallback(tmp_path):
+    site = get_mirror_site(tmp_path)
+
+    # Nothing is answered before tables are downloaded
+    assert site.mirror.query(**_get_games_query(overview_page)) is None
+
+    site.mirror.refresh()
+
+    assert site.mirror.query(tables="Champions", fields="Name") is None
+    assert (
+        site.mirror.query(
+            tables="ScoreboardGames",
+            fields="GameId",
+            where="ScoreboardGames.Team1Players HOLDS 'Faker'",
+        )
+        is None
+    )
+    assert site.mirror.query(tables="ScoreboardGames", fields="CONCAT(GameId)") is None
+
+    site.disable_mirror()
+
+
+def test_mirror_incremental_refresh(tmp_path):
+    site = get_mirror_site(tmp_path)
+    site.mirror.refresh()
+
+    cargo_client = site.site.cargo_client
+    games = cargo_client.tables["ScoreboardGames"]
+
+    # Saving a page replaces its rows by new ones, here removing a game from week 2 and editing the one of week 3
+    games.remove(games[3])
+    games[2].update(_ID=6, _modificationDate="2021-02-01 00:00:00")
+    games[3].update(_ID=7, _modificationDate="2021-02-01 00:00:00", Team1="DRX")
+
+    # Download watermarks are an hour before the download, so we move them back for the test
+    with site.mirror._lock:
+        for table in tables:
+            site.mirror._metadata.set(f"{table}.watermark", "2021-01-03 00:00:00")
+
+    assert site.mirror.refresh() == 2
+
+    games = site.query(**_get_games_query(overview_page))
+
+    assert len(games) == 4
+    assert [game["Team1"] for game in games].count("DRX") == 1
+
+    site.disable_mirror()
+
+
+def test_mirror_background_refresh(tmp_path):
+    site = get_mirror_site(tmp_path, refresh_interval=3600)
+    site.mirror.start()
+
+    for _ in range(100):
+        if all(site.mirror.is_downloaded(table) for table in tables):
+            break
+
+        time.sleep(0.01)
+
+    assert len(site.query(**_get_games_query(overview_page))) == 5
+
+    site.disable_mirror()
@@ -0,0 +1,84 @@
+import pytest
+
+from leaguepedia_parser.site.players_snapshot import PlayersSnapshot
+from tests.conftest import get_watermark
+
+
+class FakeSite:
+    """Fakes the Players and PlayerRedirects tables filtered on the modification date watermark."""
+
+    def __init__(self):
+        self.tables = {"Players": [], "PlayerRedirects": []}
+        self.queries = 0
+
+    def query(self, tables, cache_ttl, where=None, **kwargs):
+        assert cache_ttl == 0
+        self.queries += 1
+
+        watermark = get_watermark(where)
+        table = tables.split(",")[0]
+
+        return [row for row in self.tables[table] if row["watermark"] >= watermark]
+
+    def add_player(self, page, name, country, watermark, redirects=()):
+        self.tables["Players"].append(
+            {
+                "OverviewPage": page,
+                "pageName": page,
+                "irlName": name,
+                "Country": country,
+                "Birthdate": None,
+                "currentGameName": page,
+                "pageId": "1",
+                "watermark": watermark,
+            }
+        )
+
+        for all_name in (page,) + tuple(redirects):
+            self.tables["PlayerRedirects"].append(
+                {
+                    "AllName": all_name,
+                    "OverviewPage": page,
+                    "pageName": page,
+                    "watermark": watermark,
+                }
+            )
+
+
+@pytest.fixture
+def site():
+    return FakeSite()
+
+
+def test_players_snapshot(site):
+    snapshot = PlayersSnapshot(site, ":memory:")
+
+    site.add_player(
+        "Faker", "Lee Sang-hyeok", "South Korea", "2021-01-01", ["Hide on bush"]
+    )
+    site.add_player("Caps", "Rasmus Winther", "Denmark", "2021-01-02")
+
+    assert snapshot.refresh() == 2
+
+    players = snapshot.get_players(["hide on bush", "Caps", "Unknown"])
+
+    assert players["hide on bush"]["irlName"] == "Lee Sang-hyeok"
+    assert players["Caps"]["Country"] == "Denmark"
+    assert "Unknown" not in players
+
+    # Only modified pages are downloaded again
+    site.tables["Players"][1].update(Country="Denmark (EU)", watermark="2021-01-03")
+    site.tables["PlayerRedirects"][2]["watermark"] = "2021-01-03"
+
+    assert snapshot.refresh() == 1
+    assert snapshot.get_players(["Caps"])["Caps"]["Country"] == "Denmark (EU)"
+
+
+def test_players_snapshot_refresh_if_stale(site):
+    snapshot = PlayersSnapshot(site, ":memory:", refresh_interval=None)
+
+    snapshot.refresh_if_stale()
+    snapshot.refresh_if_stale()
+
+    # The first refresh queries both tables, and the snapshot then never expires
+    assert site.queries == 2
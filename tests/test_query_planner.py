@@ -0,0 +1,172 @@
+import pytest
+
+from leaguepedia_parser.parsers import game_parser
+from leaguepedia_parser.site.cache import TTLCache
+
+
+@pytest.mark.parametrize(
+    "where, tables",
+    [
+        ("PicksAndBansS7.GameId = 'LCK/2021.1_1'", "PicksAndBansS7"),
+        (
+            "ScoreboardGames.OverviewPage = 'LCK/2021 Season/Spring Season'",
+            "PicksAndBansS7, ScoreboardGames",
+        ),
+    ],
+)
+def test_plan_query_tables(where, tables):
+    assert game_parser._get_picks_bans_query(where)["tables"] == tables
+
+
+def test_in_condition_quotes():
+    where = game_parser._in_condition(
+        "PlayerRedirects.AllName", ["Faker", "Lil' Kid", 'The "Wall"', "Back\\slash"]
+    )
+
+    assert where == (
+        'PlayerRedirects.AllName IN ("Faker", "Lil\' Kid", "The ""Wall""", "Back\\\\slash")'
+    )
+
+    # Escaped quotes do not end the values, which are never mistaken for tables
+    query = game_parser._plan_query(
+        ["PlayerRedirects.AllName=Link"],
+        where=game_parser._in_condition("PlayerRedirects.AllName", ['"Players.ID']),
+    )
+
+    assert query["tables"] == "PlayerRedirects"
+
+
+def test_plan_query_join_path():
+    query = game_parser._plan_query(
+        ["ScoreboardPlayers.Link", "Players.Country"], where="Players.Country = 'FR'"
+    )
+
+    assert query["tables"] == "ScoreboardPlayers, PlayerRedirects, Players"
+    assert query["join_on"] == (
+        "ScoreboardPlayers.Link = PlayerRedirects.AllName, "
+        "PlayerRedirects.OverviewPage = Players.OverviewPage"
+    )
+
+
+def test_players_information_cache(monkeypatch):
+    queries = []
+
+    def query(where, **kwargs):
+        queries.append(where)
+
+        if "PlayerRedirects" in kwargs["tables"]:
+            return [{"Link": "Faker", "Country": "South Korea"}]
+
+        return [
+            {"GameId": "1", "Link": "Faker"},
+            {"GameId": "1", "Link": "Unknown"},
+        ]
+
+    monkeypatch.setattr(game_parser.leaguepedia, "query", query)
+    monkeypatch.setattr(game_parser, "players_cache", TTLCache())
+
+    for _ in range(2):
+        players = game_parser._query_players("ScoreboardPlayers.GameId = '1'")
+
+        assert players[0]["Country"] == "South Korea"
+        assert "Country" not in players[1]
+
+    # Players information, including missing players, is only queried once
+    assert len(queries) == 3
+
+
+@pytest.fixture
+def fake_query(monkeypatch):
+    """Answers cargo queries with a single row holding the name of each requested field, recording queries."""
+    queries = []
+
+    def query(tables, fields, **kwargs):
+        queries.append(dict(tables=tables, fields=fields, **kwargs))
+
+        return [
+            {
+                field.split(".")[-1].replace("_", " "): field.split(".")[-1]
+                for field in fields.split(", ")
+            }
+        ]
+
+    monkeypatch.setattr(game_parser.leaguepedia, "query", query)
+    monkeypatch.setattr(
+        game_parser.leaguepedia, "query_pages", lambda **kwargs: [query(**kwargs)]
+    )
+
+    return queries
+
+
+def test_get_games_projection(fake_query):
+    games = game_parser.get_games(
+        "LCK/2021 Season/Spring Season", fields=["Team1", "Team2"], cache_ttl=0
+    )
+
+    # GameId is always queried, and only some of the game fields are set
+    assert fake_query[0]["fields"] == "GameId, Team1, Team2"
+    assert fake_query[0]["cache_ttl"] == 0
+    assert games[0].sources.leaguepedia.gameId == "GameId"
+    assert games[0].teams.RED.sources.leaguepedia.name == "Team2"
+    assert games[0].start is None
+
+    rows = list(
+        game_parser.iter_games(
+            "LCK/2021 Season/Spring Season",
+            fields=["DateTime_UTC", "GameId", "DateTime_UTC"],
+            as_tuples=True,
+        )
+    )
+
+    assert rows == [("DateTime_UTC", "GameId")]
+    assert rows[0].DateTime_UTC == "DateTime_UTC"
+
+    with pytest.raises(ValueError):
+        game_parser.get_games("LCK/2021 Season/Spring Season", fields=["Kills"])
+
+
+@pytest.mark.parametrize(
+    "fields, tables",
+    [
+        (["Name"], "Tournaments"),
+        (["Name", "League_Short"], "Tournaments, Leagues"),
+    ],
+)
+def test_get_tournaments_projection(fake_query, fields, tables):
+    tournaments = game_parser.get_tournaments("Korea", 2021, fields=fields)
+
+    # Leagues are only joined for their short name
+    assert fake_query[0]["tables"] == tables
+    assert tournaments[0].overviewPage == "OverviewPage"
+    assert tournaments[0].name == "Name"
+    assert tournaments[0].region is None
+    assert tournaments[0].isPlayoffs is None
+
+    row = game_parser.get_tournaments(fields=fields, as_tuples=True)[0]
+
+    assert row._fields == ("OverviewPage", *fields)
+
+
+def test_get_games_details_duplicates(monkeypatch):
+    queries = []
+
+    def query(where, **kwargs):
+        queries.append(where)
+        return [{"GameId": "1", "Link": None}]
+
+    monkeypatch.setattr(game_parser.leaguepedia, "query", query)
+    monkeypatch.setattr(game_parser, "players_cache", TTLCache())
+    monkeypatch.setattr(game_parser, "transmute_picks_bans", lambda row: [row])
+    monkeypatch.setattr(
+        game_parser,
+        "add_players",
+        lambda game, rows, **kwargs: setattr(game, "vod", rows),
+    )
+
+    games = [game_parser.transmute_game({"GameId": "1"}) for _ in range(2)]
+
+    # Games sharing a GameId all get details, from a single query of each kind
+    assert game_parser.get_games_details(games) is games
+    assert all(game.picksBans == [{"GameId": "1", "Link": None}] for game in games)
+    assert all(game.vod == [{"GameId": "1", "Link": None}] for game in games)
+    assert queries[0] == 'PicksAndBansS7.GameId IN ("1")'
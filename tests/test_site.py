@@ -0,0 +1,352 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from leaguepedia_parser.parsers import team_parser
+from leaguepedia_parser.site.cache import TTLCache
+from leaguepedia_parser.site.instrumentation import StatsAggregator, LatencyHistogram
+from leaguepedia_parser.site.leaguepedia import LeaguepediaSite
+from leaguepedia_parser.site.singleflight import Singleflight, AsyncSingleflight
+
+
+class FakeCargoClient:
+    """Returns rows_count numbered rows, respecting limit and offset."""
+
+    def __init__(self, rows_count, latency=0):
+        self.rows = [{"Row": str(i)} for i in range(rows_count)]
+        self.calls = []
+        self.latency = latency
+
+    def query(self, limit, offset=0, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.latency)
+
+        if kwargs["fields"] == "COUNT(*)=count":
+            return [{"count": str(len(self.rows))}]
+
+        return self.rows[offset : offset + limit]
+
+
+def get_fake_site(rows_count, latency=0, **kwargs) -> LeaguepediaSite:
+    site = LeaguepediaSite(limit=10, **kwargs)
+    site._site = type(
+        "FakeSite",
+        (),
+        {
+            "cargo_client": FakeCargoClient(rows_count, latency),
+            "client": type("FakeClient", (), {"connection": requests.Session()}),
+        },
+    )
+
+    return site
+
+
+@pytest.mark.parametrize("rows_count", [0, 5, 10, 20, 25])
+@pytest.mark.parametrize("parallel", [False, True])
+@pytest.mark.parametrize("group_by", [None, "Row"])
+def test_query_pagination(rows_count, parallel, group_by):
+    site = get_fake_site(rows_count)
+
+    result = site.query(
+        tables="Table", fields="Row", group_by=group_by, parallel=parallel
+    )
+
+    assert [row["Row"] for row in result] == [str(i) for i in range(rows_count)]
+
+
+def test_query_parallel_requests_count():
+    site = get_fake_site(30)
+
+    site.query(tables="Table", fields="Row", parallel=True)
+
+    # First page, count, and the two remaining pages without any empty page
+    assert len(site.site.cargo_client.calls) == 4
+
+
+@pytest.mark.parametrize("rows_count", [0, 5, 10, 25])
+def test_query_pages(rows_count):
+    site = get_fake_site(rows_count)
+
+    pages = list(site.query_pages(tables="Table", fields="Row"))
+
+    assert [len(page) for page in pages] == [
+        min(10, rows_count - offset) for offset in range(0, rows_count or 1, 10)
+    ]
+
+
+@pytest.mark.parametrize("rows_count", [0, 25])
+def test_query_pages_cache(tmp_path, rows_count):
+    site = get_fake_site(rows_count)
+    site.enable_cache(str(tmp_path / "cache.sqlite"))
+
+    pages = list(site.query_pages(tables="Table", fields="Row"))
+
+    # Cached results are yielded with the same pages
+    assert list(site.query_pages(tables="Table", fields="Row")) == pages
+    assert site.query(tables="Table", fields="Row") == [
+        row for page in pages for row in page
+    ]
+    assert len(site.site.cargo_client.calls) == max(1, -(-rows_count // 10))
+
+
+def test_shared_executor():
+    site = get_fake_site(0, max_workers=2)
+
+    assert site.executor is site.executor
+    assert site.executor._max_workers == 2
+
+    site.max_workers = 3
+
+    assert site.executor._max_workers == 3
+
+    site.shutdown()
+
+
+def test_parallel_query_in_executor_thread():
+    # A single worker would deadlock if the query waited on pages submitted to its own executor
+    site = get_fake_site(25, max_workers=1)
+
+    result = site.executor.submit(
+        site.query, tables="Table", fields="Row", parallel=True
+    ).result(timeout=5)
+
+    assert len(result) == 25
+
+    site.shutdown()
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_concurrent_queries_coalescing(parallel):
+    site = get_fake_site(5, latency=0.1)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(
+                lambda _: site.query(tables="Table", fields="Row", parallel=parallel),
+                range(8),
+            )
+        )
+
+    assert len(site.site.cargo_client.calls) == 1
+    assert all(result == results[0] for result in results)
+
+    # Callers sharing a result get their own rows
+    results[0][0]["Row"] = "modified"
+    assert results[1][0]["Row"] == "0"
+
+    site.shutdown()
+
+
+def test_singleflight():
+    singleflight = Singleflight()
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(singleflight.do, "key", fail) for _ in range(4)]
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+
+    # A call waiting on itself runs without coalescing instead of deadlocking
+    assert singleflight.do("key", lambda: singleflight.do("key", lambda: 1)) == (
+        (1, False),
+        False,
+    )
+
+
+def test_async_singleflight_cancellation():
+    singleflight = AsyncSingleflight()
+    calls = []
+
+    async def fetch():
+        calls.append(asyncio.current_task())
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(singleflight.do("key", fetch))
+        follower = asyncio.ensure_future(singleflight.do("key", fetch))
+        await asyncio.sleep(0.01)
+
+        # Cancelling the caller who started the call does not cancel the others
+        leader.cancel()
+        assert await follower == ("result", True)
+        assert leader.cancelled()
+
+        # The call itself is cancelled once all its callers are
+        callers = [
+            asyncio.ensure_future(singleflight.do("other", fetch)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        for caller in callers:
+            caller.cancel()
+
+        await asyncio.sleep(0.01)
+
+        return calls[-1].cancelled()
+
+    assert asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_retry_on_throttling(monkeypatch):
+    monkeypatch.setattr(
+        "leaguepedia_parser.site.leaguepedia.get_backoff", lambda *args: 0
+    )
+    site = get_fake_site(5)
+
+    responses = [requests.Response() for _ in range(2)]
+    responses[0].status_code, responses[1].status_code = 429, 503
+    errors = [requests.HTTPError(response=response) for response in responses]
+
+    query_page = site.site.cargo_client.query
+
+    def flaky_query(**kwargs):
+        if errors:
+            raise errors.pop(0)
+        return query_page(**kwargs)
+
+    site.site.cargo_client.query = flaky_query
+
+    assert len(site.query(tables="Table", fields="Row")) == 5
+    assert site.stats.throttled == 1
+    assert site.stats.retried == 2
+    assert site.stats.requests == 3
+
+
+def test_no_retry_on_client_error():
+    site = get_fake_site(5)
+    site.site.cargo_client.query = lambda **kwargs: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        site.query(tables="Table", fields="Row")
+
+    assert site.stats.failed == 1
+
+
+def test_rate_limit():
+    site = get_fake_site(5, requests_per_second=100)
+
+    start = time.monotonic()
+
+    for _ in range(11):
+        site.query(tables="Table", fields="Row")
+
+    # The first request uses the initial token, the 10 others wait for 10ms each
+    assert time.monotonic() - start >= 0.1
+
+
+def test_recording(tmp_path):
+    site = get_fake_site(25)
+    site.enable_recording(str(tmp_path), mode="record")
+
+    recorded = site.query(tables="Table", fields="Row", parallel=True)
+
+    # Replays never reach the wiki, whatever the order of requests
+    replay_site = LeaguepediaSite(limit=10)
+    replay_site.enable_recording(str(tmp_path), mode="replay", latency=0.01)
+
+    assert replay_site.query(tables="Table", fields="Row", parallel=True) == recorded
+    assert replay_site._site is None
+
+    with pytest.raises(KeyError):
+        replay_site.query(tables="Table", fields="Other")
+
+
+def test_recording_team_lookups(tmp_path, monkeypatch):
+    lookup_halves = {
+        "include_match=^[a-s].*": {
+            "ig": {"link": "Invictus Gaming", "short": "IG"},
+            "invictus": "ig",
+        },
+        "exclude_match=^[a-s].*": {"tsm": {"link": "TSM", "short": "TSM"}},
+    }
+
+    def api(action, **kwargs):
+        if action == "expandtemplates":
+            mask = kwargs["text"][len("{{JsonEncode|Team|") : -len("}}")]
+            return {"expandtemplates": {"wikitext": json.dumps(lookup_halves[mask])}}
+
+        return {"query": {"pages": {"1": {"title": "LCS/2021 Season/Summer Season"}}}}
+
+    site = get_fake_site(0)
+    site.site.client.api = api
+    site.site.cargo_client.rows = [{"Team": "TSM", "Short": ""}]
+    site.enable_recording(str(tmp_path), mode="record")
+
+    def get_team_names():
+        monkeypatch.setattr(team_parser, "team_cache", TTLCache())
+
+        return [
+            team_parser.get_long_team_name_from_trigram("invictus"),
+            team_parser.get_long_team_name_from_trigram("TSM", "LCS 2021 Summer"),
+        ]
+
+    monkeypatch.setattr(team_parser, "leaguepedia", site)
+    recorded = get_team_names()
+
+    replay_site = LeaguepediaSite(limit=10)
+    replay_site.enable_recording(str(tmp_path), mode="replay")
+    monkeypatch.setattr(team_parser, "leaguepedia", replay_site)
+
+    # Team names lookups are replayed like any other request, without loading the site
+    assert get_team_names() == recorded == ["Invictus Gaming", "TSM"]
+    assert replay_site._site is None
+
+
+def test_recording_across_processes(tmp_path, run_with_hash_seed):
+    code = (
+        "from leaguepedia_parser.parsers import game_parser\n"
+        "from tests.test_site import get_fake_site\n"
+        "site = get_fake_site(25)\n"
+        f"site.enable_recording({str(tmp_path)!r}, mode='{{mode}}')\n"
+        "print(site.query(**game_parser._get_games_query('LCK/2021 Season/Spring Season')))\n"
+        "print(site.query(**game_parser._get_tournaments_query('Korea', 2021, 'Primary', None)))\n"
+    )
+
+    recorded = run_with_hash_seed(code.format(mode="record"), 1)
+
+    # Replays in an interpreter ordering sets differently find the same recorded responses
+    assert run_with_hash_seed(code.format(mode="replay"), 2) == recorded
+
+
+def test_request_hooks():
+    site = get_fake_site(25)
+    stats = StatsAggregator()
+    events = []
+
+    site.add_request_hook(pre=lambda event: events.append(event.rows), post=stats)
+    site.query(tables="Table=T, Other", fields="Row")
+
+    # A failing hook is logged without failing the request
+    site.add_request_hook(post=lambda event: 1 / 0)
+    site.query(tables="Table", fields="Row", cache_ttl=0)
+
+    # Pre-request hooks are called before rows are known
+    assert events == [None] * 6
+
+    summary = {row["tables"]: row for row in stats.summary()}
+
+    assert summary["Table, Other"]["requests"] == 3
+    assert summary["Table, Other"]["rows"] == 25
+    assert summary["Table, Other"]["bytes"] > 0
+    assert summary["Table"]["p99"] >= summary["Table"]["p50"]
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+
+    for latency in range(1, 101):
+        histogram.add(latency / 100)
+
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.2)
+    assert histogram.percentile(100) == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from leaguepedia_parser.parsers import sync_parser
+from leaguepedia_parser.parsers.sync_parser import GamesSynchronizer
+from tests.conftest import get_watermark
+
+
+@pytest.fixture
+def fake_games(monkeypatch):
+    """Fakes a ScoreboardGames table filtered on the watermark, without transmuting rows."""
+    games = []
+
+    def query(where, cache_ttl, **kwargs):
+        assert cache_ttl == 0
+        watermark = get_watermark(where)
+        return [game for game in games if game["watermark"] >= watermark]
+
+    monkeypatch.setattr(sync_parser.leaguepedia, "query", query)
+    monkeypatch.setattr(sync_parser, "transmute_game", lambda row: row["GameId"])
+
+    return games
+
+
+def test_sync_games(fake_games, tmp_path):
+    state_path = str(tmp_path / "state.json")
+    synchronizer = GamesSynchronizer(state_path)
+
+    fake_games.extend(
+        [
+            {"GameId": "1", "watermark": "2021-01-01"},
+            {"GameId": "2", "watermark": "2021-01-01"},
+        ]
+    )
+
+    assert synchronizer.sync_games("LCK").inserted == ["1", "2"]
+
+    # Nothing changed since the last sync
+    assert not synchronizer.sync_games("LCK")
+
+    fake_games[0]["watermark"] = "2021-01-02"
+    fake_games.append({"GameId": "3", "watermark": "2021-01-02"})
+
+    # The watermark is persisted across restarts
+    changeset = GamesSynchronizer(state_path).sync_games("LCK")
+
+    assert changeset.inserted == ["3"]
+    assert changeset.updated == ["1"]
+
+
+def test_sync_query_across_processes(run_with_hash_seed):
+    code = (
+        "from leaguepedia_parser.parsers.sync_parser import GamesSynchronizer\n"
+        "from leaguepedia_parser.site.cache import normalize_query\n"
+        "query = GamesSynchronizer()._get_changed_games_query('LCK', '2021-01-01')\n"
+        "print(normalize_query(query))\n"
+    )
+
+    # Sync queries keep the same cache and recording keys when the interpreter restarts
+    assert run_with_hash_seed(code, 1) == run_with_hash_seed(code, 2)
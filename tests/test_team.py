@@ -1,5 +1,9 @@
+import json
+
 import pytest
 import leaguepedia_parser
+from leaguepedia_parser.parsers import team_parser
+from leaguepedia_parser.site.cache import TTLCache
 
 
 @pytest.mark.parametrize("team_tuple", [("tsm", "TSM"), ("IG", "Invictus Gaming")])
@@ -44,3 +48,62 @@ def test_get_all_team_assets(team_name):
     assert assets.thumbnail_url
     assert assets.logo_url
     assert assets.long_name
+
+
+def test_get_team_assets_bulk():
+    assets = leaguepedia_parser.get_team_assets_bulk(["T1", "G2 Esports"])
+
+    assert assets["T1"] == leaguepedia_parser.get_all_team_assets("T1")
+    assert assets["G2 Esports"].logo_url
+    assert assets["G2 Esports"].thumbnail_url
+
+
+@pytest.fixture
+def fake_images_api(monkeypatch):
+    """Answers MediaWiki requests offline, T1 only having a logo, and counts images queries."""
+    calls = []
+
+    def api(action, **kwargs):
+        if action == "expandtemplates":
+            return {"expandtemplates": {"wikitext": json.dumps({})}}
+
+        calls.append(kwargs["titles"])
+
+        return {
+            "query": {
+                "pages": {
+                    "1": {
+                        "title": "File:T1logo square.png",
+                        "imageinfo": [{"url": "https://t1.png"}],
+                    },
+                    "-1": {"title": "File:T1logo std.png", "missing": ""},
+                }
+            }
+        }
+
+    monkeypatch.setattr(team_parser.leaguepedia, "api", api)
+    monkeypatch.setattr(team_parser, "team_cache", TTLCache())
+
+    return calls
+
+
+def test_get_all_team_assets_missing_file(fake_images_api):
+    assets = leaguepedia_parser.get_team_assets_bulk(["T1"])
+
+    assert assets["T1"].logo_url == "https://t1.png"
+    assert assets["T1"].thumbnail_url is None
+
+    # Single team lookups raise on missing files
+    with pytest.raises(KeyError):
+        leaguepedia_parser.get_all_team_assets("T1")
+
+
+def test_get_team_assets_bulk_copies(fake_images_api):
+    assets = leaguepedia_parser.get_team_assets_bulk(["T1"])
+    assets["T1"].logo_url = "modified"
+
+    # The cached assets are not modified
+    assets = leaguepedia_parser.get_team_assets_bulk(["T1"])
+
+    assert assets["T1"].logo_url == "https://t1.png"
+    assert len(fake_images_api) == 1
@@ -0,0 +1,155 @@
+from lol_dto.classes.game import LolGame, LolGamePlayer
+
+from leaguepedia_parser.transmuters.champions import (
+    get_champion_id,
+    warm_champion_cache,
+)
+from leaguepedia_parser.transmuters.columnar import transmute_games_columns
+from leaguepedia_parser.transmuters.game import transmute_game
+from leaguepedia_parser.transmuters.game_players import add_players
+from tests.conftest import champions
+
+
+def test_champion_cache(fake_champion_ids):
+    warm_champion_cache(champions)
+
+    assert [get_champion_id(name) for name in champions * 2] == list(range(1, 11)) * 2
+    assert fake_champion_ids == champions
+
+
+def get_game(champion_ids):
+    game = LolGame()
+
+    for team, team_champion_ids in zip(
+        game.teams, [champion_ids[:5], champion_ids[5:]]
+    ):
+        team.players = [
+            LolGamePlayer(championId=champion_id) for champion_id in team_champion_ids
+        ]
+
+    return game
+
+
+def get_players_rows():
+    return [
+        {
+            "Side": "1" if idx < 5 else "2",
+            "Champion": champion,
+            "gameRoleNumber": str(idx % 5 + 1),
+            "currentGameName": f"Player {idx}",
+            "pageId": str(idx),
+        }
+        for idx, champion in enumerate(champions)
+    ]
+
+
+def test_add_players(fake_champion_ids):
+    # Players are swapped on the red side to make sure they are matched on their champion
+    game = get_game([1, 2, 3, 4, 5, 7, 6, 8, 9, 10])
+
+    add_players(game, get_players_rows(), add_page_id=True)
+
+    assert [player.role for player in game.teams.RED.players] == [
+        "JGL",
+        "TOP",
+        "MID",
+        "BOT",
+        "SUP",
+    ]
+    assert game.teams.RED.players[0].sources.leaguepedia.name == "Player 6"
+    assert game.teams.BLUE.players[4].sources.leaguepedia.pageId == 4
+
+    # Each champion name is resolved once
+    assert len(fake_champion_ids) == 10
+
+
+def test_add_players_missing_champion(fake_champion_ids):
+    game = get_game([1, None, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    add_players(game, get_players_rows())
+
+    # The player without champion is matched on their role
+    assert game.teams.BLUE.players[1].sources.leaguepedia.name == "Player 1"
+
+
+def test_add_players_snapshot(fake_champion_ids):
+    class FakeSnapshot:
+        def get_players(self, links):
+            return {link: {"irlName": f"IRL {link}"} for link in links}
+
+    game = get_game([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+    players = [
+        dict(player, Link=player["currentGameName"]) for player in get_players_rows()
+    ]
+
+    add_players(game, players, players_snapshot=FakeSnapshot())
+
+    assert game.teams.BLUE.players[0].sources.leaguepedia.irlName == "IRL Player 0"
+
+
+def get_games_rows(count):
+    """Returns ScoreboardGames rows with default aliases, each one with a different game length."""
+    return [
+        {
+            "GameId": f"LCK/2021 Season/Spring Season_Week 1_{idx}_1",
+            "MatchId": f"LCK/2021 Season/Spring Season_Week 1_{idx}",
+            "Tournament": "LCK 2021 Spring",
+            "OverviewPage": "LCK/2021 Season/Spring Season",
+            "DateTime UTC": "2021-01-13 08:00:00",
+            "N GameInMatch": "1",
+            "Gamelength Number": str(20 + idx),
+            "Patch": "11.1",
+            "VOD": None,
+            "Winner": "1",
+            "MatchHistory": None,
+            "RiotPlatformGameId": None,
+            **{
+                f"Team{side}{field}": value
+                for side in (1, 2)
+                for field, value in [
+                    ("", f"Team {side}"),
+                    ("Bans", ",".join(champions[:5])),
+                    ("Picks", ",".join(champions[5:])),
+                    ("Players", ",".join(f"Player {i}" for i in range(5))),
+                    ("Towers", "3"),
+                    ("Dragons", "2"),
+                    ("RiftHeralds", "1"),
+                    ("Barons", "0"),
+                    ("Score", "1"),
+                    ("Inhibitors", "2"),
+                ]
+            },
+        }
+        for idx in range(count)
+    ]
+
+
+def test_transmute_game_projection(fake_champion_ids):
+    row = get_games_rows(1)[0]
+    game = transmute_game(row)
+
+    assert game.duration == 20 * 60
+    assert [len(team.players) for team in game.teams] == [5, 5]
+    assert game.teams.RED.endOfGameStats.dragonKills == 2
+
+    # Players get their own name, like in transmute_games_columns()
+    names = [player.sources.leaguepedia.gameName for player in game.teams.BLUE.players]
+
+    assert names[0] != names[1]
+    assert names == transmute_games_columns([row])["bluePlayers"][0]
+
+    # Rows with some of the fields give partially populated games
+    keys = ["GameId", "DateTime UTC", "Team1", "Team2", "Winner", "Team1Towers"]
+    game = transmute_game({key: row[key] for key in keys})
+
+    assert game.start == "2021-01-13T08:00:00+00:00"
+    assert game.winner == "BLUE"
+    assert game.duration is None
+    assert game.sources.leaguepedia.gameId == row["GameId"]
+    assert game.sources.leaguepedia.matchId is None
+    assert game.teams.RED.sources.leaguepedia.name == "Team 2"
+    assert game.teams.BLUE.endOfGameStats.turretKills == 3
+    assert game.teams.BLUE.endOfGameStats.dragonKills is None
+    assert game.teams.RED.endOfGameStats.turretKills is None
+    assert [len(team.players) for team in game.teams] == [0, 0]
+    assert fake_champion_ids == champions